@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Full-Cycle Benchmarks
+ContinuousRailwayScraper.scrape_all_centers (fetch, parse, diff, persist) for all 25 centers
+against the local replay server, with unchanged and with changed upstream pages
+"""
+import asyncio
+
+import pytest
+
+from continuous_scraper import ContinuousRailwayScraper
+
+@pytest.fixture(scope='module')
+def cycle_scraper(replay_server, tmp_path_factory):
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(tmp_path_factory.mktemp('cycle'))  # Incident store and exports go to a scratch directory
+        mp.setenv('CHP_BASE_URL', replay_server.base_url)
+        mp.setenv('UPSTREAM_RATE', '100000')  # Benchmark the code, not the politeness limits
+        mp.setenv('UPSTREAM_BURST', '100000')
+        mp.setenv('UPSTREAM_MAX_CONCURRENCY', '50')
+        mp.setenv('UPSTREAM_MAX_IN_FLIGHT', '50')
+        mp.setenv('LOG_LEVEL', 'WARNING')
+        scraper = ContinuousRailwayScraper()
+        loop = asyncio.new_event_loop()
+        yield scraper, loop
+        loop.close()
+
+def run_cycle(scraper, loop):
+    results = loop.run_until_complete(scraper.scrape_all_centers())
+    assert all(result['status'] == 'success' for result in results), [r.get('error') for r in results]
+    return len(results)
+
+def test_cycle_unchanged_upstream(benchmark, cycle_scraper, replay_server):
+    scraper, loop = cycle_scraper
+    replay_server.fresh = False
+    run_cycle(scraper, loop)  # First cycle parses everything; the rest hit change detection
+    assert benchmark(run_cycle, scraper, loop) == 25
+
+def test_cycle_changed_upstream(benchmark, cycle_scraper, replay_server):
+    scraper, loop = cycle_scraper
+    replay_server.fresh = True
+    try:
+        assert benchmark(run_cycle, scraper, loop) == 25
+    finally:
+        replay_server.fresh = False
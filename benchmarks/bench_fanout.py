@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+SSE Fan-out Benchmarks
+SSEServer.broadcast_update of a full scrape summary to in-process clients
+"""
+import asyncio
+
+import pytest
+
+from continuous_scraper import SSEServer
+from http_scraper import HTTPScraper
+
+class SinkClient:
+    """Stands in for an SSE StreamResponse; counts what would be written"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    async def write(self, data: bytes) -> None:
+        self.bytes += len(data)
+
+@pytest.fixture(scope='module')
+def summary_message(fixture_pages):
+    scraper = HTTPScraper()
+    results = []
+    for center_code, page in fixture_pages.items():
+        incidents = scraper.apply_smart_processing(scraper.parse_incidents(page, center_code), set())
+        results.append({'center': center_code, 'incidents': incidents, 'incidentCount': len(incidents),
+                        'status': 'success'})
+    return {'type': 'scrape_summary', 'data': {'centers': len(results), 'results': results,
+                                               'totalIncidents': sum(r['incidentCount'] for r in results)}}
+
+@pytest.mark.parametrize('clients', [100, 1000])
+def test_broadcast_fanout(benchmark, summary_message, clients):
+    server = SSEServer(port=0)
+    server.clients = {SinkClient() for _ in range(clients)}
+    loop = asyncio.new_event_loop()
+    try:
+        benchmark(lambda: loop.run_until_complete(server.broadcast_update(summary_message)))
+    finally:
+        loop.close()
+    assert all(client.bytes > 0 for client in server.clients)
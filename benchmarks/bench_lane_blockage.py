@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Lane Blockage Classifier Benchmark
+Compares the compiled/memoized classifier with the original keyword scan
+on CHP detail strings (captured data/ snapshots + benchmarks/corpus)
+"""
+import glob
+import json
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from core.lane_blockage_classifier import LaneBlockageClassifier
+
+def legacy_parse_lane_blockage(details_text):
+    """Original HTTPScraper.parse_lane_blockage, kept as the benchmark baseline"""
+    if not details_text:
+        return {'status': 'unknown', 'details': []}
+
+    lines = details_text.split(' | ')
+    blockage_info = []
+    resolved_keywords = ['NEG BLOCKING', 'NEG BLK', 'CLEARED', 'RESOLVED']
+    blockage_keywords = [
+        'BLKG', 'BLOCKING', '#1 LN', 'SLOW LN', 'MIDDLE LN',
+        'RHS', 'RS', 'CD', 'LANE', 'LN', 'VEH IN', 'DEBRIS'
+    ]
+
+    for line in lines:
+        line_upper = line.upper()
+        if any(resolved in line_upper for resolved in resolved_keywords):
+            return {'status': 'resolved', 'details': [line]}
+        if any(keyword in line_upper for keyword in blockage_keywords):
+            blockage_info.append(line)
+
+    if blockage_info:
+        return {'status': 'blocking', 'details': blockage_info}
+    return {'status': 'no_blockage', 'details': []}
+
+def load_corpus(seed: int = 42):
+    """Build detail strings from captured data/ files and the narrative line corpus"""
+    details = []
+    for path in glob.glob(os.path.join(ROOT, 'data', '*_incidents_*.json')):
+        with open(path) as f:
+            details.extend(incident.get('details', '') for incident in json.load(f).get('incidents', []))
+
+    with open(os.path.join(os.path.dirname(__file__), 'corpus', 'chp_detail_lines.txt')) as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    # Growing narratives: each incident appends lines over successive observations
+    rng = random.Random(seed)
+    for _ in range(200):
+        narrative = rng.sample(lines, rng.randint(1, 8))
+        for end in range(1, len(narrative) + 1):
+            details.append(' | '.join(narrative[:end]))
+    return details
+
+def run_cycles(parse, corpus, cycles):
+    """Simulate scrape cycles: every cycle re-classifies the same details"""
+    for _ in range(cycles):
+        for details in corpus:
+            parse(details)
+
+def main():
+    corpus = load_corpus()
+    classifier = LaneBlockageClassifier()
+
+    mismatches = [d for d in corpus if legacy_parse_lane_blockage(d) != classifier.parse(d)]
+    print(f"Corpus: {len(corpus)} detail strings, {len(mismatches)} mismatches vs legacy")
+
+    cycles = 20
+    legacy = timeit.timeit(lambda: run_cycles(legacy_parse_lane_blockage, corpus, cycles), number=1)
+
+    def compiled_uncached(details):
+        return classifier._parse_uncached(details) if details else None
+    compiled = timeit.timeit(lambda: run_cycles(compiled_uncached, corpus, cycles), number=1)
+
+    memoized_classifier = LaneBlockageClassifier()
+    memoized = timeit.timeit(lambda: run_cycles(memoized_classifier.parse, corpus, cycles), number=1)
+
+    total = len(corpus) * cycles
+    print(f"legacy keyword scan : {legacy * 1e6 / total:8.2f} us/call")
+    print(f"compiled pattern    : {compiled * 1e6 / total:8.2f} us/call ({legacy / compiled:.1f}x)")
+    print(f"compiled + LRU cache: {memoized * 1e6 / total:8.2f} us/call ({legacy / memoized:.1f}x)")
+    print(f"cache: {memoized_classifier.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Parsing and Diff Benchmarks
+parse_incidents, apply_smart_processing and DataComparator on the recorded pages of all 25 centers
+"""
+import random
+
+import pytest
+
+from core.data_comparator import DataComparator
+from http_scraper import HTTPScraper
+
+@pytest.fixture(scope='module')
+def scraper():
+    return HTTPScraper()
+
+@pytest.fixture(scope='module')
+def parsed(scraper, fixture_pages):
+    """Incidents per center, as parsed from the fixtures"""
+    return {center_code: scraper.parse_incidents(page, center_code) for center_code, page in fixture_pages.items()}
+
+def test_parse_incidents(benchmark, scraper, fixture_pages):
+    def parse_all():
+        return sum(len(scraper.parse_incidents(page, center_code)) for center_code, page in fixture_pages.items())
+
+    assert benchmark(parse_all) > 0
+
+def test_apply_smart_processing(benchmark, scraper, parsed):
+    # Steady state: the same incidents come back every cycle, as on the live feed
+    def process_all():
+        for incidents in parsed.values():
+            scraper.apply_smart_processing([dict(incident) for incident in incidents], set())
+
+    benchmark(process_all)
+
+def test_data_comparator(benchmark, parsed):
+    comparator = DataComparator()
+    rng = random.Random(7)
+    # Previous snapshots with ~20% churn: some incidents gone, some new, some details revised
+    pairs = []
+    for incidents in parsed.values():
+        previous = [dict(incident) for incident in incidents if rng.random() > 0.1]
+        for incident in previous:
+            if rng.random() < 0.1:
+                incident['details'] = incident['details'] + ' (rev)'
+        previous.extend({**incident, 'id': f"9{incident['id']}"} for incident in incidents if rng.random() < 0.1)
+        pairs.append((incidents, previous))
+
+    def compare_all():
+        return [comparator.compare_incidents(current, previous) for current, previous in pairs]
+
+    benchmark(compare_all)
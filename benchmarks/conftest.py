@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark fixtures: recorded CHP pages, a local replay server and regression thresholds
+"""
+import json
+import os
+import sys
+
+import pytest
+
+BENCH_DIR = os.path.dirname(__file__)
+sys.path.append(os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.append(os.path.join(BENCH_DIR, '..', 'src', 'scrapers'))
+sys.path.append(BENCH_DIR)
+
+from core.center_mapper import CenterMapper
+from replay_server import FIXTURES_DIR, ReplayServer, ReplayServerThread
+
+# Mean seconds per benchmark; BENCH_THRESHOLD_SCALE loosens them for slower CI machines
+with open(os.path.join(BENCH_DIR, 'thresholds.json')) as f:
+    THRESHOLDS = json.load(f)
+
+@pytest.fixture(scope='session')
+def centers():
+    """All 25 communication centers"""
+    return CenterMapper().get_available_centers()
+
+@pytest.fixture(scope='session')
+def fixture_pages(centers):
+    """Recorded POST response HTML per center"""
+    pages = {}
+    for center_code in centers:
+        with open(os.path.join(FIXTURES_DIR, f'{center_code}.html'), encoding='utf-8') as f:
+            pages[center_code] = f.read()
+    return pages
+
+@pytest.fixture(scope='session')
+def replay_server():
+    """Replay server on a background thread; latency via BENCH_UPSTREAM_LATENCY/BENCH_UPSTREAM_JITTER"""
+    server = ReplayServer(
+        latency=float(os.getenv('BENCH_UPSTREAM_LATENCY', '0')),
+        jitter=float(os.getenv('BENCH_UPSTREAM_JITTER', '0')),
+        seed=42
+    )
+    thread = ReplayServerThread(server)
+    thread.start()
+    yield server
+    thread.stop()
+
+@pytest.fixture(autouse=True)
+def regression_threshold(request):
+    """Fail a benchmark whose mean exceeds its entry in thresholds.json"""
+    yield
+    benchmark = request.node.funcargs.get('benchmark')
+    if benchmark is None or getattr(benchmark, 'stats', None) is None:
+        return
+    limit = THRESHOLDS.get(request.node.name)
+    if limit is None:
+        return
+    limit *= float(os.getenv('BENCH_THRESHOLD_SCALE', '1'))
+    mean = benchmark.stats.stats.mean
+    if mean > limit:
+        pytest.fail(f"{request.node.name}: mean {mean * 1000:.2f}ms exceeds threshold {limit * 1000:.2f}ms")
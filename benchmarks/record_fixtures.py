@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+CHP Fixture Recorder
+Records Traffic.aspx GET/POST responses for all 25 centers into benchmarks/fixtures,
+either live from the CHP site or rendered from the captured data/ snapshots
+"""
+import argparse
+import base64
+import glob
+import html
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import requests
+from bs4 import BeautifulSoup
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from core.center_mapper import CenterMapper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+LIVE_URL = "https://cad.chp.ca.gov/Traffic.aspx"
+
+def fixture_path(fixtures_dir: str, center_code: str = None) -> str:
+    """page.html for the landing GET, <CENTER>.html for a center's POST response"""
+    return os.path.join(fixtures_dir, f"{center_code or 'page'}.html")
+
+def extract_form_data(page: str, center_code: str) -> dict:
+    """Hidden ASP.NET fields plus the center selection, as HTTPScraper posts them"""
+    soup = BeautifulSoup(page, 'html.parser')
+    form_data = {'ddlComCenter': center_code, 'btnCCGo': 'OK'}
+    for hidden_input in soup.find_all('input', type='hidden'):
+        if hidden_input.get('name'):
+            form_data[hidden_input['name']] = hidden_input.get('value', '')
+    return form_data
+
+def record_live(base_url: str, fixtures_dir: str, centers: list, delay: float = 1.0) -> None:
+    """GET the landing page and POST every center once, politely spaced"""
+    session = requests.Session()
+    session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; CHP-Traffic-Monitor/1.0; fixture recorder)'
+
+    response = session.get(base_url, timeout=30)
+    response.raise_for_status()
+    with open(fixture_path(fixtures_dir), 'w', encoding='utf-8') as f:
+        f.write(response.text)
+
+    for center_code in centers:
+        time.sleep(delay)
+        posted = session.post(base_url, data=extract_form_data(response.text, center_code), timeout=30)
+        posted.raise_for_status()
+        with open(fixture_path(fixtures_dir, center_code), 'w', encoding='utf-8') as f:
+            f.write(posted.text)
+        print(f"✅ {center_code}: {len(posted.content)} bytes")
+
+def latest_snapshots() -> dict:
+    """Most recent data/ snapshot per center"""
+    snapshots = {}
+    for path in sorted(glob.glob(os.path.join(ROOT, 'data', '*_incidents_*.json'))):
+        with open(path) as f:
+            snapshot = json.load(f)
+        snapshots[snapshot['center_code']] = snapshot['incidents']
+    return snapshots
+
+def render_page(centers: list, selected: str = None, incidents: list = None, seed: int = 0) -> str:
+    """Traffic.aspx-shaped page: center form with view state, and the incidents grid when a center is selected"""
+    rng = random.Random(seed)
+    # The live view state is several KB of base64; its size dominates the page weight
+    viewstate = base64.b64encode(rng.randbytes(6000)).decode()
+    options = ''.join(
+        f'<option{" selected" if code == selected else ""} value="{code}">{code}</option>' for code in centers
+    )
+    parts = [
+        '<!DOCTYPE html><html><head><title>CHP Traffic Incident Information Page</title></head><body>',
+        '<form method="post" action="./Traffic.aspx" id="form1">',
+        f'<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />',
+        f'<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="{rng.getrandbits(32):08X}" />',
+        f'<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="{base64.b64encode(rng.randbytes(300)).decode()}" />',
+        f'<select name="ddlComCenter" id="ddlComCenter">{options}</select>',
+        '<input type="submit" name="btnCCGo" value="OK" id="btnCCGo" />'
+    ]
+    if incidents is not None:
+        parts.append('<table id="gvIncidents"><tr><th></th><th>No.</th><th>Time</th><th>Type</th>'
+                     '<th>Location</th><th>Location Desc.</th><th>Area</th></tr>')
+        for index, incident in enumerate(incidents):
+            cells = [incident.get(key, '') for key in ('id', 'time', 'type', 'location', 'area', 'details')]
+            parts.append(
+                f'<tr><td><a href="javascript:__doPostBack(&#39;gvIncidents&#39;,&#39;Select${index}&#39;)">Details</a></td>'
+                + ''.join(f'<td>{html.escape(str(cell))}</td>' for cell in cells) + '</tr>'
+            )
+        parts.append('</table>')
+    parts.append('</form></body></html>')
+    return '\n'.join(parts)
+
+def build_from_snapshots(fixtures_dir: str, centers: list) -> None:
+    """Render fixtures from the captured snapshots (no network needed)"""
+    snapshots = latest_snapshots()
+    with open(fixture_path(fixtures_dir), 'w', encoding='utf-8') as f:
+        f.write(render_page(centers))
+    for seed, center_code in enumerate(centers, start=1):
+        incidents = snapshots.get(center_code, [])
+        with open(fixture_path(fixtures_dir, center_code), 'w', encoding='utf-8') as f:
+            f.write(render_page(centers, center_code, incidents, seed))
+        print(f"✅ {center_code}: {len(incidents)} incidents")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--live', action='store_true', help='Record from the CHP site instead of data/ snapshots')
+    parser.add_argument('--base-url', default=LIVE_URL, help='Traffic.aspx URL to record from (with --live)')
+    parser.add_argument('--out', default=FIXTURES_DIR, help='Fixture directory')
+    parser.add_argument('--delay', type=float, default=1.0, help='Seconds between live POSTs')
+    args = parser.parse_args()
+
+    centers = CenterMapper().get_available_centers()
+    os.makedirs(args.out, exist_ok=True)
+    if args.live:
+        record_live(args.base_url, args.out, centers, args.delay)
+    else:
+        build_from_snapshots(args.out, centers)
+
+    with open(os.path.join(args.out, 'manifest.json'), 'w') as f:
+        json.dump({
+            'source': args.base_url if args.live else 'data/ snapshots',
+            'recorded_at': datetime.now().isoformat(),
+            'centers': centers
+        }, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+CHP Replay Server
+Local aiohttp stand-in for Traffic.aspx that replays the recorded fixtures
+with configurable latency and jitter (point CHP_BASE_URL at it)
+"""
+import argparse
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from aiohttp import web
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+class ReplayServer:
+    """Serves page.html for GETs and <center>.html for center POSTs"""
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, latency: float = 0.0, jitter: float = 0.0,
+                 fresh: bool = False, seed: Optional[int] = None):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.fresh = fresh  # Make every response differ (as if incidents changed) to defeat change detection
+        self.rng = random.Random(seed)
+        self.pages: Dict[str, bytes] = {}
+        for name in os.listdir(fixtures_dir):
+            if name.endswith('.html'):
+                with open(os.path.join(fixtures_dir, name), 'rb') as f:
+                    self.pages[name[:-len('.html')]] = f.read()
+        self.stats = {'get': 0, 'post': 0, 'not_found': 0}
+        self.runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+    def create_app(self) -> web.Application:
+        """aiohttp app answering like Traffic.aspx"""
+        app = web.Application()
+        for path in ('/', '/Traffic.aspx'):
+            app.router.add_get(path, self.handle_get)
+            app.router.add_post(path, self.handle_post)
+        return app
+
+    async def delay(self) -> None:
+        """Simulated upstream latency: normal around latency, never negative"""
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.rng.gauss(self.latency, self.jitter)))
+
+    def body(self, name: str) -> bytes:
+        """Fixture bytes, with a changing marker when fresh responses are requested"""
+        page = self.pages[name]
+        if self.fresh:
+            page = page.replace(b'</table>', f'<tr><td></td><td>{time.monotonic_ns()}</td></tr></table>'.encode(), 1)
+        return page
+
+    async def handle_get(self, request: web.Request) -> web.Response:
+        """Landing page with the center form"""
+        self.stats['get'] += 1
+        await self.delay()
+        return web.Response(body=self.body('page'), content_type='text/html', charset='utf-8')
+
+    async def handle_post(self, request: web.Request) -> web.Response:
+        """Center page selected by ddlComCenter"""
+        form = await request.post()
+        center_code = form.get('ddlComCenter', '')
+        await self.delay()
+        if center_code not in self.pages:
+            self.stats['not_found'] += 1
+            return web.Response(status=404, text=f'Unknown center {center_code}')
+        self.stats['post'] += 1
+        return web.Response(body=self.body(center_code), content_type='text/html', charset='utf-8')
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start listening (port 0 picks a free port), returns the Traffic.aspx URL"""
+        self.runner = web.AppRunner(self.create_app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}/Traffic.aspx"
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop listening"""
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+
+class ReplayServerThread:
+    """Runs a ReplayServer on its own loop in a daemon thread, for synchronous benchmarks"""
+
+    def __init__(self, server: ReplayServer):
+        self.server = server
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='replay-server', daemon=True)
+
+    def start(self) -> str:
+        """Start the thread and the server, returns the Traffic.aspx URL"""
+        self.thread.start()
+        return asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result(timeout=10)
+
+    def stop(self) -> None:
+        """Stop the server and the thread"""
+        asyncio.run_coroutine_threadsafe(self.server.stop(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=10)
+
+async def serve(args) -> None:
+    """Run until interrupted"""
+    server = ReplayServer(args.fixtures, args.latency, args.jitter, args.fresh, args.seed)
+    base_url = await server.start(args.host, args.port)
+    print(f"🎬 Replaying {len(server.pages)} fixtures on {base_url} "
+          f"(latency {args.latency}s ± {args.jitter}s{', fresh' if args.fresh else ''})")
+    print(f"   CHP_BASE_URL={base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR, help='Fixture directory (see record_fixtures.py)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Mean response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Standard deviation of the delay in seconds')
+    parser.add_argument('--fresh', action='store_true', help='Make every response look changed')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
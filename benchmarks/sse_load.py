@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+SSE Fan-out Load Generator
+Starts ContinuousRailwayScraper against the fixture replay server, opens thousands of
+concurrent SSE clients (a share of them deliberately slow readers) and reports
+publish-to-receipt latency percentiles, server memory per client and CPU per scrape cycle
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+# scrape_summary carries data.timestamp (local time, set right before the broadcast) in its first bytes
+SUMMARY_TIMESTAMP = re.compile(rb'^data: \{"type": "scrape_summary", "data": \{"timestamp": "([^"]+)"')
+SLOW_READ_SIZE = 4096
+
+def percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a sorted list, None when empty"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def free_port() -> int:
+    """An unused localhost port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def raise_fd_limit() -> int:
+    """Lift the soft open-file limit to the hard limit; every SSE client is a socket"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+def process_usage(pid: int) -> Tuple[int, float]:
+    """(RSS bytes, user+system CPU seconds) of a process, read from /proc"""
+    with open(f'/proc/{pid}/status') as f:
+        rss = next(int(line.split()[1]) * 1024 for line in f if line.startswith('VmRSS:'))
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()  # The command name may contain spaces
+    return rss, (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+def fetch(url: str, timeout: float = 5.0) -> str:
+    """GET a URL and return its body as text"""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read().decode()
+
+def metric_value(exposition: str, name: str) -> float:
+    """Sum of all samples of a metric in Prometheus text exposition"""
+    total = 0.0
+    for line in exposition.splitlines():
+        if line.startswith(name) and line[len(name):len(name) + 1] in (' ', '{'):
+            total += float(line.rsplit(' ', 1)[1])
+    return total
+
+def wait_until_healthy(base_url: str, process: subprocess.Popen, timeout: float) -> None:
+    """Poll /health until the server answers"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        try:
+            fetch(f"{base_url}/health", timeout=1.0)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not become healthy within {timeout}s")
+
+async def sse_client(session: aiohttp.ClientSession, url: str, slow: bool, slow_delay: float,
+                     state: Dict[str, Any]) -> None:
+    """One SSE connection; records the delivery latency of every scrape_summary received while measuring"""
+    latencies = state['slow' if slow else 'fast']
+    try:
+        async with session.get(url) as response:
+            state['connected'] += 1
+            buffer = b''
+            while True:
+                # Fast clients drain whatever arrived; slow ones trickle small reads so the server's buffers fill
+                chunk = await (response.content.read(SLOW_READ_SIZE) if slow else response.content.readany())
+                if not chunk:
+                    state['dropped'] += 1  # The server closed the stream
+                    break
+                received_at = time.time()
+                buffer += chunk
+                while b'\n\n' in buffer:
+                    message, buffer = buffer.split(b'\n\n', 1)
+                    match = SUMMARY_TIMESTAMP.match(message)
+                    if match and state['measuring']:
+                        published_at = datetime.fromisoformat(match.group(1).decode()).timestamp()
+                        latencies.append(received_at - published_at)
+                if slow:
+                    await asyncio.sleep(slow_delay)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        state['errors'] += 1
+        state['last_error'] = f"{type(e).__name__}: {e}"
+
+async def run_clients(url: str, count: int, args, ready, go, seed: int) -> Dict[str, Any]:
+    """Ramp up count clients, report ready, wait for go, then measure for args.duration seconds"""
+    rng = random.Random(seed)
+    state = {'fast': [], 'slow': [], 'connected': 0, 'dropped': 0, 'errors': 0, 'last_error': None,
+             'measuring': False}
+    ramp = args.ramp / args.workers
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        tasks = []
+        started = time.monotonic()
+        slow_clients = 0
+        for index in range(count):
+            slow = rng.random() < args.slow_share
+            slow_clients += slow
+            tasks.append(asyncio.create_task(sse_client(session, url, slow, args.slow_delay, state)))
+            # Pace against the start time so the ramp rate holds even when sleeps overshoot
+            delay = started + (index + 1) / ramp - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        deadline = time.monotonic() + args.connect_timeout
+        while state['connected'] + state['errors'] < count and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        connected = state['connected']
+        ready.put(connected)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, go.wait)
+        state['measuring'] = True
+        await asyncio.sleep(args.duration)
+        state['measuring'] = False
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        'fast': state['fast'],
+        'slow': state['slow'],
+        'connected': connected,
+        'slow_clients': slow_clients,
+        'dropped': state['dropped'],
+        'errors': state['errors'],
+        'last_error': state['last_error']
+    }
+
+def client_worker(url: str, count: int, args, ready, go, results, seed: int) -> None:
+    """Client process: its own event loop holding its share of the connections"""
+    raise_fd_limit()
+    results.put(asyncio.run(run_clients(url, count, args, ready, go, seed)))
+
+def start_process(command: List[str], env: Dict[str, str], cwd: str, log_path: str) -> subprocess.Popen:
+    """Start a helper process with output going to a log file"""
+    log = open(log_path, 'wb')
+    return subprocess.Popen(command, env=env, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+
+def stop_process(process: Optional[subprocess.Popen]) -> None:
+    """Terminate a helper process, killing it if it lingers"""
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    """Latency percentiles in milliseconds"""
+    ordered = sorted(values)
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        'samples': len(ordered),
+        'p50_ms': ms(percentile(ordered, 0.50)),
+        'p99_ms': ms(percentile(ordered, 0.99)),
+        'p999_ms': ms(percentile(ordered, 0.999)),
+        'max_ms': ms(ordered[-1] if ordered else None)
+    }
+
+def run(args) -> Dict[str, Any]:
+    """Start the upstream replay and the server, drive the clients, collect the report"""
+    fd_limit = raise_fd_limit()
+    per_worker = [args.clients // args.workers + (index < args.clients % args.workers) for index in range(args.workers)]
+    if max(per_worker) + 64 > fd_limit:
+        print(f"⚠️ {max(per_worker)} clients per worker with an open-file limit of {fd_limit}; "
+              f"raise ulimit -n or --workers", file=sys.stderr)
+
+    workdir = tempfile.mkdtemp(prefix='sse_load_')
+    upstream_port = args.upstream_port or free_port()
+    server_port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{server_port}"
+    replay = server = None
+    workers = []
+    try:
+        replay_command = [sys.executable, os.path.join(BENCH_DIR, 'replay_server.py'), '--port', str(upstream_port),
+                          '--latency', str(args.upstream_latency), '--fresh']
+        replay = start_process(replay_command, dict(os.environ), workdir, os.path.join(workdir, 'replay.log'))
+
+        env = dict(os.environ)
+        env.update({
+            'PORT': str(server_port),
+            'CHP_BASE_URL': f"http://127.0.0.1:{upstream_port}/Traffic.aspx",
+            'SCRAPE_INTERVAL': str(args.interval),
+            'UPSTREAM_RATE': '1000',
+            'UPSTREAM_BURST': '1000',
+            'LOG_LEVEL': os.getenv('LOG_LEVEL', 'WARNING')
+        })
+        # Run from a scratch directory: the scraper writes its data files relative to the working directory
+        server_command = [sys.executable, os.path.join(ROOT, 'src', 'scrapers', 'continuous_scraper.py')]
+        server = start_process(server_command, env, workdir, os.path.join(workdir, 'server.log'))
+        wait_until_healthy(base_url, server, args.startup_timeout)
+        print(f"🚀 Server pid {server.pid} on {base_url} (logs in {workdir})")
+
+        time.sleep(2 * args.interval)  # Let the first cycles warm the caches before the baseline
+        baseline_rss, _ = process_usage(server.pid)
+
+        ready = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        go = multiprocessing.Event()
+        url = f"{base_url}/api/incidents/stream"
+        for index, count in enumerate(per_worker):
+            worker = multiprocessing.Process(target=client_worker, args=(url, count, args, ready, go, results, args.seed + index),
+                                             daemon=True)
+            worker.start()
+            workers.append(worker)
+
+        connected = sum(ready.get(timeout=args.clients / args.ramp + args.connect_timeout + 30) for _ in workers)
+        print(f"📡 {connected}/{args.clients} clients connected")
+        time.sleep(args.interval)  # Let the initial snapshots drain so they do not skew the per-client RSS
+
+        loaded_rss, cpu_before = process_usage(server.pid)
+        metrics_before = fetch(f"{base_url}/metrics")
+        go.set()
+        time.sleep(args.duration)
+        _, cpu_after = process_usage(server.pid)
+        metrics_after = fetch(f"{base_url}/metrics")
+
+        worker_results = [results.get(timeout=args.duration + 60) for _ in workers]
+    finally:
+        for worker in workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        stop_process(server)
+        stop_process(replay)
+
+    def delta(name):
+        return metric_value(metrics_after, name) - metric_value(metrics_before, name)
+
+    # Every cycle ends with one scrape_summary broadcast; incident_update broadcasts come on top
+    cycles = delta('sse_broadcast_seconds_count{type="scrape_summary"}')
+    broadcasts = delta('sse_broadcast_seconds_count')
+    broadcast_seconds = delta('sse_broadcast_seconds_sum')
+    cpu_seconds = cpu_after - cpu_before
+    errors = [result['last_error'] for result in worker_results if result['last_error']]
+    return {
+        'clients': args.clients,
+        'connected': connected,
+        'slow_clients': sum(result['slow_clients'] for result in worker_results),
+        'workers': args.workers,
+        'duration_s': args.duration,
+        'scrape_interval_s': args.interval,
+        'latency_fast': summarize([value for result in worker_results for value in result['fast']]),
+        'latency_slow': summarize([value for result in worker_results for value in result['slow']]),
+        'client_errors': sum(result['errors'] for result in worker_results),
+        'client_dropped': sum(result['dropped'] for result in worker_results),
+        'last_client_error': errors[-1] if errors else None,
+        'server_rss_baseline_mb': round(baseline_rss / 2 ** 20, 1),
+        'server_rss_loaded_mb': round(loaded_rss / 2 ** 20, 1),
+        'server_rss_per_client_kb': round((loaded_rss - baseline_rss) / max(connected, 1) / 1024, 1),
+        'server_cpu_s': round(cpu_seconds, 3),
+        'cycles': int(cycles),
+        'broadcasts': int(broadcasts),
+        'server_cpu_per_cycle_ms': round(cpu_seconds / cycles * 1000, 2) if cycles else None,
+        'broadcast_wall_per_broadcast_ms': round(broadcast_seconds / broadcasts * 1000, 2) if broadcasts else None,
+        'broadcast_wall_per_cycle_ms': round(broadcast_seconds / cycles * 1000, 2) if cycles else None
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Human-readable summary"""
+    print(f"\n📊 {report['connected']}/{report['clients']} clients ({report['slow_clients']} slow) "
+          f"over {report['duration_s']}s, {report['cycles']} cycles, {report['broadcasts']} broadcasts")
+    for kind in ('fast', 'slow'):
+        latency = report[f'latency_{kind}']
+        print(f"   {kind:>4} delivery: p50 {latency['p50_ms']} ms, p99 {latency['p99_ms']} ms, "
+              f"p999 {latency['p999_ms']} ms, max {latency['max_ms']} ms ({latency['samples']} samples)")
+    print(f"   server RSS: {report['server_rss_baseline_mb']} MB idle, {report['server_rss_loaded_mb']} MB loaded, "
+          f"{report['server_rss_per_client_kb']} KB per client")
+    print(f"   server CPU: {report['server_cpu_per_cycle_ms']} ms per cycle (scrape + fan-out), "
+          f"fan-out wall time {report['broadcast_wall_per_broadcast_ms']} ms per broadcast, "
+          f"{report['broadcast_wall_per_cycle_ms']} ms per cycle")
+    if report['client_errors'] or report['client_dropped']:
+        print(f"   ⚠️ {report['client_errors']} client errors, {report['client_dropped']} dropped "
+              f"(last: {report['last_client_error']})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=1000, help='Concurrent SSE clients')
+    parser.add_argument('--workers', type=int, default=max(1, min(os.cpu_count() or 1, 8)),
+                        help='Client processes (spread 10k+ clients over several)')
+    parser.add_argument('--slow-share', type=float, default=0.05, help='Fraction of clients that read slowly')
+    parser.add_argument('--slow-delay', type=float, default=0.5, help=f'Seconds a slow client sleeps between {SLOW_READ_SIZE}-byte reads')
+    parser.add_argument('--ramp', type=float, default=500.0, help='New connections per second across all workers')
+    parser.add_argument('--duration', type=float, default=30.0, help='Measurement window in seconds')
+    parser.add_argument('--interval', type=float, default=2.0, help='SCRAPE_INTERVAL for the server')
+    parser.add_argument('--upstream-latency', type=float, default=0.0, help='Replay server response delay')
+    parser.add_argument('--port', type=int, default=0, help='Server port (default: any free port)')
+    parser.add_argument('--upstream-port', type=int, default=0, help='Replay server port (default: any free port)')
+    parser.add_argument('--connect-timeout', type=float, default=60.0)
+    parser.add_argument('--startup-timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help='Also write the report as JSON')
+    args = parser.parse_args()
+    args.workers = max(1, min(args.workers, args.clients))
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker Implementation
+Single Responsibility: Stops requests to failing centers and probes them again after a jittered backoff
+"""
+
+import random
+import time
+from typing import Any, Dict, Optional
+
+def jittered_backoff(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with equal jitter: half fixed, half random, capped"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures -> half-open single probe -> closed or open again"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 10.0, max_backoff: float = 600.0):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_trips = 0  # Grows the backoff while probes keep failing
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.last_failure_at: Optional[float] = None
+        self.last_success_at: Optional[float] = None
+        self.total_failures = 0
+        self.trips = 0
+
+    def allow_request(self) -> bool:
+        """True if a request may be sent now; an expired open breaker admits one probe"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() < self.open_until:
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_in_flight = False
+        if self.probe_in_flight:
+            return False
+        self.probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.consecutive_trips = 0
+        self.probe_in_flight = False
+        self.last_success_at = time.time()
+
+    def record_failure(self, error: str = None) -> None:
+        """Count a failure; trips the breaker at the threshold or when a probe fails"""
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        self.last_error = error
+        self.last_failure_at = time.time()
+        self.probe_in_flight = False
+
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.open_until = time.monotonic() + jittered_backoff(self.consecutive_trips, self.base_backoff, self.max_backoff)
+            self.consecutive_trips += 1
+            self.trips += 1
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker admits a probe"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.open_until - time.monotonic())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for health reporting"""
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'total_failures': self.total_failures,
+            'trips': self.trips,
+            'retry_in': round(self.retry_in(), 1),
+            'last_error': self.last_error,
+            'last_failure_at': self.last_failure_at,
+            'last_success_at': self.last_success_at
+        }
+
+class CircuitBreakerRegistry:
+    """One breaker per center, created on first use"""
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 10.0, max_backoff: float = 600.0):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Breaker of a center"""
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.base_backoff, self.max_backoff)
+            self.breakers[key] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State of every breaker plus a count of those not closed"""
+        breakers = {key: breaker.snapshot() for key, breaker in sorted(self.breakers.items())}
+        return {
+            'open': sum(1 for breaker in breakers.values() if breaker['state'] != CircuitBreaker.CLOSED),
+            'centers': breakers
+        }
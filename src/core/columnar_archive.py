@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Columnar Archive Implementation
+Single Responsibility: Writes and reads compressed, column-oriented daily incident archives
+
+File layout (Parquet-style, stdlib only):
+    MAGIC | column block | column block | ... | footer JSON | footer length (8 bytes) | MAGIC
+
+Every column block is compressed independently and the footer records its
+offset, so readers only decompress the columns they project.
+"""
+
+import json
+import struct
+import zlib
+from array import array
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+MAGIC = b'CHPCOL1\n'
+FOOTER_LENGTH = struct.Struct('<Q')
+
+# Column name -> encoding used by the archive writer
+ARCHIVE_COLUMNS = {
+    'center_code': 'dictionary',
+    'incident_id': 'plain',
+    'incident_time': 'plain',
+    'type': 'dictionary',
+    'location': 'plain',
+    'area': 'dictionary',
+    'details': 'plain',
+    'lane_status': 'dictionary',
+    'first_seen': 'float64',
+    'last_seen': 'float64'
+}
+
+def write_archive(path: str, rows: Iterable[Dict[str, Any]], metadata: Dict[str, Any] = None,
+                  compression_level: int = 9) -> int:
+    """Write rows (dicts keyed by ARCHIVE_COLUMNS) to a columnar archive, returns row count"""
+    columns: Dict[str, list] = {name: [] for name in ARCHIVE_COLUMNS}
+    for row in rows:
+        for name, values in columns.items():
+            values.append(row.get(name))
+    row_count = len(columns['center_code'])
+
+    footer_columns = []
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        for name, encoding in ARCHIVE_COLUMNS.items():
+            values = columns[name]
+            column_meta = {'name': name, 'encoding': encoding}
+
+            if encoding == 'dictionary':
+                dictionary: Dict[Optional[str], int] = {}
+                codes = array('I', (dictionary.setdefault(value, len(dictionary)) for value in values))
+                column_meta['dictionary'] = list(dictionary)
+                raw = codes.tobytes()
+                column_meta['itemsize'] = codes.itemsize
+            elif encoding == 'float64':
+                raw = array('d', (value or 0.0 for value in values)).tobytes()
+            else:
+                raw = json.dumps(values, separators=(',', ':')).encode()
+
+            block = zlib.compress(raw, compression_level)
+            column_meta['offset'] = f.tell()
+            column_meta['length'] = len(block)
+            f.write(block)
+            footer_columns.append(column_meta)
+
+        footer = json.dumps({
+            'row_count': row_count,
+            'columns': footer_columns,
+            'metadata': metadata or {}
+        }).encode()
+        f.write(footer)
+        f.write(FOOTER_LENGTH.pack(len(footer)))
+        f.write(MAGIC)
+
+    return row_count
+
+class ColumnarArchive:
+    """Reader for a columnar archive with column projection"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a columnar archive: {path}")
+            f.seek(-(len(MAGIC) + FOOTER_LENGTH.size), 2)
+            (footer_length,) = FOOTER_LENGTH.unpack(f.read(FOOTER_LENGTH.size))
+            f.seek(-(len(MAGIC) + FOOTER_LENGTH.size + footer_length), 2)
+            footer = json.loads(f.read(footer_length))
+
+        self.row_count = footer['row_count']
+        self.metadata = footer['metadata']
+        self._columns = {column['name']: column for column in footer['columns']}
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the stored columns"""
+        return list(self._columns)
+
+    def _read_block(self, name: str) -> bytes:
+        """Read and decompress the block of one column"""
+        if name not in self._columns:
+            raise KeyError(f"Unknown column: {name}")
+        column = self._columns[name]
+        with open(self.path, 'rb') as f:
+            f.seek(column['offset'])
+            return zlib.decompress(f.read(column['length']))
+
+    def read_dictionary(self, name: str) -> Tuple[List[Optional[str]], array]:
+        """Return (dictionary, codes) of a dictionary-encoded column without materializing strings"""
+        column = self._columns[name]
+        if column['encoding'] != 'dictionary':
+            raise ValueError(f"Column {name} is not dictionary-encoded")
+        codes = array('I')
+        codes.frombytes(self._read_block(name))
+        return column['dictionary'], codes
+
+    def read_column(self, name: str) -> list:
+        """Decode one column into a list of values"""
+        column = self._columns.get(name)
+        if column is None:
+            raise KeyError(f"Unknown column: {name}")
+
+        if column['encoding'] == 'dictionary':
+            dictionary, codes = self.read_dictionary(name)
+            return [dictionary[code] for code in codes]
+        if column['encoding'] == 'float64':
+            values = array('d')
+            values.frombytes(self._read_block(name))
+            return values.tolist()
+        return json.loads(self._read_block(name))
+
+    def read(self, columns: List[str] = None) -> Dict[str, list]:
+        """Read the projected columns (all columns by default)"""
+        return {name: self.read_column(name) for name in (columns or self.columns)}
+
+    def iter_rows(self, columns: List[str] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate rows as dicts restricted to the projected columns"""
+        data = self.read(columns)
+        names = list(data)
+        for values in zip(*(data[name] for name in names)):
+            yield dict(zip(names, values))
+
+def read_archives(paths: Iterable[str], columns: List[str] = None) -> Dict[str, list]:
+    """Concatenate the projected columns of several archives (e.g. a month of days)"""
+    combined: Dict[str, list] = {}
+    for path in paths:
+        for name, values in ColumnarArchive(path).read(columns).items():
+            combined.setdefault(name, []).extend(values)
+    return combined
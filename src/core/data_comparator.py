@@ -13,10 +13,11 @@ class DataComparator(IDataComparator):
     def compare_incidents(self, current_incidents: List[Dict], previous_incidents: List[Dict]) -> Dict[str, List]:
         """Compare current incidents with previous ones"""
         if previous_incidents is None:
-            return {"new_incidents": current_incidents, "removed_incidents": []}
+            return {"new_incidents": current_incidents, "removed_incidents": [], "updated_incidents": []}
         
         # Convert to sets for comparison (using incident ID + time as unique identifier)
-        if current_incidents and isinstance(current_incidents[0], dict):
+        sample = current_incidents or previous_incidents
+        if not sample or isinstance(sample[0], dict):
             # New structured format
             current_set = {f"{incident['id']}_{incident['time']}" for incident in current_incidents}
             previous_set = {f"{incident['id']}_{incident['time']}" for incident in previous_incidents}
@@ -25,6 +26,13 @@ class DataComparator(IDataComparator):
                             if f"{incident['id']}_{incident['time']}" not in previous_set]
             removed_incidents = [incident for incident in previous_incidents 
                                if f"{incident['id']}_{incident['time']}" not in current_set]
+            
+            # Incidents present in both snapshots whose details were revised
+            previous_details = {f"{incident['id']}_{incident['time']}": incident.get('details')
+                                for incident in previous_incidents}
+            updated_incidents = [incident for incident in current_incidents
+                                 if f"{incident['id']}_{incident['time']}" in previous_details
+                                 and previous_details[f"{incident['id']}_{incident['time']}"] != incident.get('details')]
         else:
             # Old format (List[List[str]])
             current_set = {f"{incident[1]}_{incident[2]}" for incident in current_incidents}
@@ -34,10 +42,12 @@ class DataComparator(IDataComparator):
                             if f"{incident[1]}_{incident[2]}" not in previous_set]
             removed_incidents = [incident for incident in previous_incidents 
                                if f"{incident[1]}_{incident[2]}" not in current_set]
+            updated_incidents = []
         
         return {
             "new_incidents": new_incidents,
-            "removed_incidents": removed_incidents
+            "removed_incidents": removed_incidents,
+            "updated_incidents": updated_incidents
         }
     
     def data_equals(self, data1: Dict, data2: Dict) -> bool:
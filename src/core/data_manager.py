@@ -14,6 +14,7 @@ from .data_serializer import DataSerializer
 from .file_manager import FileManager
 from .data_comparator import DataComparator
 from .center_mapper import CenterMapper
+from .incident_normalizer import IncidentNormalizer
 
 class DataManager(IDeltaProcessor, ICacheManager):
     """Manages incident data storage and comparison using focused interfaces"""
@@ -22,11 +23,17 @@ class DataManager(IDeltaProcessor, ICacheManager):
                  serializer: IDataSerializer = None,
                  file_manager: IFileManager = None,
                  comparator: IDataComparator = None,
-                 center_mapper: ICenterMapper = None):
+                 center_mapper: ICenterMapper = None,
+                 delta_processor: IDeltaProcessor = None,
+                 export_json: bool = True,
+                 normalizer: IncidentNormalizer = None):
         self.center_code = center_code
         self.data_dir = "data"
         self.active_file = f"{self.data_dir}/active_incidents_{center_code}.json"
         self.delta_file = f"{self.data_dir}/incident_deltas_{center_code}.json"
+        # Optional string interning; the previous snapshot is then kept as compact coded records
+        self.normalizer = normalizer
+        self.previous_records = None
         self.previous_incidents = None
         
         # Use dependency injection with defaults
@@ -34,6 +41,10 @@ class DataManager(IDeltaProcessor, ICacheManager):
         self.file_manager = file_manager or FileManager(self.data_dir)
         self.comparator = comparator or DataComparator()
         self.center_mapper = center_mapper or CenterMapper()
+        
+        # Optional storage backend (e.g. SQLite); JSON files become an optional export
+        self.delta_processor = delta_processor
+        self.export_json = export_json
     
     def incidents_to_json(self, incidents_data: List[Dict]) -> Dict[str, Any]:
         """Convert incidents data to JSON format"""
@@ -75,6 +86,11 @@ class DataManager(IDeltaProcessor, ICacheManager):
     
     def save_delta_updates(self, changes: Dict[str, List]) -> bool:
         """Save only the changes (deltas) to a separate file"""
+        if self.delta_processor is not None:
+            saved = self.delta_processor.save_delta_updates(changes)
+            if not self.export_json:
+                return saved
+        
         if not changes or (not changes.get('new_incidents') and not changes.get('removed_incidents')):
             logging.info("No changes detected - skipping delta file write")
             return False
@@ -135,8 +151,13 @@ class DataManager(IDeltaProcessor, ICacheManager):
         logging.info(f"Saved delta updates: {len(new_incidents_json)} new, {len(removed_incidents_json)} removed")
         return success
     
-    def append_daily_incidents(self, incidents_data: List[List[str]]) -> None:
+    def append_daily_incidents(self, incidents_data: List[List[str]], changes: Dict[str, List] = None) -> None:
         """Append unique incidents to daily JSON file"""
+        if self.delta_processor is not None:
+            self.delta_processor.append_daily_incidents(incidents_data, changes)
+            if not self.export_json:
+                return
+        
         today = datetime.now().strftime("%Y-%m-%d")
         daily_file = f"{self.data_dir}/{today}_incidents_{self.center_code}.json"
         
@@ -174,11 +195,52 @@ class DataManager(IDeltaProcessor, ICacheManager):
     
     def compare_incidents(self, current_incidents: List[Dict]) -> Dict[str, List]:
         """Compare current incidents with previous ones"""
-        return self.comparator.compare_incidents(current_incidents, self.previous_incidents)
+        if self.previous_records is not None:
+            return self.compare_records(current_incidents)
+        return self.comparator.compare_incidents(current_incidents, self._previous_incidents)
+    
+    def compare_records(self, current_incidents: List[Dict]) -> Dict[str, List]:
+        """Same diff as the comparator against the compact records; only removed incidents are decoded"""
+        previous_details = {self.normalizer.record_key(record): self.normalizer.record_field(record, 'details')
+                            for record in self.previous_records}
+        current_keys = {f"{incident['id']}_{incident['time']}" for incident in current_incidents}
+        
+        new_incidents = []
+        updated_incidents = []
+        for incident in current_incidents:
+            key = f"{incident['id']}_{incident['time']}"
+            if key not in previous_details:
+                new_incidents.append(incident)
+            elif previous_details[key] != (incident.get('details') or ''):
+                updated_incidents.append(incident)
+        removed_incidents = [self.normalizer.decode(record) for record in self.previous_records
+                             if self.normalizer.record_key(record) not in current_keys]
+        
+        return {
+            "new_incidents": new_incidents,
+            "removed_incidents": removed_incidents,
+            "updated_incidents": updated_incidents
+        }
+    
+    @property
+    def previous_incidents(self) -> List[Dict]:
+        """Previous snapshot, decoded from compact records when a normalizer is set (use previous_records to avoid it)"""
+        if self.previous_records is not None:
+            return [self.normalizer.decode(record) for record in self.previous_records]
+        return self._previous_incidents
+    
+    @previous_incidents.setter
+    def previous_incidents(self, incidents_data: List[Dict]) -> None:
+        self.previous_records = None
+        self._previous_incidents = incidents_data
     
     def update_previous_incidents(self, incidents_data: List[Dict]) -> None:
         """Update the previous incidents for next comparison"""
-        self.previous_incidents = incidents_data.copy()
+        if self.normalizer is not None:
+            self.previous_records = [self.normalizer.encode(incident) for incident in incidents_data]
+            self._previous_incidents = None
+        else:
+            self.previous_incidents = incidents_data.copy()
     
     def load_previous_incidents(self) -> List[Dict]:
         """Load previous incidents from active incidents file"""
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+CHP Gazetteer Builder
+Builds ca_gazetteer.json from OpenStreetMap: state highway / cross street junctions,
+exit numbers and place names for California, keyed the way IncidentGeocoder looks them up
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..', '..')
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from core.geocoder import DEFAULT_GAZETTEER_PATH, IncidentGeocoder
+
+OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+
+# Signed state highways and their ramps, the streets the ramps land on,
+# numbered exits and populated places within California
+OVERPASS_QUERY = """
+[out:json][timeout:1800];
+area["ISO3166-2"="US-CA"][admin_level=4]->.ca;
+way(area.ca)["highway"]["ref"~"(^|;) *(I|US|CA) [0-9]"]->.routes;
+way(area.ca)["highway"~"^(motorway_link|trunk_link|primary_link)$"]->.links;
+node(w.routes)->.route_nodes;
+node(w.links)->.link_nodes;
+(.route_nodes; .link_nodes;)->.junction_nodes;
+way(bn.junction_nodes)["highway"]["name"]->.streets;
+node.route_nodes["highway"="motorway_junction"]["ref"]->.exits;
+node(area.ca)["place"~"^(city|town|village|suburb|hamlet|neighbourhood)$"]["name"]->.places;
+(.routes; .links; .streets; .exits; .places;);
+out body;
+>;
+out skel qt;
+"""
+
+# OSM spells out what CHP abbreviates; abbreviated, normalize_cross strips them
+STREET_ABBREVIATIONS = {
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W',
+    'AVENUE': 'AVE', 'STREET': 'ST', 'ROAD': 'RD', 'BOULEVARD': 'BLVD', 'DRIVE': 'DR',
+    'LANE': 'LN', 'PARKWAY': 'PKWY', 'HIGHWAY': 'HWY', 'COURT': 'CT', 'PLACE': 'PL'
+}
+
+# "I 5", "US 101", "CA 99" -> "I5", "US101", "SR99"
+OSM_ROUTE_PATTERN = re.compile(r'^(I|US|CA)\s*-?\s*(\d{1,3})$')
+
+# Larger places win a name shared by several (there are many "Lakeside"s)
+PLACE_RANK = {'city': 0, 'town': 1, 'village': 2, 'suburb': 3, 'hamlet': 4, 'neighbourhood': 5}
+
+def osm_routes(ref: str) -> List[str]:
+    """Canonical route names of an OSM ref tag ("I 5;CA 99" -> ["I5", "SR99"])"""
+    routes = []
+    for part in ref.upper().split(';'):
+        match = OSM_ROUTE_PATTERN.match(part.strip())
+        if match:
+            routes.append(('SR' if match.group(1) == 'CA' else match.group(1)) + match.group(2))
+    return routes
+
+def chp_street(name: str, geocoder: IncidentGeocoder) -> str:
+    """An OSM street name as normalize_cross leaves a CHP cross street"""
+    words = [STREET_ABBREVIATIONS.get(word, word) for word in name.upper().replace('-', ' ').split()]
+    return geocoder.normalize_cross(' '.join(words))
+
+def route_pairs(route_sets: List[Set[str]]) -> Set[Tuple[str, str]]:
+    """Routes that meet rather than run together: pairs of refs from different ways that don't share them"""
+    pairs = set()
+    for first in route_sets:
+        for second in route_sets:
+            for route in first - second:
+                for other in second - first:
+                    pairs.add((min(route, other), max(route, other)))
+    return pairs
+
+def centroid(points: List[Tuple[float, float]], max_spread_km: float) -> Optional[Tuple[float, float]]:
+    """Mean of the points, None when they are too far apart to be one place (a street name reused across towns)"""
+    lat = sum(point[0] for point in points) / len(points)
+    lon = sum(point[1] for point in points) / len(points)
+    for point_lat, point_lon in points:
+        dx = (point_lon - lon) * 111.32 * math.cos(math.radians(lat))
+        dy = (point_lat - lat) * 110.57
+        if math.hypot(dx, dy) > max_spread_km:
+            return None
+    return round(lat, 4), round(lon, 4)
+
+def fetch_overpass(url: str, timeout: float = 1900) -> dict:
+    """Run the extract query against an Overpass API instance"""
+    response = requests.post(url, data={'data': OVERPASS_QUERY}, timeout=timeout,
+                             headers={'User-Agent': 'CHP-Traffic-Monitor/1.0 (gazetteer builder)'})
+    response.raise_for_status()
+    return response.json()
+
+def extract(osm: dict, geocoder: IncidentGeocoder, max_spread_km: float) -> Tuple[Dict[str, List[float]], Dict[str, List[float]], Dict[str, int]]:
+    """Intersections and areas from an Overpass JSON extract, plus counts of what was kept and dropped"""
+    nodes: Dict[int, Tuple[float, float]] = {}
+    ways = []
+    places: Dict[str, Tuple[int, List[float]]] = {}
+    exits: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+    for element in osm.get('elements', []):
+        if element['type'] == 'node':
+            nodes[element['id']] = (element['lat'], element['lon'])
+            tags = element.get('tags', {})
+            rank = PLACE_RANK.get(tags.get('place'))
+            if rank is not None and tags.get('name'):
+                name = tags['name'].upper()
+                if name not in places or rank < places[name][0]:
+                    places[name] = (rank, [round(element['lat'], 4), round(element['lon'], 4)])
+        elif element['type'] == 'way':
+            ways.append(element)
+
+    # Which routes and which cross streets pass through each node
+    node_routes: Dict[int, Set[str]] = defaultdict(set)
+    node_route_sets: Dict[int, List[Set[str]]] = defaultdict(list)
+    node_streets: Dict[int, Set[str]] = defaultdict(set)
+    links = []
+    for way in ways:
+        tags = way.get('tags', {})
+        highway = tags.get('highway', '')
+        routes = osm_routes(tags.get('ref', ''))
+        if highway.endswith('_link'):
+            links.append(way['nodes'])
+        elif routes:
+            for node_id in way['nodes']:
+                node_routes[node_id].update(routes)
+                node_route_sets[node_id].append(set(routes))
+        if tags.get('name') and not highway.endswith('_link'):
+            street = chp_street(tags['name'], geocoder)
+            if street and not routes:
+                for node_id in way['nodes']:
+                    node_streets[node_id].add(street)
+
+    for element in osm.get('elements', []):
+        tags = element.get('tags', {})
+        if element['type'] == 'node' and tags.get('highway') == 'motorway_junction' and tags.get('ref'):
+            exit_number = tags['ref'].upper().split(';')[0].strip()
+            for route in node_routes.get(element['id'], ()):
+                exits[f"{route}|EXIT {exit_number}"].append(nodes[element['id']])
+
+    candidates: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
+
+    def add(route: str, cross: str, point: Tuple[float, float]) -> None:
+        candidates[f"{route}|{cross}"].append(point)
+
+    # At-grade crossings and route/route junctions share a node (concurrent routes share a way, not a junction)
+    for node_id, routes in node_routes.items():
+        if node_id not in nodes:
+            continue
+        for route in routes:
+            for street in node_streets.get(node_id, ()):
+                add(route, street, nodes[node_id])
+        for route, other in route_pairs(node_route_sets[node_id]):
+            add(route, other, nodes[node_id])
+
+    # Interchanges: a ramp joins the route at one end and the cross street (or another route) at the other
+    for link_nodes in links:
+        known = [node_id for node_id in link_nodes if node_id in nodes]
+        if not known:
+            continue
+        routes = set().union(*(node_routes.get(node_id, set()) for node_id in known))
+        streets = set().union(*(node_streets.get(node_id, set()) for node_id in known))
+        point = nodes[known[len(known) // 2]]
+        for route in routes:
+            for street in streets:
+                add(route, street, point)
+        for route, other in route_pairs([route_set for node_id in known for route_set in node_route_sets.get(node_id, [])]):
+            add(route, other, point)
+
+    intersections: Dict[str, List[float]] = {}
+    counts = {'junctions': 0, 'ambiguous': 0, 'exits': 0, 'places': len(places)}
+    for source, key_points in (('junctions', candidates), ('exits', exits)):
+        for key, points in key_points.items():
+            coords = centroid(points, max_spread_km)
+            if coords is None:
+                counts['ambiguous'] += 1
+                continue
+            intersections[key] = list(coords)
+            counts[source] += 1
+    areas = {name: coords for name, (_, coords) in places.items()}
+    return intersections, areas, counts
+
+def merge(gazetteer: dict, intersections: Dict[str, List[float]], areas: Dict[str, List[float]]) -> dict:
+    """Add extracted entries; hand-curated entries already in the gazetteer are kept as they are"""
+    merged = dict(gazetteer)
+    merged['intersections'] = {**intersections, **gazetteer.get('intersections', {})}
+    merged['areas'] = {**areas, **gazetteer.get('areas', {})}
+    return merged
+
+def dump(gazetteer: dict, path: str) -> None:
+    """Write the gazetteer with one entry per line, sorted, as the bundled file is laid out"""
+    lines = ['{']
+    sections = [key for key in gazetteer if key not in ('intersections', 'areas', 'centers')]
+    for key in sections:
+        lines.append(f'  {json.dumps(key)}: {json.dumps(gazetteer[key])},')
+    for index, section in enumerate(('intersections', 'areas', 'centers')):
+        entries = gazetteer.get(section, {})
+        lines.append(f'  {json.dumps(section)}: {{')
+        lines.append(',\n'.join(f'    {json.dumps(name)}: [{lat:.4f}, {lon:.4f}]'
+                                for name, (lat, lon) in sorted(entries.items())))
+        lines.append('  },' if index < 2 else '  }')
+    lines.append('}')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+def captured_incidents() -> Iterable[dict]:
+    """Incidents of the captured data/ snapshots"""
+    for path in sorted(glob.glob(os.path.join(ROOT, 'data', '*_incidents_*.json'))):
+        with open(path) as f:
+            snapshot = json.load(f)
+        for incident in snapshot.get('incidents', []):
+            yield {**incident, 'center_code': snapshot.get('center_code', '')}
+
+def coverage(path: str) -> Dict[str, int]:
+    """Precision counts of the captured incidents geocoded with a gazetteer file"""
+    geocoder = IncidentGeocoder(path)
+    counts: Dict[str, int] = defaultdict(int)
+    for incident in captured_incidents():
+        geo = geocoder.geocode_incident(incident)
+        counts[geo['precision'] if geo else 'none'] += 1
+    return dict(counts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--osm', help='Overpass JSON extract to build from (default: run the query against --overpass-url)')
+    parser.add_argument('--overpass-url', default=OVERPASS_URL, help='Overpass API interpreter URL')
+    parser.add_argument('--save-osm', help='Also write the fetched extract here, to rebuild without fetching again')
+    parser.add_argument('--base', default=DEFAULT_GAZETTEER_PATH, help='Gazetteer whose entries are kept and extended')
+    parser.add_argument('--out', default=DEFAULT_GAZETTEER_PATH, help='Gazetteer file to write')
+    parser.add_argument('--max-spread', type=float, default=3.0,
+                        help='Drop a key whose junctions are more than this many km from their centroid')
+    parser.add_argument('--print-query', action='store_true', help='Print the Overpass query and exit')
+    args = parser.parse_args()
+
+    if args.print_query:
+        print(OVERPASS_QUERY.strip())
+        return
+
+    if args.osm:
+        with open(args.osm) as f:
+            osm = json.load(f)
+    else:
+        print(f"🌐 Querying {args.overpass_url} (California, this takes several minutes)")
+        osm = fetch_overpass(args.overpass_url)
+        if args.save_osm:
+            with open(args.save_osm, 'w') as f:
+                json.dump(osm, f)
+
+    with open(args.base) as f:
+        base = json.load(f)
+    before = coverage(args.base)
+    intersections, areas, counts = extract(osm, IncidentGeocoder(args.base), args.max_spread)
+    print(f"✅ {counts['junctions']} highway junctions, {counts['exits']} exits, {counts['places']} places "
+          f"({counts['ambiguous']} ambiguous keys dropped)")
+
+    dump(merge(base, intersections, areas), args.out)
+    print(f"💾 {args.out}")
+    print(f"📍 Captured incidents by precision: {before} -> {coverage(args.out)}")
+
+if __name__ == "__main__":
+    main()
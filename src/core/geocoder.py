@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Incident Geocoder Implementation
+Single Responsibility: Resolves free-text CHP locations to coordinates with a bundled offline gazetteer
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'gazetteer', 'ca_gazetteer.json')
+
+# "I5", "Sr125", "US101", "I-80" -> "I5", "SR125", "US101", "I80"
+ROUTE_PATTERN = re.compile(r'^(I|SR|US|HWY)[- ]?(\d{1,3})\b')
+
+# Trailing qualifiers that don't change the cross street: relative position
+# ("So", "JNO"), ramps ("Ofr"), directions and street types
+QUALIFIERS = {
+    'N', 'S', 'E', 'W', 'NB', 'SB', 'EB', 'WB',
+    'NO', 'SO', 'EO', 'WO', 'JNO', 'JSO', 'JEO', 'JWO', 'AT',
+    'OFR', 'ONR', 'CON', 'RAMP',
+    'AVE', 'AV', 'ST', 'RD', 'BLVD', 'DR', 'WAY', 'LN', 'PKWY', 'HWY', 'CT', 'PL'
+}
+
+class IncidentGeocoder:
+    """Memoized lookup of incident coordinates at intersection, area or center precision"""
+
+    def __init__(self, gazetteer_path: str = DEFAULT_GAZETTEER_PATH, cache_size: int = 8192):
+        with open(gazetteer_path, 'r') as f:
+            gazetteer = json.load(f)
+        self.intersections: Dict[str, List[float]] = gazetteer.get('intersections', {})
+        self.areas: Dict[str, List[float]] = gazetteer.get('areas', {})
+        self.centers: Dict[str, List[float]] = gazetteer.get('centers', {})
+        self._lookup = lru_cache(maxsize=cache_size)(self._lookup_uncached)
+
+    def normalize_route(self, text: str) -> Optional[str]:
+        """Canonical route name of a location part, None if it isn't a highway"""
+        match = ROUTE_PATTERN.match(text)
+        if match is None:
+            return None
+        prefix = 'SR' if match.group(1) == 'HWY' else match.group(1)
+        return prefix + match.group(2)
+
+    def normalize_cross(self, text: str) -> str:
+        """Cross street name without directions, ramps, street types or parentheticals"""
+        text = re.sub(r'\(.*?\)', ' ', text)
+        route = self.normalize_route(text)
+        if route:
+            return route
+        words = [word for word in re.split(r'[\s.]+', text) if word]
+        while words and words[0] in QUALIFIERS:
+            words.pop(0)
+        while words and words[-1] in QUALIFIERS:
+            words.pop()
+        return ' '.join(words)
+
+    def intersection_keys(self, location: str) -> List[str]:
+        """Candidate gazetteer keys ("ROUTE|CROSS") for a "Route Dir / Cross Street" location"""
+        parts = [part.strip() for part in location.upper().split('/') if part.strip()]
+        if len(parts) < 2:
+            return []
+
+        route = self.normalize_route(parts[0])
+        cross = self.normalize_cross(parts[1])
+        if not route or not cross:
+            return []
+        keys = [f"{route}|{cross}"]
+        if self.normalize_route(cross):
+            keys.append(f"{cross}|{route}")
+        return keys
+
+    def _lookup_uncached(self, location: str, area: str, center_code: str) -> Optional[Tuple[float, float, str]]:
+        """Resolve coordinates, falling back from intersection to area to center"""
+        for key in self.intersection_keys(location):
+            if key in self.intersections:
+                lat, lon = self.intersections[key]
+                return lat, lon, 'intersection'
+
+        # A bare place name in the location column is more specific than the area column
+        for name in (location, area):
+            coords = self.areas.get(name.strip().upper())
+            if coords:
+                return coords[0], coords[1], 'area'
+
+        coords = self.centers.get(center_code)
+        if coords:
+            return coords[0], coords[1], 'center'
+        return None
+
+    def geocode(self, location: str, area: str = '', center_code: str = '') -> Optional[Dict[str, object]]:
+        """Coordinates of an incident location as {'lat', 'lon', 'precision'}, None if unknown"""
+        result = self._lookup(location or '', area or '', center_code or '')
+        if result is None:
+            return None
+        lat, lon, precision = result
+        return {'lat': lat, 'lon': lon, 'precision': precision}
+
+    def geocode_incident(self, incident: Dict[str, object]) -> Optional[Dict[str, object]]:
+        """Geocode an incident dict; the city/area name is in the 'details' column of the CHP table"""
+        return self.geocode(incident.get('location', ''), incident.get('details', ''),
+                            incident.get('center_code', ''))
+
+    def cache_info(self):
+        """Expose LRU cache statistics"""
+        return self._lookup.cache_info()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Hedge Policy Implementation
+Single Responsibility: Decides when to hedge slow requests (rolling p95 per center) under a strict budget
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+
+def percentile(values: Iterable[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+class HedgePolicy:
+    """Rolling latency windows, hedge budget and the latency statistics hedging is judged by"""
+
+    def __init__(self, window: int = 100, min_samples: int = 20, hedge_percentile: float = 0.95,
+                 budget_ratio: float = 0.05, max_tokens: float = 3.0, min_delay: float = 0.25):
+        self.window = window
+        self.min_samples = min_samples
+        self.hedge_percentile = hedge_percentile
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.min_delay = min_delay
+
+        self.center_latencies: Dict[str, Deque[float]] = {}
+        self.tokens = 0.0
+        # Cycle-wide windows: latency delivered to the caller vs the primary attempt alone
+        self.effective_latencies: Deque[float] = deque(maxlen=2000)
+        self.primary_latencies: Deque[float] = deque(maxlen=2000)
+        self.stats = {'requests': 0, 'hedges': 0, 'hedge_wins': 0, 'budget_denied': 0}
+
+    def hedge_delay(self, center_code: str) -> Optional[float]:
+        """Seconds after which to hedge a center's request, None until enough samples exist"""
+        latencies = self.center_latencies.get(center_code)
+        if latencies is None or len(latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, percentile(latencies, self.hedge_percentile))
+
+    def start_request(self) -> None:
+        """Count a primary request; each one earns budget_ratio of a hedge"""
+        self.stats['requests'] += 1
+        self.tokens = min(self.max_tokens, self.tokens + self.budget_ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget"""
+        if self.tokens < 1:
+            self.stats['budget_denied'] += 1
+            return False
+        self.tokens -= 1
+        self.stats['hedges'] += 1
+        return True
+
+    def record_primary(self, center_code: str, latency: float) -> None:
+        """Latency of a primary attempt (a lower bound when its hedge won); feeds the center's rolling window"""
+        latencies = self.center_latencies.setdefault(center_code, deque(maxlen=self.window))
+        latencies.append(latency)
+        self.primary_latencies.append(latency)
+
+    def record_effective(self, latency: float, hedge_won: bool = False) -> None:
+        """Latency the caller actually waited for"""
+        self.effective_latencies.append(latency)
+        if hedge_won:
+            self.stats['hedge_wins'] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Hedge counters and p50/p95/p99 with and without hedging"""
+        def rounded(value):
+            return round(value, 3) if value is not None else None
+
+        effective_p99 = percentile(self.effective_latencies, 0.99)
+        primary_p99 = percentile(self.primary_latencies, 0.99)
+        requests = self.stats['requests'] or 1
+        return {
+            **self.stats,
+            'hedge_rate': round(self.stats['hedges'] / requests, 4),
+            'budget_tokens': round(self.tokens, 2),
+            'latency_p50': rounded(percentile(self.effective_latencies, 0.50)),
+            'latency_p95': rounded(percentile(self.effective_latencies, 0.95)),
+            'latency_p99': rounded(effective_p99),
+            'unhedged_latency_p99': rounded(primary_p99),
+            'p99_improvement': rounded(primary_p99 - effective_p99) if effective_p99 is not None else None
+        }
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Incident Normalizer Implementation
+Single Responsibility: Interns repeated incident strings into shared dictionaries with small integer codes
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# String fields shared by many incidents (details holds the CHP area name)
+CODED_FIELDS = ('center_code', 'type', 'location', 'area', 'details')
+LANE_STATUSES = (None, 'unknown', 'no_blockage', 'blocking', 'resolved')
+PRECISIONS = (None, 'intersection', 'area', 'center')
+
+class StringTable:
+    """String <-> integer code dictionary; grows between compactions, which keep only live values"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, value: str) -> int:
+        """Code of a value, assigning the next one on first sight"""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def decode(self, code: int) -> str:
+        """Value of a code"""
+        return self.values[code]
+
+    def intern(self, value: str) -> str:
+        """Canonical shared instance of a value"""
+        return self.values[self.encode(value)]
+
+    def __len__(self) -> int:
+        """Number of distinct values"""
+        return len(self.values)
+
+class IncidentNormalizer:
+    """Interns parsed incidents and packs snapshots into compact coded records"""
+
+    def __init__(self):
+        self.tables = {field: StringTable() for field in CODED_FIELDS}
+        self.lane_status_codes = {status: code for code, status in enumerate(LANE_STATUSES)}
+        self.precision_codes = {precision: code for code, precision in enumerate(PRECISIONS)}
+
+    def intern(self, incident: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace repeated string fields with their shared instances (in place)"""
+        for field in CODED_FIELDS:
+            value = incident.get(field)
+            if isinstance(value, str):
+                incident[field] = self.tables[field].intern(value)
+        return incident
+
+    def encode(self, incident: Dict[str, Any]) -> Tuple:
+        """Compact record: (id, time, coded fields..., lane status, lat, lon, precision)"""
+        lane_blockage = incident.get('lane_blockage') or {}
+        geo = incident.get('geo') or {}
+        return (
+            incident.get('id', ''),
+            incident.get('time', ''),
+            *(self.tables[field].encode(incident.get(field) or '') for field in CODED_FIELDS),
+            self.lane_status_codes.get(lane_blockage.get('status'), 0),
+            geo.get('lat'),
+            geo.get('lon'),
+            self.precision_codes.get(geo.get('precision'), 0)
+        )
+
+    def decode(self, record: Tuple) -> Dict[str, Any]:
+        """Incident dict of a compact record (derived lane data is not kept)"""
+        incident_id, incident_time = record[0], record[1]
+        field_codes = record[2:2 + len(CODED_FIELDS)]
+        lane_status, lat, lon, precision = record[2 + len(CODED_FIELDS):]
+
+        incident = {'id': incident_id, 'time': incident_time}
+        for field, code in zip(CODED_FIELDS, field_codes):
+            incident[field] = self.tables[field].decode(code)
+        if lane_status:
+            incident['lane_blockage'] = {'status': LANE_STATUSES[lane_status], 'details': []}
+        if lat is not None:
+            incident['geo'] = {'lat': lat, 'lon': lon, 'precision': PRECISIONS[precision]}
+        return incident
+
+    def record_key(self, record: Tuple) -> str:
+        """Diff key of a compact record, as DataComparator builds it for incident dicts"""
+        return f"{record[0]}_{record[1]}"
+
+    def record_field(self, record: Tuple, field: str) -> str:
+        """One coded field of a compact record, without decoding the rest"""
+        return self.tables[field].decode(record[2 + CODED_FIELDS.index(field)])
+
+    def compact(self, snapshots: Iterable[List[Tuple]]) -> List[List[Tuple]]:
+        """Rebuild the tables from the values the given live snapshots still use
+
+        Codes change, so every snapshot encoded with these tables must be passed in and
+        replaced by the re-encoded one returned at the same position. Interned strings
+        stay valid: the new tables keep the same string instances.
+        """
+        tables = {field: StringTable() for field in CODED_FIELDS}
+        compacted = []
+        for records in snapshots:
+            remapped = []
+            for record in records:
+                codes = record[2:2 + len(CODED_FIELDS)]
+                remapped.append((
+                    record[0], record[1],
+                    *(tables[field].encode(self.tables[field].decode(code)) for field, code in zip(CODED_FIELDS, codes)),
+                    *record[2 + len(CODED_FIELDS):]
+                ))
+            compacted.append(remapped)
+        self.tables = tables
+        return compacted
+
+    def stats(self) -> Dict[str, int]:
+        """Distinct values per coded field"""
+        return {field: len(table) for field, table in self.tables.items()}
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+SQLite Incident Store Implementation
+Single Responsibility: Persists incident history in an indexed SQLite database
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from .interfaces import IFileManager, IDeltaProcessor
+from .data_serializer import DataSerializer
+
+# An incident that has not been seen for this long is treated as a new
+# occurrence (CHP incident numbers are recycled from day to day)
+INCIDENT_REUSE_WINDOW = 12 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    center_code TEXT NOT NULL,
+    incident_id TEXT NOT NULL,
+    incident_time TEXT NOT NULL,
+    type TEXT,
+    location TEXT,
+    area TEXT,
+    details TEXT,
+    lane_status TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_center_first_seen ON incidents (center_code, first_seen);
+CREATE INDEX IF NOT EXISTS idx_incidents_type ON incidents (type);
+CREATE INDEX IF NOT EXISTS idx_incidents_incident_id ON incidents (incident_id);
+CREATE INDEX IF NOT EXISTS idx_incidents_first_seen ON incidents (first_seen);
+
+CREATE TABLE IF NOT EXISTS deltas (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    center_code TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    new_count INTEGER NOT NULL,
+    removed_count INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deltas_center_recorded ON deltas (center_code, recorded_at);
+
+CREATE TABLE IF NOT EXISTS lifecycle (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    center_code TEXT NOT NULL,
+    incident_id TEXT NOT NULL,
+    incident_time TEXT,
+    type TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    resolved_at REAL,
+    detail_revisions INTEGER NOT NULL DEFAULT 0,
+    peak_lane_status TEXT,
+    observations INTEGER NOT NULL DEFAULT 1
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lifecycle_open ON lifecycle (center_code, incident_id) WHERE resolved_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_lifecycle_center_first_seen ON lifecycle (center_code, first_seen);
+CREATE INDEX IF NOT EXISTS idx_lifecycle_incident ON lifecycle (center_code, incident_id, incident_time);
+
+CREATE TABLE IF NOT EXISTS center_cycles (
+    center_code TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Open incidents are listed on every cycle of their center, so an open lifecycle was last seen at its
+# center's latest cycle; stored last_seen columns only move when an incident changes or leaves the feed
+LIFECYCLE_LAST_SEEN = (
+    "CASE WHEN lifecycle.resolved_at IS NULL THEN MAX(lifecycle.last_seen, COALESCE("
+    "(SELECT center_cycles.last_seen FROM center_cycles WHERE center_cycles.center_code = lifecycle.center_code), "
+    "lifecycle.last_seen)) ELSE lifecycle.last_seen END"
+)
+INCIDENT_LAST_SEEN = (
+    f"COALESCE((SELECT {LIFECYCLE_LAST_SEEN} FROM lifecycle WHERE lifecycle.center_code = incidents.center_code "
+    "AND lifecycle.incident_id = incidents.incident_id AND lifecycle.incident_time = incidents.incident_time "
+    "ORDER BY lifecycle.row_id DESC LIMIT 1), incidents.last_seen)"
+)
+
+def encode_cursor(first_seen: float, row_id: int) -> str:
+    """Encode a keyset position as an opaque cursor string"""
+    return base64.urlsafe_b64encode(f"{first_seen!r}:{row_id}".encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor string into (first_seen, row_id), raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        first_seen, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+        return float(first_seen), int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+class IncidentStore:
+    """Embedded SQLite database (WAL mode) shared by all centers"""
+
+    def __init__(self, db_path: str = "data/incidents.db", read_only: bool = False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        if read_only:
+            # Query-only handle on a store another process writes: no pragmas, no schema changes
+            self._conn = self.reader()
+            return
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Autocommit mode - transactions are opened explicitly by transaction()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def reader(self) -> sqlite3.Connection:
+        """New read-only connection; WAL readers never block the writer"""
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into a single transaction (nested calls join the outer one)"""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield self._conn
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("COMMIT")
+
+    def upsert_incidents(self, center_code: str, incidents: List[Dict], seen_at: float = None) -> int:
+        """Insert new incidents and refresh last_seen/payload of known ones, returns inserted count"""
+        seen_at = seen_at or time.time()
+        inserted = 0
+
+        with self.transaction() as conn:
+            for incident in incidents:
+                payload = json.dumps(incident)
+                lane_status = (incident.get('lane_blockage') or {}).get('status')
+                cursor = conn.execute(
+                    "UPDATE incidents SET last_seen = ?, type = ?, location = ?, area = ?, details = ?, "
+                    "lane_status = ?, payload = ? "
+                    "WHERE incident_id = ? AND center_code = ? AND incident_time = ? AND last_seen >= ?",
+                    (seen_at, incident.get('type'), incident.get('location'), incident.get('area'),
+                     incident.get('details'), lane_status, payload,
+                     incident['id'], center_code, incident['time'], seen_at - INCIDENT_REUSE_WINDOW)
+                )
+                if cursor.rowcount == 0:
+                    conn.execute(
+                        "INSERT INTO incidents (center_code, incident_id, incident_time, type, location, area, "
+                        "details, lane_status, first_seen, last_seen, payload) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (center_code, incident['id'], incident['time'], incident.get('type'),
+                         incident.get('location'), incident.get('area'), incident.get('details'),
+                         lane_status, seen_at, seen_at, payload)
+                    )
+                    inserted += 1
+
+        return inserted
+
+    def record_changes(self, center_code: str, changes: Dict[str, List], seen_at: float = None) -> int:
+        """Write only what a diff changed: insert new incidents, rewrite updated ones and stamp last_seen
+        on removed ones; returns inserted count. last_seen of unchanged incidents is not refreshed."""
+        seen_at = seen_at or time.time()
+        with self.transaction() as conn:
+            inserted = self.upsert_incidents(center_code, changes.get('new_incidents', []), seen_at)
+            for incident in changes.get('updated_incidents', []):
+                conn.execute(
+                    "UPDATE incidents SET last_seen = ?, type = ?, location = ?, area = ?, details = ?, "
+                    "lane_status = ?, payload = ? WHERE row_id = (SELECT MAX(row_id) FROM incidents "
+                    "WHERE incident_id = ? AND center_code = ? AND incident_time = ?)",
+                    (seen_at, incident.get('type'), incident.get('location'), incident.get('area'),
+                     incident.get('details'), (incident.get('lane_blockage') or {}).get('status'),
+                     json.dumps(incident), incident['id'], center_code, incident['time'])
+                )
+            conn.executemany(
+                "UPDATE incidents SET last_seen = ? WHERE row_id = (SELECT MAX(row_id) FROM incidents "
+                "WHERE incident_id = ? AND center_code = ? AND incident_time = ?)",
+                [(seen_at, incident['id'], center_code, incident['time'])
+                 for incident in changes.get('removed_incidents', [])]
+            )
+        return inserted
+
+    def record_delta(self, center_code: str, delta_data: Dict[str, Any], recorded_at: float = None) -> None:
+        """Append a delta record for a center"""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO deltas (center_code, recorded_at, new_count, removed_count, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (center_code, recorded_at or time.time(), delta_data.get('new_count', 0),
+                 delta_data.get('removed_count', 0), json.dumps(delta_data))
+            )
+
+    def load_open_lifecycles(self) -> List[Dict[str, Any]]:
+        """Load all lifecycles that have not been resolved yet"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT center_code, incident_id, peak_lane_status, observations FROM lifecycle WHERE resolved_at IS NULL"
+            ).fetchall()
+        return [{'center_code': row[0], 'incident_id': row[1], 'peak_lane_status': row[2], 'observations': row[3]}
+                for row in rows]
+
+    def open_lifecycles(self, center_code: str, incidents: List[Dict], seen_at: float) -> None:
+        """Start lifecycles for newly observed incidents"""
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO lifecycle (center_code, incident_id, incident_time, type, first_seen, last_seen, "
+                "peak_lane_status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(center_code, incident['id'], incident.get('time'), incident.get('type'), seen_at, seen_at,
+                  (incident.get('lane_blockage') or {}).get('status')) for incident in incidents]
+            )
+
+    def revise_lifecycles(self, center_code: str, revisions: List[tuple]) -> None:
+        """Count a detail revision and update the peak lane status and observation counters,
+        revisions are (incident_id, peak_status, last_seen, observations)"""
+        with self.transaction() as conn:
+            conn.executemany(
+                "UPDATE lifecycle SET detail_revisions = detail_revisions + 1, peak_lane_status = ?, "
+                "last_seen = ?, observations = ? WHERE center_code = ? AND incident_id = ? AND resolved_at IS NULL",
+                [(peak_status, last_seen, observations, center_code, incident_id)
+                 for incident_id, peak_status, last_seen, observations in revisions]
+            )
+
+    def update_lifecycle_counters(self, center_code: str, counters: List[tuple]) -> None:
+        """Write last_seen and observations of open lifecycles, counters are (incident_id, last_seen, observations)"""
+        with self.transaction() as conn:
+            conn.executemany(
+                "UPDATE lifecycle SET last_seen = ?, observations = ? "
+                "WHERE center_code = ? AND incident_id = ? AND resolved_at IS NULL",
+                [(last_seen, observations, center_code, incident_id) for incident_id, last_seen, observations in counters]
+            )
+
+    def record_center_cycle(self, center_code: str, seen_at: float) -> None:
+        """Stamp a center's latest observed cycle (one row per center, the last_seen of its open lifecycles)"""
+        with self.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO center_cycles (center_code, last_seen) VALUES (?, ?)",
+                         (center_code, seen_at))
+
+    def resolve_lifecycles(self, center_code: str, resolutions: List[tuple], resolved_at: float) -> None:
+        """Close the lifecycles of incidents that disappeared from the feed, resolutions are
+        (incident_id, last_seen, observations); a None last_seen falls back to the center's last cycle"""
+        with self.transaction() as conn:
+            conn.executemany(
+                "UPDATE lifecycle SET resolved_at = ?, last_seen = COALESCE(?, (SELECT center_cycles.last_seen "
+                "FROM center_cycles WHERE center_cycles.center_code = lifecycle.center_code), last_seen), "
+                "observations = COALESCE(?, observations) "
+                "WHERE center_code = ? AND incident_id = ? AND resolved_at IS NULL",
+                [(resolved_at, last_seen, observations, center_code, incident_id)
+                 for incident_id, last_seen, observations in resolutions]
+            )
+
+    def lifecycle_records(self, center_codes: List[str] = None, since: float = None) -> List[tuple]:
+        """(duration seconds or None while open, detail_revisions, peak_lane_status) of lifecycles,
+        optionally filtered by centers and first_seen"""
+        query = "SELECT resolved_at - first_seen, detail_revisions, peak_lane_status FROM lifecycle"
+        clauses = []
+        params: List[Any] = []
+        if center_codes:
+            clauses.append(f"center_code IN ({', '.join('?' for _ in center_codes)})")
+            params.extend(center_codes)
+        if since is not None:
+            clauses.append("first_seen >= ?")
+            params.append(since)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        reader = self.reader()
+        try:
+            return reader.execute(query, params).fetchall()
+        finally:
+            reader.close()
+
+    def query_incidents(self, center_codes: List[str] = None, incident_type: str = None,
+                        since: float = None, until: float = None, location: str = None,
+                        lane_status: str = None, after: tuple = None, limit: int = None,
+                        batch_size: int = 200):
+        """Yield stored incidents ordered by (first_seen, row_id), reading in batches
+
+        A trailing '*' in incident_type matches by prefix. `after` is a decoded
+        cursor; each yielded incident carries the cursor of its own position.
+        """
+        clauses = []
+        params: List[Any] = []
+        if center_codes:
+            clauses.append(f"center_code IN ({', '.join('?' for _ in center_codes)})")
+            params.extend(center_codes)
+        if incident_type:
+            if incident_type.endswith('*'):
+                prefix = incident_type[:-1]
+                clauses.append("type >= ? AND type < ?")
+                params.extend([prefix, prefix + '\uffff'])
+            else:
+                clauses.append("type = ?")
+                params.append(incident_type)
+        if since is not None:
+            clauses.append("first_seen >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("first_seen < ?")
+            params.append(until)
+        if location:
+            # Literal substring: the user's % and _ are not wildcards
+            pattern = '%' + location.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            clauses.append("(location LIKE ? ESCAPE '\\' OR area LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+        if lane_status:
+            clauses.append("lane_status = ?")
+            params.append(lane_status)
+        if after is not None:
+            clauses.append("(first_seen > ? OR (first_seen = ? AND row_id > ?))")
+            params.extend([after[0], after[0], after[1]])
+
+        query = f"SELECT row_id, center_code, first_seen, {INCIDENT_LAST_SEEN}, payload FROM incidents"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY first_seen, row_id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        # Separate read-only connection: WAL readers never block the scraper's writes
+        reader = self.reader()
+        try:
+            cursor = reader.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row_id, center_code, first_seen, last_seen, payload in rows:
+                    incident = json.loads(payload)
+                    incident['center_code'] = center_code
+                    incident['first_seen'] = datetime.fromtimestamp(first_seen).isoformat()
+                    incident['last_seen'] = datetime.fromtimestamp(last_seen).isoformat()
+                    incident['cursor'] = encode_cursor(first_seen, row_id)
+                    yield incident
+        finally:
+            reader.close()
+
+    def iter_rows(self, since: float, until: float, batch_size: int = 500):
+        """Yield raw incident columns (no JSON payload) for incidents first seen in [since, until)"""
+        reader = self.reader()
+        try:
+            cursor = reader.execute(
+                "SELECT center_code, incident_id, incident_time, type, location, area, details, lane_status, "
+                f"first_seen, {INCIDENT_LAST_SEEN} AS last_seen FROM incidents WHERE first_seen >= ? AND first_seen < ? "
+                "ORDER BY first_seen, row_id",
+                (since, until)
+            )
+            names = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(names, row))
+        finally:
+            reader.close()
+
+    def lifecycle_times(self, since: float, until: float) -> Dict[tuple, tuple]:
+        """(center_code, incident_id, incident_time) -> (first_seen, last_seen) of lifecycles first seen in [since, until)"""
+        reader = self.reader()
+        try:
+            return {(row[0], row[1], row[2]): (row[3], row[4]) for row in reader.execute(
+                f"SELECT center_code, incident_id, incident_time, first_seen, {LIFECYCLE_LAST_SEEN} FROM lifecycle "
+                "WHERE first_seen >= ? AND first_seen < ?", (since, until)
+            )}
+        finally:
+            reader.close()
+
+    def first_seen_days(self, until: float) -> List[str]:
+        """Local dates (YYYY-MM-DD) with incidents first seen before until"""
+        reader = self.reader()
+        try:
+            return [row[0] for row in reader.execute(
+                "SELECT DISTINCT date(first_seen, 'unixepoch', 'localtime') FROM incidents WHERE first_seen < ? "
+                "ORDER BY 1", (until,)
+            )]
+        finally:
+            reader.close()
+
+    def put_document(self, path: str, data: Any) -> None:
+        """Store a JSON document under a file-like path"""
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (path, payload, updated_at) VALUES (?, ?, ?)",
+                (path, json.dumps(data), time.time())
+            )
+
+    def get_document(self, path: str) -> Optional[Any]:
+        """Load a JSON document by path"""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM documents WHERE path = ?", (path,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def has_document(self, path: str) -> bool:
+        """Check if a document exists"""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM documents WHERE path = ?", (path,)).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+class SQLiteFileManager(IFileManager):
+    """IFileManager backed by the documents table of an IncidentStore"""
+
+    def __init__(self, store: IncidentStore):
+        self.store = store
+
+    def save_file(self, filepath: str, data: Any) -> bool:
+        """Save data to file"""
+        try:
+            self.store.put_document(filepath, data)
+            return True
+        except Exception as e:
+            logging.error(f"Error saving document {filepath}: {e}")
+            return False
+
+    def load_file(self, filepath: str) -> Optional[Any]:
+        """Load data from file"""
+        try:
+            return self.store.get_document(filepath)
+        except Exception as e:
+            logging.error(f"Error loading document {filepath}: {e}")
+            return None
+
+    def file_exists(self, filepath: str) -> bool:
+        """Check if file exists"""
+        return self.store.has_document(filepath)
+
+    def ensure_directory(self, directory: str) -> None:
+        """Ensure directory exists (no-op, documents live in the database)"""
+        pass
+
+class SQLiteDeltaProcessor(IDeltaProcessor):
+    """IDeltaProcessor writing deltas and incident history to an IncidentStore"""
+
+    def __init__(self, store: IncidentStore, center_code: str):
+        self.store = store
+        self.center_code = center_code
+        self.serializer = DataSerializer()
+
+    def save_delta_updates(self, changes: Dict[str, List]) -> bool:
+        """Save delta updates to the deltas table"""
+        if not changes or (not changes.get('new_incidents') and not changes.get('removed_incidents')):
+            return False
+
+        new_incidents = self.serializer.incidents_to_json(changes.get('new_incidents', []))['incidents']
+        removed_incidents = self.serializer.incidents_to_json(changes.get('removed_incidents', []))['incidents']
+
+        try:
+            self.store.record_delta(self.center_code, {
+                "center_code": self.center_code,
+                "new_incidents": new_incidents,
+                "removed_incidents": removed_incidents,
+                "new_count": len(new_incidents),
+                "removed_count": len(removed_incidents)
+            })
+            return True
+        except Exception as e:
+            logging.error(f"Error saving delta updates for {self.center_code}: {e}")
+            return False
+
+    def append_daily_incidents(self, incidents_data: List[Dict], changes: Dict[str, List] = None) -> None:
+        """Write incidents to the history table: only the diff when changes are given, else upsert all"""
+        if changes is not None:
+            inserted = self.store.record_changes(self.center_code, changes)
+        else:
+            incidents = self.serializer.incidents_to_json(incidents_data)['incidents']
+            inserted = self.store.upsert_incidents(self.center_code, incidents)
+        if inserted:
+            logging.info(f"Stored {inserted} new incidents for {self.center_code}")
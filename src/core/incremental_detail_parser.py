@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Incremental Detail Parser Implementation
+Single Responsibility: Re-parses only the detail lines appended since an incident's last observation
+"""
+
+from typing import List, Dict, Any, Iterable, Tuple
+
+from .lane_blockage_classifier import LaneBlockageClassifier
+from .lane_detail_extractor import LaneDetailExtractor
+
+DETAIL_SEPARATOR = ' | '
+
+class IncrementalDetailParser:
+    """Keeps per-incident parse state so known incidents only classify their new lines"""
+
+    def __init__(self, classifier: LaneBlockageClassifier = None, extractor: LaneDetailExtractor = None):
+        self.classifier = classifier or LaneBlockageClassifier()
+        self.extractor = extractor or LaneDetailExtractor()
+        # (center_code, incident_id) -> parse state
+        self.states: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.full_parses = 0
+        self.incremental_parses = 0
+        self.unchanged = 0
+
+    def _full_parse(self, details_text: str) -> Dict[str, Any]:
+        """Parse the whole text (memoized by the classifier and extractor caches)"""
+        self.full_parses += 1
+        lane_blockage = self.classifier.parse(details_text)
+        return {
+            'details': details_text,
+            'line_count': details_text.count(DETAIL_SEPARATOR) + 1,
+            'status': lane_blockage['status'],
+            'blockage_lines': lane_blockage['details'],
+            'lane_info': self.extractor.extract(details_text)
+        }
+
+    def _extend(self, state: Dict[str, Any], details_text: str) -> Dict[str, Any]:
+        """Classify only the lines appended after the previously processed prefix"""
+        self.incremental_parses += 1
+        new_lines = details_text[len(state['details']) + len(DETAIL_SEPARATOR):].split(DETAIL_SEPARATOR)
+
+        status = state['status']
+        blockage_lines = list(state['blockage_lines'])
+        lane_info = {field: list(value) if isinstance(value, list) else value
+                     for field, value in state['lane_info'].items()}
+
+        for line in new_lines:
+            # The first resolved line decides the status, exactly as a full parse would
+            if status != 'resolved':
+                kind = self.classifier.classify_line(line)
+                if kind == 'resolved':
+                    status = 'resolved'
+                    blockage_lines = [line]
+                elif kind == 'blocking':
+                    status = 'blocking'
+                    blockage_lines.append(line)
+            self.extractor.parse_line(line, lane_info)
+
+        return {
+            'details': details_text,
+            'line_count': state['line_count'] + len(new_lines),
+            'status': status,
+            'blockage_lines': blockage_lines,
+            'lane_info': lane_info
+        }
+
+    def parse(self, center_code: str, incident_id: str, details_text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return (lane_blockage, lane_info) for an incident, reusing its previous parse state"""
+        if not details_text:
+            self.states.pop((center_code, incident_id), None)
+            return {'status': 'unknown', 'details': []}, self.extractor.extract('')
+
+        key = (center_code, incident_id)
+        state = self.states.get(key)
+        if state is not None and state['details'] == details_text:
+            self.unchanged += 1
+        elif state is not None and details_text.startswith(state['details'] + DETAIL_SEPARATOR):
+            state = self._extend(state, details_text)
+        else:
+            # New incident, or the prefix no longer matches (details were rewritten)
+            state = self._full_parse(details_text)
+        self.states[key] = state
+
+        lane_info = {field: list(value) if isinstance(value, list) else value
+                     for field, value in state['lane_info'].items()}
+        return {'status': state['status'], 'details': list(state['blockage_lines'])}, lane_info
+
+    def retain(self, center_code: str, incident_ids: Iterable[str]) -> None:
+        """Drop parse state of a center's incidents that are no longer listed"""
+        keep = set(incident_ids)
+        for key in [key for key in self.states if key[0] == center_code and key[1] not in keep]:
+            del self.states[key]
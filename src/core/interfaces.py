@@ -78,8 +78,8 @@ class IDeltaProcessor(ABC):
         pass
     
     @abstractmethod
-    def append_daily_incidents(self, incidents_data: List[Dict]) -> None:
-        """Append incidents to daily file"""
+    def append_daily_incidents(self, incidents_data: List[Dict], changes: Dict[str, List] = None) -> None:
+        """Append incidents to daily file (changes, when given, limits the writes to the diff)"""
         pass
 
 class ICacheManager(ABC):
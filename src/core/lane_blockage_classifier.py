@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Lane Blockage Classifier Implementation
+Single Responsibility: Classifies CHP detail text into lane blockage status
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+# Resolved status keywords
+RESOLVED_KEYWORDS = ['NEG BLOCKING', 'NEG BLK', 'CLEARED', 'RESOLVED']
+
+# Lane blockage keywords
+BLOCKAGE_KEYWORDS = [
+    'BLKG', 'BLOCKING', '#1 LN', 'SLOW LN', 'MIDDLE LN',
+    'RHS', 'RS', 'CD', 'LANE', 'LN', 'VEH IN', 'DEBRIS'
+]
+
+def keyword_pattern(keywords) -> str:
+    """Build a trie-factored regex alternation so shared prefixes are tested once per position"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        if list(node) == ['']:
+            return ''
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+class LaneBlockageClassifier:
+    """Classifies detail lines with one compiled pattern and memoizes whole-text results"""
+
+    def __init__(self, cache_size: int = 4096):
+        # Resolved keywords come first so they win when both start at the same position
+        self.pattern = re.compile(
+            f'(?P<resolved>{keyword_pattern(RESOLVED_KEYWORDS)})|(?P<blocking>{keyword_pattern(BLOCKAGE_KEYWORDS)})'
+        )
+        self.resolved_pattern = re.compile(keyword_pattern(RESOLVED_KEYWORDS))
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse_uncached)
+
+    def classify_line(self, line: str) -> Optional[str]:
+        """Return 'resolved', 'blocking' or None for a single detail line"""
+        line_upper = line.upper()
+        match = self.pattern.search(line_upper)
+        if match is None:
+            return None
+        if match.lastgroup == 'resolved':
+            return 'resolved'
+
+        # The leftmost keyword is a blockage one; a resolved keyword may still follow
+        if self.resolved_pattern.search(line_upper, match.start() + 1):
+            return 'resolved'
+        return 'blocking'
+
+    def _parse_uncached(self, details_text: str) -> Tuple[str, Tuple[str, ...]]:
+        """Classify the whole details text, returns (status, matching lines)"""
+        text_upper = details_text.upper()
+
+        # No keyword contains ' | ', so one search over the whole text rejects most details
+        if self.pattern.search(text_upper) is None:
+            return 'no_blockage', ()
+
+        search = self.pattern.search
+        resolved_search = self.resolved_pattern.search
+        blockage_info = []
+
+        for line, line_upper in zip(details_text.split(' | '), text_upper.split(' | ')):
+            match = search(line_upper)
+            if match is None:
+                continue
+            if match.lastgroup == 'resolved' or resolved_search(line_upper, match.start() + 1):
+                return 'resolved', (line,)
+            blockage_info.append(line)
+
+        if blockage_info:
+            return 'blocking', tuple(blockage_info)
+        return 'no_blockage', ()
+
+    def parse(self, details_text: str) -> Dict[str, Any]:
+        """Parse lane blockage information from details (memoized on the raw text)"""
+        if not details_text:
+            return {'status': 'unknown', 'details': []}
+
+        status, lines = self._parse_cached(details_text)
+        return {'status': status, 'details': list(lines)}
+
+    def cache_info(self):
+        """Expose LRU cache statistics"""
+        return self._parse_cached.cache_info()
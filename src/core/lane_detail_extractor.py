@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Lane Detail Extractor Implementation
+Single Responsibility: Extracts structured lane data (lanes, direction, vehicles) from CHP detail lines
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple
+
+# Token kinds, tried in order at each position of an upper-cased detail line
+TOKEN_SPEC = [
+    ('LANE_NUM', r'#\d(?:\s*(?:[-/&]|AND)\s*#?\d)*'),
+    ('DIRECTION', r'\b(?:NB|SB|EB|WB|[NSEW]/B)\b'),
+    ('CENTER_DIVIDER', r'\b(?:CD|C/D|CENTER DIVIDER|MEDIAN)\b'),
+    ('LANE_NAME', r'\b(?:SLOW|FAST|MIDDLE|MID|CENTER|HOV|CARPOOL|LEFT|RIGHT|MERGE)\b'),
+    ('LANE', r'\b(?:LNS?|LANES?)\b'),
+    ('ALL', r'\b(?:ALL|BOTH)\b'),
+    ('SHOULDER', r'\b(?:RHS|LHS|RS|LS|R/S|L/S|SHOULDER|SHLDR)\b'),
+    ('RAMP', r'\b(?:ONR|OFR|ON RAMP|OFF RAMP|RAMP|CON|CONNECTOR|TRANS)\b'),
+    ('VEHICLE', r'\b(?:VEHS?|VEHICLES?|CARS?|TRKS?|TRUCKS?|MCS?|MOTORCYCLES?)\b'),
+    ('VERSUS', r'\bVS\b'),
+    ('BLOCKING', r'\b(?:BLKG|BLOCKING|BLOCKED|CLOSED|CLSD)\b'),
+    ('NEGATION', r'\b(?:NEG|NOT|NO LONGER)\b'),
+    ('CLEARED', r'\b(?:CLEARED|CLR|RESOLVED|REOPENED|OPEN)\b'),
+    ('NUMBER', r'\b\d{1,2}\b'),
+    ('WORD', r'[A-Z0-9\'/#-]+'),
+]
+TOKEN_PATTERN = re.compile('|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in TOKEN_SPEC))
+
+SHOULDER_SIDES = {'RHS': 'right', 'RS': 'right', 'R/S': 'right', 'LHS': 'left', 'LS': 'left', 'L/S': 'left'}
+RAMP_KINDS = {'ONR': 'on_ramp', 'ON RAMP': 'on_ramp', 'OFR': 'off_ramp', 'OFF RAMP': 'off_ramp',
+              'CON': 'connector', 'CONNECTOR': 'connector', 'TRANS': 'connector', 'RAMP': 'ramp'}
+LANE_NAMES = {'MID': 'MIDDLE', 'CENTER': 'MIDDLE', 'CARPOOL': 'HOV'}
+
+def tokenize(line: str) -> List[Tuple[str, str]]:
+    """Split a detail line into (kind, text) tokens"""
+    return [(match.lastgroup, match.group()) for match in TOKEN_PATTERN.finditer(line.upper())]
+
+class LaneDetailExtractor:
+    """Parses CHP detail text into typed lane data, cached by content hash"""
+
+    def __init__(self, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def parse_line(self, line: str, result: Dict[str, Any]) -> None:
+        """Apply the grammar to one line, accumulating into result"""
+        tokens = tokenize(line)
+        pending_lanes: List[str] = []
+        pending_number = None
+        negated = False
+
+        for index, (kind, text) in enumerate(tokens):
+            if kind == 'LANE_NUM':
+                lane_range = re.fullmatch(r'#(\d)\s*-\s*#?(\d)', text)
+                if lane_range:
+                    first, last = int(lane_range.group(1)), int(lane_range.group(2))
+                    pending_lanes.extend(f'#{lane}' for lane in range(first, last + 1))
+                else:
+                    pending_lanes.extend('#' + digit for digit in re.findall(r'\d', text))
+            elif kind == 'LANE_NAME':
+                pending_lanes.append(LANE_NAMES.get(text, text))
+            elif kind == 'LANE':
+                # "<lanes> LN", "<n> LNS" and "ALL LNS"
+                previous = tokens[index - 1][0] if index else None
+                if previous == 'ALL':
+                    result['all_lanes'] = True
+                elif pending_number is not None and not pending_lanes:
+                    result['lane_count'] = max(result['lane_count'] or 0, pending_number)
+                for lane in pending_lanes:
+                    if lane not in result['lanes']:
+                        result['lanes'].append(lane)
+                pending_lanes = []
+                pending_number = None
+            elif kind == 'NUMBER':
+                pending_number = int(text)
+            elif kind == 'VEHICLE':
+                if pending_number is not None:
+                    result['vehicle_count'] = max(result['vehicle_count'] or 0, pending_number)
+                    pending_number = None
+            elif kind == 'VERSUS':
+                result['vehicle_count'] = max(result['vehicle_count'] or 0, line.upper().count(' VS ') + 1)
+            elif kind == 'DIRECTION':
+                direction = text.replace('/', '')
+                if direction not in result['directions']:
+                    result['directions'].append(direction)
+            elif kind == 'SHOULDER':
+                side = SHOULDER_SIDES.get(text, 'unspecified')
+                if side not in result['shoulders']:
+                    result['shoulders'].append(side)
+            elif kind == 'CENTER_DIVIDER':
+                result['center_divider'] = True
+            elif kind == 'RAMP':
+                ramp = RAMP_KINDS.get(text, 'ramp')
+                if ramp not in result['ramps']:
+                    result['ramps'].append(ramp)
+            elif kind == 'NEGATION':
+                negated = True
+            elif kind == 'BLOCKING':
+                if negated:
+                    result['cleared'] = True
+                else:
+                    result['blocking'] = True
+                    result['cleared'] = False
+            elif kind == 'CLEARED':
+                result['cleared'] = True
+            elif kind == 'WORD' and text == 'BLK' and negated:
+                # BLK alone is usually a color ("BLK PK TRK"); only "NEG BLK" is a lane status
+                result['cleared'] = True
+
+    def new_result(self) -> Dict[str, Any]:
+        """Empty structured record that parse_line accumulates into"""
+        return {
+            'lanes': [],
+            'lane_count': None,
+            'all_lanes': False,
+            'directions': [],
+            'shoulders': [],
+            'center_divider': False,
+            'ramps': [],
+            'vehicle_count': None,
+            'blocking': False,
+            'cleared': False
+        }
+
+    def _parse(self, details_text: str) -> Dict[str, Any]:
+        """Parse all detail lines into one structured record"""
+        result = self.new_result()
+        for line in details_text.split(' | '):
+            self.parse_line(line, result)
+        return result
+
+    def extract(self, details_text: str) -> Dict[str, Any]:
+        """Structured lane data for a details text (parsed once per distinct content)"""
+        key = hashlib.blake2b((details_text or '').encode(), digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is None:
+            self.misses += 1
+            cached = self._parse(details_text or '')
+            self._cache[key] = cached
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+
+        # Copy so callers can't mutate the cached record
+        return {field: list(value) if isinstance(value, list) else value for field, value in cached.items()}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Incident Lifecycle Tracker Implementation
+Single Responsibility: Maintains first_seen/last_seen/resolution records from incident diffs
+"""
+
+import time
+import logging
+from typing import List, Dict, Any, Set
+
+from .incident_store import IncidentStore
+
+# Severity order used to track the peak lane blockage of an incident
+LANE_STATUS_RANK = {
+    None: 0,
+    'unknown': 0,
+    'no_blockage': 1,
+    'resolved': 2,
+    'blocking': 3
+}
+
+def summarize_lifecycles(store: IncidentStore, center_codes: List[str] = None, since: float = None) -> Dict[str, Any]:
+    """Durations (seconds) of resolved lifecycles, detail revisions and peak lane status counts"""
+    records = store.lifecycle_records(center_codes, since)
+    durations = sorted(duration for duration, _, _ in records if duration is not None)
+    revisions = [count for _, count, _ in records]
+    peaks: Dict[str, int] = {}
+    for _, _, peak in records:
+        peaks[peak or 'unknown'] = peaks.get(peak or 'unknown', 0) + 1
+
+    summary = {
+        'resolved': len(durations),
+        'open': len(records) - len(durations),
+        'mean': None, 'median': None, 'p90': None, 'max': None,
+        'detail_revisions_mean': sum(revisions) / len(revisions) if revisions else None,
+        'detail_revisions_max': max(revisions) if revisions else None,
+        'peak_lane_status': peaks
+    }
+    if durations:
+        summary.update({
+            'mean': sum(durations) / len(durations),
+            'median': durations[len(durations) // 2],
+            'p90': durations[min(len(durations) - 1, int(len(durations) * 0.9))],
+            'max': durations[-1]
+        })
+    return summary
+
+class IncidentLifecycleTracker:
+    """Tracks incident lifecycles per center, updated incrementally from each diff"""
+
+    def __init__(self, store: IncidentStore):
+        self.store = store
+        # center_code -> {incident_id: peak lane status} for lifecycles still open
+        self.open_incidents: Dict[str, Dict[str, str]] = {}
+        # Centers reconciled against the store since startup
+        self.reconciled_centers: Set[str] = set()
+        # Open incidents are seen on every cycle of their center, so last_seen and observations are derived
+        # from per-center counters and only written when a lifecycle is revised or resolved
+        self.cycles: Dict[str, int] = {}  # center_code -> cycles observed since startup
+        self.last_observed: Dict[str, float] = {}  # center_code -> seen_at of its latest cycle
+        self.observation_base: Dict[str, Dict[str, int]] = {}  # observations = cycles[center] - base
+
+        for lifecycle in self.store.load_open_lifecycles():
+            self.open_incidents.setdefault(lifecycle['center_code'], {})[lifecycle['incident_id']] = \
+                lifecycle['peak_lane_status']
+            self.observation_base.setdefault(lifecycle['center_code'], {})[lifecycle['incident_id']] = \
+                -lifecycle['observations']
+
+    def observe(self, center_code: str, current_incidents: List[Dict], changes: Dict[str, List],
+                seen_at: float = None) -> Set[str]:
+        """Apply one diff to the lifecycle table, returns the IDs of incidents first seen now"""
+        seen_at = seen_at or time.time()
+        open_ids = self.open_incidents.setdefault(center_code, {})
+        bases = self.observation_base.setdefault(center_code, {})
+        previous_seen = self.last_observed.get(center_code)  # None: the stored last cycle of the center is used
+        cycles = self.cycles.get(center_code, 0)
+
+        # Keyed by ID so a duplicated row cannot open the same lifecycle twice
+        new_incidents = list({incident['id']: incident for incident in changes.get('new_incidents', [])
+                              if incident['id'] not in open_ids}.values())
+        removed_ids = [incident['id'] for incident in changes.get('removed_incidents', [])
+                       if incident['id'] in open_ids]
+
+        # First observation since startup: close lifecycles that ended while we were down
+        if center_code not in self.reconciled_centers:
+            self.reconciled_centers.add(center_code)
+            current_ids = {incident['id'] for incident in current_incidents}
+            removed_ids.extend(incident_id for incident_id in open_ids
+                               if incident_id not in current_ids and incident_id not in removed_ids)
+
+        resolutions = [(incident_id, previous_seen, cycles - bases.get(incident_id, cycles))
+                       for incident_id in removed_ids]
+
+        cycles += 1
+        self.cycles[center_code] = cycles
+        self.last_observed[center_code] = seen_at
+
+        revisions = []
+        for incident in changes.get('updated_incidents', []):
+            if incident['id'] not in open_ids:
+                continue
+            status = (incident.get('lane_blockage') or {}).get('status')
+            peak = open_ids[incident['id']]
+            if LANE_STATUS_RANK.get(status, 0) > LANE_STATUS_RANK.get(peak, 0):
+                peak = status
+            open_ids[incident['id']] = peak
+            revisions.append((incident['id'], peak, seen_at, cycles - bases.get(incident['id'], cycles - 1)))
+
+        with self.store.transaction():
+            if resolutions:
+                self.store.resolve_lifecycles(center_code, resolutions, seen_at)
+            if new_incidents:
+                self.store.open_lifecycles(center_code, new_incidents, seen_at)
+            if revisions:
+                self.store.revise_lifecycles(center_code, revisions)
+            self.store.record_center_cycle(center_code, seen_at)
+
+        for incident in new_incidents:
+            open_ids[incident['id']] = (incident.get('lane_blockage') or {}).get('status')
+            bases[incident['id']] = cycles - 1
+        for incident_id in removed_ids:
+            open_ids.pop(incident_id, None)
+            bases.pop(incident_id, None)
+
+        if new_incidents or removed_ids:
+            logging.info(f"Lifecycle {center_code}: {len(new_incidents)} opened, {len(removed_ids)} resolved")
+
+        return {incident['id'] for incident in new_incidents}
+
+    def flush(self) -> None:
+        """Write the in-memory last_seen and observations of every open lifecycle (on shutdown)"""
+        with self.store.transaction():
+            for center_code, seen_at in self.last_observed.items():
+                cycles = self.cycles[center_code]
+                bases = self.observation_base.get(center_code, {})
+                self.store.update_lifecycle_counters(center_code, [
+                    (incident_id, seen_at, cycles - bases.get(incident_id, cycles - 1))
+                    for incident_id in self.open_incidents.get(center_code, {})
+                ])
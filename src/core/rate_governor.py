@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Rate Governor Implementation
+Single Responsibility: Paces upstream requests with a token bucket, AIMD concurrency and Retry-After handling
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+# Statuses that mean the upstream is overloaded or failing
+BACKOFF_STATUSES = {429, 500, 502, 503, 504}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class RequestTicket:
+    """One governed request; the caller reports the response it got"""
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.ok = True
+        self.retry_after: Optional[float] = None
+
+    def observe_response(self, status: int, headers: Mapping[str, str] = None) -> None:
+        """Feed the response status and headers back to the governor"""
+        if status in BACKOFF_STATUSES:
+            self.ok = False
+        if headers is not None and status in (429, 503):
+            self.retry_after = parse_retry_after(headers.get('Retry-After'))
+
+class RateGovernor:
+    """Shared by all fetch paths: token bucket pacing, AIMD concurrency limit and a global in-flight cap"""
+
+    def __init__(self, rate: float = 15.0, burst: int = 25, min_concurrency: int = 2,
+                 max_concurrency: int = 10, max_in_flight: int = 25, target_latency: float = 3.0,
+                 max_retry_after: float = 300.0, decrease_cooldown: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.max_in_flight = max_in_flight
+        self.target_latency = target_latency
+        self.max_retry_after = max_retry_after
+        self.decrease_cooldown = decrease_cooldown
+
+        self._lock = threading.Lock()
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.waiters = 0
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.stats = {'requests': 0, 'errors': 0, 'retry_after': 0, 'decreases': 0, 'wait_seconds': 0.0}
+
+    def concurrency_limit(self) -> int:
+        """Current number of requests allowed in flight"""
+        return max(1, min(int(self.concurrency), self.max_in_flight))
+
+    def _try_acquire(self) -> Optional[float]:
+        """Take a slot: 0 on success, seconds to wait, or None to wait for a release"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.in_flight >= self.concurrency_limit():
+                return None
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+
+            self.tokens -= 1
+            self.in_flight += 1
+            self.stats['requests'] += 1
+            return 0
+
+    def _release(self, ticket: RequestTicket, failed: bool) -> None:
+        """Return a slot and adapt the concurrency limit to the observed latency and errors"""
+        with self._lock:
+            now = time.monotonic()
+            self.in_flight -= 1
+            latency = now - ticket.started_at
+            ok = ticket.ok and not failed
+
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            self.error_rate = 0.9 * self.error_rate + (0.0 if ok else 0.1)
+            if not ok:
+                self.stats['errors'] += 1
+
+            if ticket.retry_after is not None:
+                self.stats['retry_after'] += 1
+                self.blocked_until = max(self.blocked_until, now + min(ticket.retry_after, self.max_retry_after))
+
+            if not ok or latency > self.target_latency:
+                # Multiplicative decrease, at most once per cooldown so one slow burst halves once
+                if now - self.last_decrease >= self.decrease_cooldown:
+                    self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+                    self.last_decrease = now
+                    self.stats['decreases'] += 1
+            else:
+                # Additive increase: about +1 per window of successful requests
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+
+    async def acquire(self) -> RequestTicket:
+        """Wait (asynchronously) for a request slot"""
+        waited_from = time.monotonic()
+        with self._lock:
+            self.waiters += 1
+        try:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    break
+                await asyncio.sleep(0.05 if wait is None else min(wait, 1.0))
+        finally:
+            with self._lock:
+                self.waiters -= 1
+        now = time.monotonic()
+        self.stats['wait_seconds'] += now - waited_from
+        return RequestTicket(now)
+
+    def acquire_sync(self) -> RequestTicket:
+        """Wait (blocking) for a request slot"""
+        waited_from = time.monotonic()
+        with self._lock:
+            self.waiters += 1
+        try:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    break
+                time.sleep(0.05 if wait is None else min(wait, 1.0))
+        finally:
+            with self._lock:
+                self.waiters -= 1
+        now = time.monotonic()
+        self.stats['wait_seconds'] += now - waited_from
+        return RequestTicket(now)
+
+    @asynccontextmanager
+    async def request(self):
+        """Async context for one upstream request; exceptions count as errors"""
+        ticket = await self.acquire()
+        failed = False
+        try:
+            yield ticket
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(ticket, failed)
+
+    @contextmanager
+    def request_sync(self):
+        """Blocking context for one upstream request; exceptions count as errors"""
+        ticket = self.acquire_sync()
+        failed = False
+        try:
+            yield ticket
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._release(ticket, failed)
+
+    async def wait_idle(self, timeout: float = 60.0) -> bool:
+        """Wait until no governed request is in flight, returns False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self.in_flight > 0 or self.waiters > 0:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current governor state for health reporting"""
+        return {
+            **self.stats,
+            'wait_seconds': round(self.stats['wait_seconds'], 3),
+            'concurrency_limit': self.concurrency_limit(),
+            'in_flight': self.in_flight,
+            'waiters': self.waiters,
+            'tokens': round(self.tokens, 2),
+            'blocked_for': round(max(0.0, self.blocked_until - time.monotonic()), 3),
+            'latency_ewma': round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            'error_rate': round(self.error_rate, 4)
+        }
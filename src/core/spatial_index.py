@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Spatial Index Implementation
+Single Responsibility: Grid index of geocoded incidents for radius queries and geo-filtered streams
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+MAX_RADIUS_KM = 500.0
+
+# Center fixes are the communication center's centroid, often 100+ km from the incident, so they are not
+# indexed or matched by radius; those incidents still carry their 'geo' field
+INDEXED_PRECISIONS = ('intersection', 'area')
+
+def is_indexable(geo: Optional[Dict[str, Any]]) -> bool:
+    """True if a geocode is precise enough for radius queries"""
+    return bool(geo) and geo.get('precision') in INDEXED_PRECISIONS
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometers"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+class GridSpatialIndex:
+    """Buckets incidents into fixed lat/lon cells, updated incrementally every scrape cycle"""
+
+    def __init__(self, cell_size_deg: float = 0.1):
+        self.cell_size_deg = cell_size_deg
+        self.cells: Dict[Tuple[int, int], Set[Tuple[str, str]]] = {}
+        # (center_code, incident_id) -> (lat, lon, cell, incident)
+        self.entries: Dict[Tuple[str, str], Tuple[float, float, Tuple[int, int], Dict[str, Any]]] = {}
+
+    def cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        """Grid cell containing a point"""
+        return int(math.floor(lat / self.cell_size_deg)), int(math.floor(lon / self.cell_size_deg))
+
+    def upsert(self, key: Tuple[str, str], lat: float, lon: float, incident: Dict[str, Any]) -> None:
+        """Insert or move an incident; unchanged positions only refresh the stored incident"""
+        cell = self.cell_of(lat, lon)
+        previous = self.entries.get(key)
+        if previous is not None and previous[2] != cell:
+            self._unlink(key, previous[2])
+        self.cells.setdefault(cell, set()).add(key)
+        self.entries[key] = (lat, lon, cell, incident)
+
+    def remove(self, key: Tuple[str, str]) -> None:
+        """Drop an incident from the index"""
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self._unlink(key, previous[2])
+
+    def _unlink(self, key: Tuple[str, str], cell: Tuple[int, int]) -> None:
+        """Remove a key from a cell bucket, dropping empty buckets"""
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self.cells[cell]
+
+    def update_center(self, center_code: str, incidents: Iterable[Dict[str, Any]]) -> None:
+        """Sync a center's precisely geocoded incidents, removing those no longer listed"""
+        current = set()
+        for incident in incidents:
+            geo = incident.get('geo')
+            if not is_indexable(geo):
+                continue
+            key = (center_code, incident['id'])
+            current.add(key)
+            self.upsert(key, geo['lat'], geo['lon'], incident)
+
+        for key in [key for key in self.entries if key[0] == center_code and key not in current]:
+            self.remove(key)
+
+    def near(self, lat: float, lon: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[float, Dict[str, Any]]]:
+        """(distance_km, incident) pairs within radius of a point, nearest first"""
+        lat_span = radius_km / 111.0
+        lon_span = radius_km / (111.0 * max(math.cos(math.radians(lat)), 0.01))
+        min_cell = self.cell_of(lat - lat_span, lon - lon_span)
+        max_cell = self.cell_of(lat + lat_span, lon + lon_span)
+
+        matches = []
+        for row in range(min_cell[0], max_cell[0] + 1):
+            for col in range(min_cell[1], max_cell[1] + 1):
+                for key in self.cells.get((row, col), ()):
+                    entry_lat, entry_lon, _, incident = self.entries[key]
+                    distance = haversine_km(lat, lon, entry_lat, entry_lon)
+                    if distance <= radius_km:
+                        matches.append((distance, incident))
+
+        matches.sort(key=lambda match: match[0])
+        return matches[:limit] if limit else matches
+
+    def __len__(self) -> int:
+        """Number of indexed incidents"""
+        return len(self.entries)
+
+class GeoFilter:
+    """Per-client radius filter applied to SSE messages"""
+
+    def __init__(self, lat: float, lon: float, radius_km: float):
+        self.lat = lat
+        self.lon = lon
+        self.radius_km = radius_km
+
+    @classmethod
+    def from_query(cls, query, default_radius_km: float = 5.0) -> Optional['GeoFilter']:
+        """Build from lat/lon/r query parameters, None if absent; raises ValueError when invalid"""
+        if 'lat' not in query and 'lon' not in query:
+            return None
+        try:
+            lat = float(query['lat'])
+            lon = float(query['lon'])
+            radius_km = float(query.get('r', default_radius_km))
+        except (KeyError, ValueError):
+            raise ValueError("lat and lon are required and must be numbers")
+        if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+            raise ValueError("lat/lon out of range")
+        if not 0 < radius_km <= MAX_RADIUS_KM:
+            raise ValueError(f"r must be between 0 and {MAX_RADIUS_KM:g} km")
+        return cls(lat, lon, radius_km)
+
+    @property
+    def key(self) -> Tuple[float, float, float]:
+        """Hashable identity, so clients with the same filter share one encoded message"""
+        return (self.lat, self.lon, self.radius_km)
+
+    def matches(self, incident: Dict[str, Any]) -> bool:
+        """True if the incident is precisely geocoded within the radius"""
+        geo = incident.get('geo') if isinstance(incident, dict) else None
+        if not is_indexable(geo):
+            return False
+        return haversine_km(self.lat, self.lon, geo['lat'], geo['lon']) <= self.radius_km
+
+    def filter_incidents(self, incidents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Incidents within the radius"""
+        return [incident for incident in incidents if self.matches(incident)]
+
+    def filter_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a center result restricted to incidents in range"""
+        filtered = dict(result)
+        if 'incidents' in result:
+            filtered['incidents'] = self.filter_incidents(result['incidents'])
+            filtered['incidentCount'] = len(filtered['incidents'])
+        if result.get('changes'):
+            filtered['changes'] = {name: self.filter_incidents(items) if isinstance(items, list) else items
+                                   for name, items in result['changes'].items()}
+        return filtered
+
+    def apply(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Filtered copy of an SSE message, None if an incident update has nothing in range"""
+        message_type = message.get('type')
+        data = message.get('data')
+
+        if message_type == 'incident_update' and isinstance(data, dict):
+            filtered = self.filter_result(data)
+            changes = filtered.get('changes') or {}
+            if not filtered['incidents'] and not any(changes.get(name) for name in ('new_incidents', 'removed_incidents')):
+                return None
+            return {**message, 'data': filtered}
+
+        if message_type == 'scrape_summary' and isinstance(data, dict):
+            results = [self.filter_result(result) for result in data.get('results', [])]
+            return {**message, 'data': {**data, 'results': results,
+                                        'totalIncidents': sum(r.get('incidentCount', 0) for r in results)}}
+
+        if message_type == 'initial_data' and isinstance(data, dict) and isinstance(data.get('incidents'), dict):
+            incidents = {center: self.filter_incidents(items) for center, items in data['incidents'].items()}
+            return {**message, 'data': {**data, 'incidents': incidents,
+                                        'totalIncidents': sum(len(items) for items in incidents.values())}}
+
+        return message
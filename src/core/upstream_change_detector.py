@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Upstream Change Detector Implementation
+Single Responsibility: Tracks per-center response validators and body hashes to skip re-parsing unchanged pages
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Mapping
+
+# ASP.NET state fields that can change on every response even when the incidents don't
+VOLATILE_FIELDS = re.compile(rb'(id="__(?:VIEWSTATE|VIEWSTATEGENERATOR|EVENTVALIDATION)"\s+value=")[^"]*')
+
+class UpstreamChangeDetector:
+    """Remembers ETag/Last-Modified/Content-Length and body hashes per center"""
+
+    def __init__(self):
+        # center_code -> {'etag', 'last_modified', 'content_length', 'body_hash', 'content_hash'}
+        self.validators: Dict[str, Dict[str, Any]] = {}
+        self.stats = {
+            'requests': 0,
+            'etag_seen': 0,
+            'last_modified_seen': 0,
+            'length_changed': 0,
+            'body_hash_hits': 0,
+            'content_hash_hits': 0
+        }
+
+    def new_hasher(self):
+        """Incremental hasher fed with body chunks as they stream in"""
+        return hashlib.blake2b(digest_size=16)
+
+    def observe(self, center_code: str, headers: Mapping[str, str], body_hash: bytes, body: bytes) -> bool:
+        """Record a 200 response, returns True if the page is unchanged since the last one"""
+        self.stats['requests'] += 1
+        previous = self.validators.get(center_code)
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        content_length = headers.get('Content-Length')
+        self.stats['etag_seen'] += bool(etag)
+        self.stats['last_modified_seen'] += bool(last_modified)
+
+        unchanged = False
+        content_hash = None
+        if previous is not None:
+            # Informational only: the view state alone can change the length of an unchanged page
+            if content_length is not None and content_length != previous.get('content_length'):
+                self.stats['length_changed'] += 1
+
+            if body_hash == previous['body_hash']:
+                self.stats['body_hash_hits'] += 1
+                unchanged = True
+                content_hash = previous.get('content_hash')
+            else:
+                content_hash = self.content_hash(body)
+                if content_hash == previous.get('content_hash'):
+                    self.stats['content_hash_hits'] += 1
+                    unchanged = True
+
+        self.validators[center_code] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_length': content_length,
+            'body_hash': body_hash,
+            'content_hash': content_hash if content_hash is not None else self.content_hash(body)
+        }
+        return unchanged
+
+    def content_hash(self, body: bytes) -> bytes:
+        """Hash of the body with per-response ASP.NET state blanked out"""
+        return hashlib.blake2b(VOLATILE_FIELDS.sub(rb'\1', body), digest_size=16).digest()
+
+    def forget(self, center_code: str) -> None:
+        """Drop a center's validators (e.g. after an error)"""
+        self.validators.pop(center_code, None)
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters plus hit rates, to see which mechanisms the upstream supports"""
+        requests = self.stats['requests'] or 1
+        unchanged = self.stats['body_hash_hits'] + self.stats['content_hash_hits']
+        return {
+            **self.stats,
+            'body_hash_hit_rate': round(self.stats['body_hash_hits'] / requests, 4),
+            'content_hash_hit_rate': round(self.stats['content_hash_hits'] / requests, 4),
+            'unchanged_rate': round(unchanged / requests, 4)
+        }
@@ -4,12 +4,18 @@ Continuous Railway Scraper
 Runs 24/7 with 5-second intervals for real-time updates
 """
 import asyncio
+import hmac
 import logging
+import multiprocessing
 import os
+import pstats
 import sys
 import json
+import time
+import zlib
 import aiohttp
 from aiohttp import web
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Dict, List, Any
 
@@ -17,62 +23,273 @@ from typing import Dict, List, Any
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.data_manager import DataManager
+from core.incident_store import IncidentStore, SQLiteFileManager, SQLiteDeltaProcessor, decode_cursor
+from core.lifecycle_tracker import IncidentLifecycleTracker, summarize_lifecycles
+from core.geocoder import IncidentGeocoder
+from core.spatial_index import GridSpatialIndex, GeoFilter
+from core.circuit_breaker import jittered_backoff
 from core.email_notifier import EmailNotifier
 from scrapers.http_scraper import HTTPScraper
+from scrapers.daily_archiver import backfill_archives
+from utils.metrics import REGISTRY
+from utils.loop_monitor import LoopMonitor
+from utils.frame_channel import FrameChannelServer, FrameChannelClient
+from utils.pubsub import LeaderElection, create_pubsub_backend
+from utils.profiler import ProcessProfiler
+from utils.structured_logging import configure_logging
+from utils.tracing import TRACER, configure_tracing
+from utils.memory_accounting import MEMORY, approximate_size, configure_memory_caps
+
+# Subsystem loggers; levels and sampling are set per name (LOG_LEVELS, LOG_SAMPLING)
+logger = logging.getLogger('scraper')
+sse_logger = logging.getLogger('sse')
+client_logger = logging.getLogger('sse.client')  # Per-connection messages, sampled
+
+SSE_MESSAGES = REGISTRY.counter('sse_messages_sent_total', 'SSE messages written to clients by message type', ('type',))
+SSE_BYTES = REGISTRY.counter('sse_bytes_sent_total', 'SSE bytes written to clients')
+SSE_SEND_ERRORS = REGISTRY.counter('sse_send_errors_total', 'SSE writes that failed (client dropped)')
+SSE_CONNECTIONS = REGISTRY.counter('sse_connections_total', 'SSE connections accepted')
+BROADCAST_SECONDS = REGISTRY.histogram('sse_broadcast_seconds', 'Time to fan one message out to all SSE clients', ('type',))
+DIFF_SECONDS = REGISTRY.histogram('chp_diff_seconds', 'Incident diff against the previous snapshot per center', ('center',))
+CYCLE_SECONDS = REGISTRY.histogram('chp_cycle_seconds', 'Scrape loop phase durations', ('phase',))
+CYCLE_ERRORS = REGISTRY.counter('chp_cycle_errors_total', 'Scrape loop iterations that raised')
 
 class SSEServer:
     """Server-Sent Events server for Railway deployment"""
     
-    def __init__(self, port=8080):
-        print(f"🔧 SSEServer.__init__() called with port={port}")
+    def __init__(self, port=8080, host='0.0.0.0', reuse_port=False, worker_id=None):
+        sse_logger.debug(f"🔧 SSEServer.__init__() called with port={port}")
         self.port = port
+        self.host = host
+        self.reuse_port = reuse_port  # SSE workers share one listening port (SO_REUSEPORT)
+        self.worker_id = worker_id  # Set in SSE worker processes
         self.clients = set()  # Store SSE response objects
+        self.client_filters = {}  # SSE response -> GeoFilter for geo-filtered subscriptions
+        self.client_transports = {}  # SSE response -> transport, for write buffer depth
         self.server = None
-        print("🔧 Creating web.Application()...")
+        self.incident_store = None  # Set by the scraper when history persistence is enabled
+        self.spatial_index = None  # Set by the scraper when geocoding is enabled
+        self.change_detector = None  # Upstream body hash statistics
+        self.governor = None  # Upstream rate governor state
+        self.breakers = None  # Per-center circuit breakers
+        self.hedge_policy = None  # Hedged request counters and latency percentiles
+        self.frame_channel = None  # Set on the scraper leader when SSE worker processes serve the clients
+        self.pubsub = None  # Set when replicas share one broadcast stream (PUBSUB_BACKEND)
+        self.election = None  # Scraper leader election between those replicas
+        self.latest_results = None  # center -> result from the last scrape_summary frame received
+        # Bytes queued in client transports; past the cap the most backed-up clients are dropped
+        self.write_timeout = float(os.getenv('SSE_WRITE_TIMEOUT', '2'))
+        self.client_buffer_memory = MEMORY.account('sse_client_buffers', default_cap=64 * 2 ** 20, policy='largest',
+                                                   on_evict=self.evict_client)
+        # Loop lag probe plus a watchdog thread that captures stacks of callbacks blocking the loop
+        self.loop_monitor = LoopMonitor(
+            slow_threshold=float(os.getenv('LOOP_SLOW_THRESHOLD', '0.25')),
+            watchdog=os.getenv('ENABLE_LOOP_WATCHDOG', 'true').lower() == 'true'
+        )
+        # On-demand profiling behind /debug/profile, only served when ADMIN_TOKEN is set
+        self.admin_token = os.getenv('ADMIN_TOKEN', '')
+        self.profiler = ProcessProfiler(max_seconds=float(os.getenv('PROFILE_MAX_SECONDS', '60')))
+        if os.getenv('ENABLE_TRACEMALLOC', 'false').lower() == 'true':
+            self.profiler.start_tracemalloc()
+        self.register_metrics()
+        sse_logger.debug("🔧 Creating web.Application()...")
         self.app = web.Application()
-        print(f"✅ SSEServer initialized successfully. App type: {type(self.app)}")
+        sse_logger.info(f"✅ SSEServer initialized successfully. App type: {type(self.app)}")
+    
+    @property
+    def role(self) -> str:
+        """'worker-N' in SSE worker processes, 'leader' when feeding workers, else 'standalone'"""
+        if self.worker_id is not None:
+            return f"worker-{self.worker_id}"
+        return 'leader' if self.frame_channel is not None else 'standalone'
+    
+    def register_metrics(self):
+        """Gauges read from live server and scraper state when /metrics is scraped"""
+        REGISTRY.gauge('sse_clients', 'Connected SSE clients', function=lambda: len(self.clients))
+        REGISTRY.gauge('sse_write_buffer_bytes', 'Bytes queued in SSE client transports', ('stat',),
+                       function=self.write_buffer_sizes)
+        REGISTRY.gauge('chp_governor', 'Upstream rate governor state', ('stat',),
+                       function=lambda: self.stat_samples(self.governor.snapshot()) if self.governor else None)
+        REGISTRY.gauge('chp_circuit_breakers_open', 'Centers whose circuit breaker is not closed',
+                       function=lambda: self.breakers.snapshot()['open'] if self.breakers else None)
+        REGISTRY.gauge('chp_upstream_change_detection', 'Conditional request and body hash counters', ('stat',),
+                       function=lambda: self.stat_samples(self.change_detector.summary()) if self.change_detector else None)
+        REGISTRY.gauge('chp_hedge', 'Hedged request counters and POST latency percentiles (seconds)', ('stat',),
+                       function=lambda: self.stat_samples(self.hedge_policy.summary()) if self.hedge_policy else None)
+    
+    def stat_samples(self, snapshot: Dict[str, Any]) -> Dict[tuple, float]:
+        """Numeric entries of a snapshot dict as stat-labelled gauge samples"""
+        return {(key,): value for key, value in snapshot.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)}
+    
+    def write_buffer_sizes(self):
+        """Total and largest SSE transport write buffer"""
+        sizes = [transport.get_write_buffer_size() for transport in self.client_transports.values()
+                 if transport is not None and not transport.is_closing()]
+        return {('total',): sum(sizes), ('max',): max(sizes, default=0)}
     
-    async def register_client(self, response):
-        """Register a new SSE client"""
+    async def write_message(self, response, message: bytes, message_type: str):
+        """Write one SSE message and count it"""
+        transport = self.client_transports.get(response)
+        if transport is not None and transport.get_write_buffer_size() + len(message) > transport.get_write_buffer_limits()[1]:
+            # This write can pause the transport; bound the drain so one stuck client cannot stall a broadcast
+            await asyncio.wait_for(response.write(message), self.write_timeout)
+        else:
+            await response.write(message)
+        SSE_MESSAGES.inc(type=message_type)
+        SSE_BYTES.inc(len(message))
+    
+    async def register_client(self, response, geo_filter: GeoFilter = None, transport=None):
+        """Register a new SSE client, optionally restricted to incidents near a point"""
         self.clients.add(response)
-        print(f"📡 SSE client connected. Total clients: {len(self.clients)}")
+        self.client_transports[response] = transport
+        if geo_filter is not None:
+            self.client_filters[response] = geo_filter
+        SSE_CONNECTIONS.inc()
+        sse_logger.info(f"📡 SSE client connected. Total clients: {len(self.clients)}")
     
     async def unregister_client(self, response):
         """Unregister an SSE client"""
         self.clients.discard(response)
-        print(f"📡 SSE client disconnected. Total clients: {len(self.clients)}")
+        self.client_filters.pop(response, None)
+        self.client_transports.pop(response, None)
+        self.client_buffer_memory.release(response)
+        sse_logger.info(f"📡 SSE client disconnected. Total clients: {len(self.clients)}")
+    
+    def account_client_buffers(self):
+        """Charge each client's queued bytes; over the cap the most backed-up clients are evicted"""
+        for client in list(self.clients):
+            transport = self.client_transports.get(client)
+            if transport is not None and not transport.is_closing():
+                self.client_buffer_memory.charge(client, transport.get_write_buffer_size())
+    
+    def drop_client(self, response):
+        """Forget a client and abort its connection, discarding unsent bytes (close() would keep them until flushed)"""
+        transport = self.client_transports.pop(response, None)
+        if transport is not None:
+            transport.abort()
+        self.clients.discard(response)
+        self.client_filters.pop(response, None)
+        self.client_buffer_memory.release(response)
+    
+    def evict_client(self, response):
+        """Drop a client whose unsent data pushed the SSE buffers over their memory cap"""
+        self.drop_client(response)
+        SSE_SEND_ERRORS.inc()
+        sse_logger.warning(f"⚠️ Evicted a backed-up SSE client (memory cap). Total clients: {len(self.clients)}")
     
     async def broadcast_update(self, data: Dict[str, Any]):
-        """Broadcast data to all connected SSE clients"""
-        print(f"📡 [BROADCAST] Starting broadcast to {len(self.clients)} clients")
-        print(f"📡 [BROADCAST] Data type: {data.get('type', 'unknown')}")
+        """Broadcast data to all connected SSE clients (and SSE worker processes)"""
+        if not self.clients and self.frame_channel is None and self.pubsub is None:
+            sse_logger.debug("⚠️ [BROADCAST] No clients connected, skipping broadcast")
+            return
+        
+        message_type = data.get('type', 'unknown')
+        message = f"data: {json.dumps(data)}\n\n".encode()
+        if self.pubsub is not None:
+            # Every replica, this one included, fans out what comes back through receive_frame
+            try:
+                await self.pubsub.publish(message_type, message)
+                return
+            except Exception as e:
+                # Other replicas miss this message, but this replica's clients and workers still get it
+                sse_logger.error(f"❌ [BROADCAST] Failed to publish {message_type}, serving it locally: {e}")
+                SSE_SEND_ERRORS.inc()
+        if self.frame_channel is not None:
+            self.frame_channel.publish(message_type, message)
+        await self.fan_out(message_type, message, data)
+    
+    async def receive_frame(self, message_type: str, frame: bytes):
+        """Serve a frame published by the scraper leader (SSE workers, replicas sharing a stream)"""
+        if self.frame_channel is not None:
+            self.frame_channel.publish(message_type, frame)  # Pass it on to this replica's SSE workers
+        data = None
+        if message_type == 'scrape_summary':
+            # Keep initial data and the spatial index in step with the leader
+            data = json.loads(frame[len(b'data: '):])
+            results = [result for result in data['data']['results'] if result.get('incidents') is not None]
+            self.latest_results = {result['center']: result for result in results}
+            if self.spatial_index is not None:
+                for result in results:
+                    if result['status'] != 'success':
+                        continue  # The leader only re-indexes centers it scraped this cycle
+                    self.spatial_index.update_center(result['center'], result['incidents'])
+        await self.fan_out(message_type, frame, data)
+    
+    async def fan_out(self, message_type: str, message: bytes, data: Dict[str, Any] = None):
+        """Write an encoded message to every client; data (decoded on demand) feeds geo filters"""
+        sse_logger.debug(f"📡 [BROADCAST] Starting {message_type} broadcast to {len(self.clients)} clients")
         
         if not self.clients:
-            print(f"⚠️ [BROADCAST] No clients connected, skipping broadcast")
+            sse_logger.debug("⚠️ [BROADCAST] No clients connected, skipping broadcast")
             return
         
-        message = f"data: {json.dumps(data)}\n\n"
+        broadcast_started = time.perf_counter()
+        self.account_client_buffers()
+        filtered_messages = {}  # GeoFilter key -> encoded message (None when nothing is in range)
         disconnected = set()
         successful_sends = 0
         
-        for i, client in enumerate(self.clients):
+        # Iterate a copy: clients connect and disconnect while writes are awaited
+        for i, client in enumerate(list(self.clients)):
+            if client not in self.clients:
+                continue
             try:
-                print(f"📤 [BROADCAST] Sending to client {i+1}/{len(self.clients)}")
-                await client.write(message.encode())
+                client_message = message
+                geo_filter = self.client_filters.get(client)
+                if geo_filter is not None:
+                    if geo_filter.key not in filtered_messages:
+                        if data is None:
+                            data = json.loads(message[len(b'data: '):])
+                        filtered = geo_filter.apply(data)
+                        filtered_messages[geo_filter.key] = None if filtered is None else f"data: {json.dumps(filtered)}\n\n".encode()
+                    client_message = filtered_messages[geo_filter.key]
+                    if client_message is None:
+                        continue
+                
+                # Per-client lines are formatted lazily: at the default level they cost nothing
+                client_logger.debug("📤 [BROADCAST] Sending to client %d/%d", i + 1, len(self.clients))
+                await self.write_message(client, client_message, message_type)
                 successful_sends += 1
-                print(f"✅ [BROADCAST] Client {i+1} sent successfully")
-            except Exception as e:
-                print(f"❌ [BROADCAST] Client {i+1} send error: {e}")
-                print(f"❌ [BROADCAST] Error type: {type(e).__name__}")
+                client_logger.debug("✅ [BROADCAST] Client %d sent successfully", i + 1)
+            except (Exception, asyncio.TimeoutError) as e:
+                client_logger.warning("❌ [BROADCAST] Client %d send error: %s: %s", i + 1, type(e).__name__, e)
+                SSE_SEND_ERRORS.inc()
                 disconnected.add(client)
         
         # Remove disconnected clients
         if disconnected:
-            print(f"🔌 [BROADCAST] Removing {len(disconnected)} disconnected clients")
-            self.clients -= disconnected
+            sse_logger.info(f"🔌 [BROADCAST] Removing {len(disconnected)} disconnected clients")
+            for client in disconnected:
+                self.drop_client(client)
+        BROADCAST_SECONDS.observe(time.perf_counter() - broadcast_started, type=message_type)
         
-        print(f"📡 [BROADCAST] Completed: {successful_sends} successful, {len(disconnected)} failed")
-        print(f"📡 [BROADCAST] Remaining clients: {len(self.clients)}")
+        sse_logger.info(f"📡 [BROADCAST] {message_type}: {successful_sends} successful, {len(disconnected)} failed",
+                        extra={'type': message_type, 'sent': successful_sends, 'failed': len(disconnected),
+                               'clients': len(self.clients)})
+    
+    def is_admin(self, request) -> bool:
+        """Whether the request carries the admin token (Authorization: Bearer or X-Admin-Token)"""
+        if not self.admin_token:
+            return False
+        supplied = request.headers.get('X-Admin-Token', '')
+        authorization = request.headers.get('Authorization', '')
+        if authorization.startswith('Bearer '):
+            supplied = authorization[len('Bearer '):]
+        return hmac.compare_digest(supplied.encode(), self.admin_token.encode())
+    
+    def parse_time_param(self, value):
+        """Parse an ISO datetime or epoch seconds query parameter into epoch seconds"""
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            raise ValueError(f"Invalid time value: {value}")
     
     def get_center_name(self, center_code):
         """Get center name from center code"""
@@ -89,25 +306,32 @@ class SSEServer:
     async def get_initial_incident_data(self):
         """Get current incident data for new SSE clients"""
         try:
-            print("🔍 Fetching initial incident data for SSE client")
+            sse_logger.debug("🔍 Fetching initial incident data for SSE client")
             
             # Get the current incident data from all centers
             all_incidents = {}
             total_incidents = 0
             
+            # SSE workers serve what the leader last broadcast
+            if self.latest_results is not None:
+                all_incidents = {center: result['incidents'] for center, result in self.latest_results.items()}
+                total_incidents = sum(len(incidents) for incidents in all_incidents.values())
+            
             # Load actual incident data from files for initial display
             for center in ['BFCC', 'BSCC', 'BICC', 'BCCC', 'CCCC', 'CHCC', 'ECCC', 'FRCC', 'GGCC', 'HMCC',
                           'ICCC', 'INCC', 'LACC', 'MRCC', 'MYCC', 'OCCC', 'RDCC', 'SACC', 'SLCC', 'SKCCSTCC',
                           'SUCC', 'TKCC', 'UKCC', 'VTCC', 'YKCC']:
+                if center in all_incidents:
+                    continue
                 try:
                     # Try to load from active incidents file
                     data_manager = DataManager(center)
                     incidents = data_manager.load_previous_incidents()
                     all_incidents[center] = incidents
                     total_incidents += len(incidents)
-                    print(f"📊 Loaded {len(incidents)} incidents for {center}")
+                    sse_logger.debug(f"📊 Loaded {len(incidents)} incidents for {center}")
                 except Exception as e:
-                    print(f"⚠️ Could not load incidents for {center}: {e}")
+                    sse_logger.warning(f"⚠️ Could not load incidents for {center}: {e}")
                     all_incidents[center] = []
             
             # Format as initial data message with correct structure for frontend
@@ -121,11 +345,11 @@ class SSEServer:
                 }
             }
             
-            print(f"✅ Prepared initial data: {len(all_incidents)} centers, {total_incidents} total incidents")
+            sse_logger.info(f"✅ Prepared initial data: {len(all_incidents)} centers, {total_incidents} total incidents")
             return initial_data
             
         except Exception as e:
-            print(f"❌ Error getting initial incident data: {e}")
+            sse_logger.error(f"❌ Error getting initial incident data: {e}")
             return {
                 'type': 'initial_data',
                 'data': {
@@ -137,35 +361,52 @@ class SSEServer:
                 }
             }
     
+    def get_nearby_initial_data(self, geo_filter: GeoFilter):
+        """Initial data for a geo-filtered client, taken from the spatial index"""
+        incidents = {}
+        nearby = self.spatial_index.near(geo_filter.lat, geo_filter.lon, geo_filter.radius_km)
+        for _, incident in nearby:
+            incidents.setdefault(incident.get('center_code', ''), []).append(incident)
+        
+        return {
+            'type': 'initial_data',
+            'data': {
+                'timestamp': datetime.now().isoformat(),
+                'centers': len(incidents),
+                'totalIncidents': len(nearby),
+                'incidents': incidents
+            }
+        }
+    
     def setup_http_routes(self):
         """Set up HTTP routes for serving frontend"""
-        print("🔧 setup_http_routes() called")
-        print(f"🔧 App object before: {self.app}")
-        print(f"🔧 App type: {type(self.app)}")
+        sse_logger.debug("🔧 setup_http_routes() called")
+        sse_logger.debug(f"🔧 App object before: {self.app}")
+        sse_logger.debug(f"🔧 App type: {type(self.app)}")
         
         # Don't recreate the app - use the one from __init__
         if self.app is None:
-            print("⚠️  App is None, creating new web.Application()")
+            sse_logger.warning("⚠️  App is None, creating new web.Application()")
             self.app = web.Application()
         else:
-            print("✅ Using existing web.Application()")
+            sse_logger.info("✅ Using existing web.Application()")
         
-        print(f"🔧 App object after: {self.app}")
-        print(f"🔧 App router: {self.app.router}")
+        sse_logger.debug(f"🔧 App object after: {self.app}")
+        sse_logger.debug(f"🔧 App router: {self.app.router}")
         
         # Add explicit route for index.html
         async def serve_index(request):
             try:
-                print(f"📁 Serving index.html from {os.getcwd()}")
-                print(f"📁 Files in current directory: {os.listdir('.')}")
+                sse_logger.debug(f"📁 Serving index.html from {os.getcwd()}")
+                sse_logger.debug(f"📁 Files in current directory: {os.listdir('.')}")
                 with open('index.html', 'r') as f:
                     content = f.read()
                 return web.Response(text=content, content_type='text/html')
             except FileNotFoundError as e:
-                print(f"❌ Index file not found: {e}")
+                sse_logger.error(f"❌ Index file not found: {e}")
                 return web.Response(text='Index file not found', status=404)
             except Exception as e:
-                print(f"❌ Error serving index: {e}")
+                sse_logger.error(f"❌ Error serving index: {e}")
                 return web.Response(text=f'Error: {e}', status=500)
         
         self.app.router.add_get('/', serve_index)
@@ -175,14 +416,14 @@ class SSEServer:
             try:
                 # Get the requested file path
                 file_path = request.match_info['path']
-                print(f"📁 Serving static file: {file_path}")
-                print(f"📁 Current working directory: {os.getcwd()}")
-                print(f"📁 Full path: {os.path.join(os.getcwd(), file_path)}")
+                sse_logger.debug(f"📁 Serving static file: {file_path}")
+                sse_logger.debug(f"📁 Current working directory: {os.getcwd()}")
+                sse_logger.debug(f"📁 Full path: {os.path.join(os.getcwd(), file_path)}")
 
                 # Strip query parameters (like ?v=1.0.2) from file path
                 if '?' in file_path:
                     file_path = file_path.split('?')[0]
-                    print(f"📁 Cleaned file path (removed query params): {file_path}")
+                    sse_logger.debug(f"📁 Cleaned file path (removed query params): {file_path}")
 
                 # Security check - prevent directory traversal
                 if '..' in file_path or file_path.startswith('/'):
@@ -215,12 +456,12 @@ class SSEServer:
                     response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
                     return response
                 else:
-                    print(f"❌ Static file not found: {full_path}")
-                    print(f"📁 Files in directory: {os.listdir(os.path.dirname(full_path)) if os.path.exists(os.path.dirname(full_path)) else 'directory does not exist'}")
+                    sse_logger.error(f"❌ Static file not found: {full_path}")
+                    sse_logger.debug(f"📁 Files in directory: {os.listdir(os.path.dirname(full_path)) if os.path.exists(os.path.dirname(full_path)) else 'directory does not exist'}")
                     return web.Response(text='File not found', status=404)
 
             except Exception as e:
-                print(f"❌ Error serving static file: {e}")
+                sse_logger.error(f"❌ Error serving static file: {e}")
                 return web.Response(text=f'Error: {e}', status=500)
 
         # Health check endpoint
@@ -228,17 +469,273 @@ class SSEServer:
             return web.json_response({
                 'status': 'healthy',
                 'timestamp': datetime.now().isoformat(),
-                'sse_clients': len(self.clients)
+                'sse_clients': len(self.clients),
+                'role': self.role,
+                'election': self.election.snapshot() if self.election else None,
+                'upstream': self.change_detector.summary() if self.change_detector else None,
+                'governor': self.governor.snapshot() if self.governor else None,
+                'circuit_breakers': self.breakers.snapshot() if self.breakers else None,
+                'hedging': self.hedge_policy.summary() if self.hedge_policy else None,
+                'memory': MEMORY.snapshot()
             })
 
         self.app.router.add_get('/health', health_check)
 
-        # SSE endpoint for real-time updates
+        # Prometheus scrape endpoint
+        async def metrics_endpoint(request):
+            return web.Response(
+                body=REGISTRY.render().encode(),
+                headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+            )
+
+        self.app.router.add_get('/metrics', metrics_endpoint)
+
+        # Event loop lag and stacks of the most recent callbacks that blocked the loop
+        async def debug_loop_endpoint(request):
+            return web.json_response(self.loop_monitor.snapshot())
+
+        self.app.router.add_get('/debug/loop', debug_loop_endpoint)
+
+        # Span waterfalls of the most recent scrape cycles
+        async def debug_cycles_endpoint(request):
+            try:
+                limit = max(1, int(request.query.get('limit', '5')))
+            except ValueError:
+                return web.json_response({'error': 'limit must be an integer'}, status=400)
+            return web.json_response({'cycles': TRACER.recent_waterfalls(limit)})
+
+        self.app.router.add_get('/debug/cycles', debug_cycles_endpoint)
+
+        # Profile the running process for a few seconds (admin only)
+        async def debug_profile_endpoint(request):
+            if not self.admin_token:
+                return web.json_response({'error': 'Profiling is disabled; set ADMIN_TOKEN to enable it'}, status=404)
+            if not self.is_admin(request):
+                return web.json_response({'error': 'Admin token required'}, status=401)
+            
+            query = request.query
+            output = query.get('format', 'json')
+            if output not in ('json', 'collapsed', 'pstats', 'prof'):
+                return web.json_response({'error': 'format must be json, collapsed, pstats or prof'}, status=400)
+            try:
+                seconds = float(query.get('seconds', '10'))
+                limit = max(1, int(query.get('limit', '50')))
+            except ValueError as e:
+                return web.json_response({'error': str(e)}, status=400)
+            sort = query.get('sort', 'cumulative')
+            if sort not in pstats.Stats.sort_arg_dict_default:
+                return web.json_response({'error': f"Unknown sort key {sort}"}, status=400)
+            
+            sse_logger.warning(f"⚠️ Profiling for {seconds}s (format={output})")
+            try:
+                result = await self.profiler.profile(
+                    seconds,
+                    cprofile=query.get('cprofile', '1') != '0' or output in ('pstats', 'prof'),
+                    memory=query.get('tracemalloc', '0') == '1',
+                    sort=sort,
+                    limit=limit,
+                    dump=output == 'prof'
+                )
+            except (RuntimeError, ValueError) as e:
+                # Another window, or another profiler (e.g. an attached debugger), is already running
+                return web.json_response({'error': str(e)}, status=409)
+            
+            if output == 'collapsed':
+                return web.Response(text=result['collapsed'], content_type='text/plain')
+            if output == 'pstats':
+                return web.Response(text=result['pstats'], content_type='text/plain')
+            if output == 'prof':
+                return web.Response(body=result['pstats_dump'], content_type='application/octet-stream',
+                                    headers={'Content-Disposition': 'attachment; filename="profile.prof"'})
+            return web.json_response(result)
+
+        self.app.router.add_get('/debug/profile', debug_profile_endpoint)
+
+        # Historical incident query, streamed page by page from the incident store
+        async def history_endpoint(request):
+            if self.incident_store is None:
+                return web.json_response({'error': 'Incident store is disabled'}, status=503)
+            
+            query = request.query
+            try:
+                limit = max(1, min(int(query.get('limit', 100)), 1000))
+                centers = [center.strip().upper() for center in query.get('center', '').split(',') if center.strip()]
+                since = self.parse_time_param(query.get('from'))
+                until = self.parse_time_param(query.get('to'))
+                after = decode_cursor(query['cursor']) if query.get('cursor') else None
+            except ValueError as e:
+                return web.json_response({'error': str(e)}, status=400)
+            
+            def fetch_page():
+                # Runs in the executor: reads and encodes the page, closing the read cursor before streaming.
+                # One extra row is fetched to know whether another page exists
+                incidents = self.incident_store.query_incidents(
+                    center_codes=centers,
+                    incident_type=query.get('type'),
+                    since=since,
+                    until=until,
+                    location=query.get('location'),
+                    lane_status=query.get('lane_status'),
+                    after=after,
+                    limit=limit + 1
+                )
+                encoded = []
+                last_cursor = None
+                next_cursor = None
+                try:
+                    for incident in incidents:
+                        if len(encoded) == limit:
+                            next_cursor = last_cursor
+                            break
+                        encoded.append(json.dumps(incident).encode())
+                        last_cursor = incident['cursor']
+                finally:
+                    incidents.close()
+                return encoded, next_cursor
+            
+            encoded, next_cursor = await asyncio.get_running_loop().run_in_executor(None, fetch_page)
+            
+            response = web.StreamResponse()
+            response.headers['Content-Type'] = 'application/json'
+            response.headers['Access-Control-Allow-Origin'] = '*'
+            await response.prepare(request)
+            
+            chunk = [b'{"incidents": [']
+            chunk_size = 0
+            for index, line in enumerate(encoded):
+                chunk.append(b',' + line if index else line)
+                chunk_size += len(line)
+                
+                # Write in ~32KB chunks
+                if chunk_size >= 32768:
+                    await response.write(b''.join(chunk))
+                    chunk = []
+                    chunk_size = 0
+            
+            chunk.append(f'], "count": {len(encoded)}, "next_cursor": {json.dumps(next_cursor)}}}'.encode())
+            await response.write(b''.join(chunk))
+            await response.write_eof()
+            return response
+
+        self.app.router.add_get('/api/history', history_endpoint)
+
+        # Bulk NDJSON export; every line carries a cursor to resume a dropped download
+        async def export_endpoint(request):
+            if self.incident_store is None:
+                return web.json_response({'error': 'Incident store is disabled'}, status=503)
+            
+            query = request.query
+            try:
+                centers = [center.strip().upper() for center in query.get('centers', '').split(',') if center.strip()]
+                since = self.parse_time_param(query.get('from'))
+                until = self.parse_time_param(query.get('to'))
+                after = decode_cursor(query['cursor']) if query.get('cursor') else None
+            except ValueError as e:
+                return web.json_response({'error': str(e)}, status=400)
+            
+            use_gzip = (query.get('gzip', '').lower() in ('1', 'true') or
+                        'gzip' in request.headers.get('Accept-Encoding', ''))
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None
+            incidents = self.incident_store.query_incidents(
+                center_codes=centers, since=since, until=until, after=after
+            )
+            
+            def next_chunk():
+                # Runs in the executor: reads, encodes and compresses up to ~64KB
+                lines = []
+                size = 0
+                for incident in incidents:
+                    line = json.dumps(incident).encode() + b'\n'
+                    lines.append(line)
+                    size += len(line)
+                    if size >= 65536:
+                        break
+                data = b''.join(lines)
+                if compressor is not None:
+                    data = compressor.compress(data) if lines else compressor.flush()
+                return data, not lines
+            
+            response = web.StreamResponse()
+            response.headers['Content-Type'] = 'application/x-ndjson'
+            response.headers['Access-Control-Allow-Origin'] = '*'
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            
+            loop = asyncio.get_running_loop()
+            try:
+                while True:
+                    data, done = await loop.run_in_executor(None, next_chunk)
+                    if data:
+                        await response.write(data)
+                    if done:
+                        break
+            finally:
+                await loop.run_in_executor(None, incidents.close)
+            
+            await response.write_eof()
+            return response
+
+        self.app.router.add_get('/api/export', export_endpoint)
+
+        # Lifecycle analytics: how long incidents stay listed, how often they are revised, how bad they get
+        async def durations_endpoint(request):
+            if self.incident_store is None:
+                return web.json_response({'error': 'Incident store is disabled'}, status=503)
+            
+            query = request.query
+            try:
+                centers = [center.strip().upper() for center in query.get('center', '').split(',') if center.strip()]
+                since = self.parse_time_param(query.get('from'))
+            except ValueError as e:
+                return web.json_response({'error': str(e)}, status=400)
+            
+            summary = await asyncio.get_running_loop().run_in_executor(
+                None, summarize_lifecycles, self.incident_store, centers, since
+            )
+            return web.json_response({'centers': centers or None, 'from': since, **summary})
+
+        self.app.router.add_get('/api/durations', durations_endpoint)
+
+        # Incidents near a point, from the spatial index of the current snapshot
+        async def near_endpoint(request):
+            if self.spatial_index is None:
+                return web.json_response({'error': 'Geocoding is disabled'}, status=503)
+            
+            try:
+                geo_filter = GeoFilter.from_query(request.query)
+                if geo_filter is None:
+                    raise ValueError("lat and lon are required")
+                limit = min(max(int(request.query.get('limit', 200)), 1), 1000)
+            except ValueError as e:
+                return web.json_response({'error': str(e)}, status=400)
+            
+            incidents = []
+            for distance, incident in self.spatial_index.near(geo_filter.lat, geo_filter.lon, geo_filter.radius_km, limit):
+                incidents.append({**incident, 'distance_km': round(distance, 3)})
+            
+            return web.json_response({
+                'lat': geo_filter.lat,
+                'lon': geo_filter.lon,
+                'r': geo_filter.radius_km,
+                'count': len(incidents),
+                'incidents': incidents
+            })
+        
+        self.app.router.add_get('/api/incidents/near', near_endpoint)
+
+        # SSE endpoint for real-time updates (?lat=&lon=&r= subscribes to incidents near a point)
         async def sse_endpoint(request):
             connection_id = id(request)
-            print(f"🔗 [SSE-{connection_id}] New connection from {request.remote}")
-            print(f"🔗 [SSE-{connection_id}] User-Agent: {request.headers.get('User-Agent', 'Unknown')}")
-            print(f"🔗 [SSE-{connection_id}] Accept: {request.headers.get('Accept', 'Unknown')}")
+            client_logger.debug(f"🔗 [SSE-{connection_id}] New connection from {request.remote}")
+            client_logger.debug(f"🔗 [SSE-{connection_id}] User-Agent: {request.headers.get('User-Agent', 'Unknown')}")
+            client_logger.debug(f"🔗 [SSE-{connection_id}] Accept: {request.headers.get('Accept', 'Unknown')}")
+            
+            try:
+                geo_filter = GeoFilter.from_query(request.query)
+            except ValueError as e:
+                return web.json_response({'error': str(e)}, status=400)
             
             response = web.StreamResponse()
             response.headers['Content-Type'] = 'text/event-stream'
@@ -247,17 +744,17 @@ class SSEServer:
             response.headers['Access-Control-Allow-Origin'] = '*'
             response.headers['Access-Control-Allow-Headers'] = 'Cache-Control'
             
-            print(f"📡 [SSE-{connection_id}] Preparing response headers")
+            client_logger.debug(f"📡 [SSE-{connection_id}] Preparing response headers")
             await response.prepare(request)
-            print(f"📡 [SSE-{connection_id}] Response prepared successfully")
+            client_logger.debug(f"📡 [SSE-{connection_id}] Response prepared successfully")
             
-            print(f"🔌 [SSE-{connection_id}] Registering client")
-            await self.register_client(response)
-            print(f"✅ [SSE-{connection_id}] Client registered, total clients: {len(self.clients)}")
+            client_logger.debug(f"🔌 [SSE-{connection_id}] Registering client")
+            await self.register_client(response, geo_filter, request.transport)
+            client_logger.info(f"✅ [SSE-{connection_id}] Client registered, total clients: {len(self.clients)}")
             
             try:
                 # Send welcome message
-                print(f"📤 [SSE-{connection_id}] Sending welcome message")
+                client_logger.debug(f"📤 [SSE-{connection_id}] Sending welcome message")
                 welcome_data = {
                     'type': 'welcome',
                     'message': 'Connected to CHP Traffic Monitor SSE',
@@ -265,23 +762,24 @@ class SSEServer:
                     'connection_id': connection_id
                 }
                 welcome_msg = f"data: {json.dumps(welcome_data)}\n\n"
-                await response.write(welcome_msg.encode())
-                print(f"✅ [SSE-{connection_id}] Welcome message sent")
+                await self.write_message(response, welcome_msg.encode(), 'welcome')
+                client_logger.debug(f"✅ [SSE-{connection_id}] Welcome message sent")
                 
                 # Send initial data immediately
-                print(f"📡 [SSE-{connection_id}] Preparing initial incident data")
+                client_logger.debug(f"📡 [SSE-{connection_id}] Preparing initial incident data")
                 try:
-                    initial_data = await self.get_initial_incident_data()
-                    print(f"📊 [SSE-{connection_id}] Initial data prepared: {len(initial_data.get('data', {}).get('results', []))} centers")
+                    if geo_filter is not None and self.spatial_index is not None:
+                        initial_data = self.get_nearby_initial_data(geo_filter)
+                    else:
+                        initial_data = await self.get_initial_incident_data()
+                    client_logger.debug(f"📊 [SSE-{connection_id}] Initial data prepared: {len(initial_data.get('data', {}).get('results', []))} centers")
                     
                     initial_msg = f"data: {json.dumps(initial_data)}\n\n"
-                    await response.write(initial_msg.encode())
-                    print(f"✅ [SSE-{connection_id}] Initial data sent successfully")
+                    await self.write_message(response, initial_msg.encode(), initial_data.get('type', 'initial_data'))
+                    client_logger.debug(f"✅ [SSE-{connection_id}] Initial data sent successfully")
                     
                 except Exception as initial_error:
-                    print(f"❌ [SSE-{connection_id}] Initial data failed: {initial_error}")
-                    import traceback
-                    print(f"❌ [SSE-{connection_id}] Initial data traceback: {traceback.format_exc()}")
+                    client_logger.warning(f"❌ [SSE-{connection_id}] Initial data failed: {initial_error}", exc_info=True)
                     
                     error_data = {
                         'type': 'initial_data_error',
@@ -289,14 +787,14 @@ class SSEServer:
                         'error_type': type(initial_error).__name__
                     }
                     error_msg = f"data: {json.dumps(error_data)}\n\n"
-                    await response.write(error_msg.encode())
+                    await self.write_message(response, error_msg.encode(), 'initial_data_error')
                 
                 # Keep connection alive with heartbeat
                 heartbeat_count = 0
                 while True:
                     await asyncio.sleep(30)  # Send heartbeat every 30 seconds
                     heartbeat_count += 1
-                    print(f"💓 [SSE-{connection_id}] Sending heartbeat #{heartbeat_count}")
+                    client_logger.debug(f"💓 [SSE-{connection_id}] Sending heartbeat #{heartbeat_count}")
                     
                     try:
                         heartbeat_data = {
@@ -306,22 +804,19 @@ class SSEServer:
                             'connection_id': connection_id
                         }
                         heartbeat_msg = f"data: {json.dumps(heartbeat_data)}\n\n"
-                        await response.write(heartbeat_msg.encode())
-                        print(f"✅ [SSE-{connection_id}] Heartbeat #{heartbeat_count} sent")
+                        await self.write_message(response, heartbeat_msg.encode(), 'heartbeat')
+                        client_logger.debug(f"✅ [SSE-{connection_id}] Heartbeat #{heartbeat_count} sent")
                         
                     except Exception as heartbeat_error:
-                        print(f"❌ [SSE-{connection_id}] Heartbeat #{heartbeat_count} failed: {heartbeat_error}")
+                        client_logger.warning(f"❌ [SSE-{connection_id}] Heartbeat #{heartbeat_count} failed: {heartbeat_error}")
                         break
                     
             except Exception as e:
-                print(f"❌ [SSE-{connection_id}] Connection error: {e}")
-                print(f"❌ [SSE-{connection_id}] Error type: {type(e).__name__}")
-                import traceback
-                print(f"❌ [SSE-{connection_id}] Traceback: {traceback.format_exc()}")
+                client_logger.warning(f"❌ [SSE-{connection_id}] Connection error: {e}", exc_info=True)
             finally:
-                print(f"🔌 [SSE-{connection_id}] Unregistering client")
+                client_logger.debug(f"🔌 [SSE-{connection_id}] Unregistering client")
                 await self.unregister_client(response)
-                print(f"✅ [SSE-{connection_id}] Client unregistered, remaining clients: {len(self.clients)}")
+                client_logger.info(f"✅ [SSE-{connection_id}] Client unregistered, remaining clients: {len(self.clients)}")
             
             return response
         
@@ -342,60 +837,61 @@ class SSEServer:
     
     async def start_server(self):
         """Start the HTTP and SSE server"""
-        print(f"🚀 Starting HTTP and SSE server on port {self.port}")
-        print(f"🔧 Current working directory: {os.getcwd()}")
-        print(f"🔧 Files in current directory: {os.listdir('.')}")
+        sse_logger.info(f"🚀 Starting HTTP and SSE server on port {self.port}")
+        sse_logger.debug(f"🔧 Current working directory: {os.getcwd()}")
+        sse_logger.debug(f"🔧 Files in current directory: {os.listdir('.')}")
         
         try:
             # Set up HTTP routes
-            print("🔧 Setting up HTTP routes...")
-            print(f"🔧 App before setup: {self.app}")
+            sse_logger.debug("🔧 Setting up HTTP routes...")
+            sse_logger.debug(f"🔧 App before setup: {self.app}")
             self.setup_http_routes()
-            print("✅ HTTP routes configured")
-            print(f"🔧 App after setup: {self.app}")
+            sse_logger.info("✅ HTTP routes configured")
+            sse_logger.debug(f"🔧 App after setup: {self.app}")
             
             # Start the server
-            print("🔧 Creating web app runner...")
-            print(f"🔧 App for runner: {self.app}")
-            print(f"🔧 App type: {type(self.app)}")
+            sse_logger.debug("🔧 Creating web app runner...")
+            sse_logger.debug(f"🔧 App for runner: {self.app}")
+            sse_logger.debug(f"🔧 App type: {type(self.app)}")
             runner = web.AppRunner(self.app)
-            print("🔧 AppRunner created, calling setup()...")
+            sse_logger.debug("🔧 AppRunner created, calling setup()...")
             await runner.setup()
-            print("✅ Web app runner setup complete")
+            sse_logger.info("✅ Web app runner setup complete")
             
-            print("🔧 Starting TCP site...")
-            print(f"🔧 Binding to 0.0.0.0:{self.port}")
-            site = web.TCPSite(runner, "0.0.0.0", self.port)
-            print("🔧 TCPSite created, calling start()...")
+            sse_logger.debug("🔧 Starting TCP site...")
+            sse_logger.debug(f"🔧 Binding to {self.host}:{self.port}")
+            site = web.TCPSite(runner, self.host, self.port, reuse_port=self.reuse_port or None)
+            sse_logger.debug("🔧 TCPSite created, calling start()...")
             await site.start()
-            print("✅ TCP site started")
+            sse_logger.info("✅ TCP site started")
             
             # Store the runner for cleanup
             self.server = runner
+            self.loop_monitor.start()
             
-            print(f"✅ HTTP server running on http://0.0.0.0:{self.port}")
-            print(f"✅ SSE server running on http://0.0.0.0:{self.port}/api/incidents/stream")
-            print("🎉 Server startup completed successfully!")
+            sse_logger.info(f"✅ HTTP server running on http://{self.host}:{self.port}")
+            sse_logger.info(f"✅ SSE server running on http://{self.host}:{self.port}/api/incidents/stream")
+            sse_logger.info("🎉 Server startup completed successfully!")
             
         except Exception as e:
-            print(f"❌ Failed to start HTTP/SSE server: {e}")
-            print(f"❌ Error type: {type(e).__name__}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
+            sse_logger.error(f"❌ Failed to start HTTP/SSE server: {e}", exc_info=True)
             raise
 
 class ContinuousRailwayScraper:
     """Continuous scraper for Railway deployment using HTTP requests"""
     
     def __init__(self):
-        print("🔧 ContinuousRailwayScraper.__init__() called")
+        configure_logging()
+        configure_tracing()
+        configure_memory_caps()
+        logger.debug("🔧 ContinuousRailwayScraper.__init__() called")
         # All 25 CHP communication centers
         self.centers = [
             'BFCC', 'BSCC', 'BICC', 'BCCC', 'CCCC', 'CHCC', 'ECCC', 'FRCC', 'GGCC', 'HMCC',
             'ICCC', 'INCC', 'LACC', 'MRCC', 'MYCC', 'OCCC', 'RDCC', 'SACC', 'SLCC', 'SKCCSTCC',
             'SUCC', 'TKCC', 'UKCC', 'VTCC', 'YKCC'
         ]
-        print(f"✅ Centers initialized: {len(self.centers)} centers")
+        logger.info(f"✅ Centers initialized: {len(self.centers)} centers")
         self.center_info = {
             'BFCC': {'name': 'Bakersfield', 'channel': 'chp-incidents-bfcc'},
             'BSCC': {'name': 'Barstow', 'channel': 'chp-incidents-bscc'},
@@ -425,43 +921,184 @@ class ContinuousRailwayScraper:
         }
         # Use Railway's PORT environment variable, fallback to 8082 for local development
         port = int(os.environ.get('PORT', 8082))
-        print(f"🔧 Using port: {port} (from PORT env var: {os.environ.get('PORT', 'not set')})")
-        print(f"🔧 Railway automatically assigns PORT - current value: {port}")
-        print(f"🔧 All environment variables: {dict(os.environ)}")
-        print("🔧 Creating SSEServer...")
-        self.sse_server = SSEServer(port=port)
-        print("✅ SSEServer created")
-        self.scrape_interval = 5  # 5-second intervals
+        logger.debug(f"🔧 Using port: {port} (from PORT env var: {os.environ.get('PORT', 'not set')})")
+        logger.debug(f"🔧 Railway automatically assigns PORT - current value: {port}")
+        logger.debug(f"🔧 Environment variables set: {sorted(os.environ)}")
+        # SSE_WORKERS > 0: this process is the scraper leader and N worker processes serve SSE on PORT.
+        # The leader's own server (metrics, debug endpoints) moves to LEADER_PORT on localhost.
+        self.port = port
+        self.sse_workers = int(os.getenv('SSE_WORKERS', '0'))
+        self.fanout_socket = os.getenv('FANOUT_SOCKET', f'/tmp/chp-fanout-{port}.sock')
+        self.worker_processes: Dict[int, multiprocessing.Process] = {}
+        self.worker_supervisor = None
+        logger.debug("🔧 Creating SSEServer...")
+        if self.sse_workers > 0:
+            self.sse_server = SSEServer(port=int(os.getenv('LEADER_PORT', port + 1)), host='127.0.0.1')
+            self.sse_server.frame_channel = FrameChannelServer(self.fanout_socket)
+        else:
+            self.sse_server = SSEServer(port=port)
+        logger.info("✅ SSEServer created")
+        
+        # Replicas sharing a pub/sub backend: the elected leader scrapes, every replica serves the shared stream
+        self.pubsub = create_pubsub_backend()
+        self.election = None
+        self.pubsub_tasks = []
+        # Replicas writing one store: followers leave persistence to the leader, which reloads
+        # lifecycle state from the store on takeover. Otherwise followers persist the stream themselves
+        self.shared_store = os.getenv('PUBSUB_SHARED_STORE', 'false').lower() == 'true'
+        if self.pubsub is not None:
+            self.election = LeaderElection(self.pubsub, ttl=float(os.getenv('LEADER_TTL', '15')))
+            self.sse_server.pubsub = self.pubsub
+            self.sse_server.election = self.election
+            logger.info(f"✅ Pub/sub backend {type(self.pubsub).__name__}, replica {self.election.identity}")
+        self.scrape_interval = float(os.getenv('SCRAPE_INTERVAL', '5'))  # 5-second intervals by default
         self.is_running = False
-        print("🔧 Creating HTTPScraper...")
+        logger.debug("🔧 Creating HTTPScraper...")
         try:
             self.http_scraper = HTTPScraper(mode="railway")
-            print("✅ HTTPScraper created")
+            self.sse_server.change_detector = self.http_scraper.change_detector
+            self.sse_server.governor = self.http_scraper.governor
+            self.sse_server.breakers = self.http_scraper.breakers
+            self.sse_server.hedge_policy = self.http_scraper.hedge_policy
+            logger.info("✅ HTTPScraper created")
         except Exception as e:
-            print(f"❌ CRITICAL: Failed to create HTTPScraper: {e}")
-            print(f"❌ Error type: {type(e).__name__}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
+            logger.error(f"❌ CRITICAL: Failed to create HTTPScraper: {e}", exc_info=True)
             raise
-        print("✅ ContinuousRailwayScraper initialization completed successfully")
         
-        # Setup logging
-        print("🔧 Setting up logging...")
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-        print("✅ Logging configured")
-        print("🎉 ContinuousRailwayScraper initialization completed!")
+        # Incident history store (SQLite); JSON files under data/ are an optional export
+        self.export_json = os.getenv('EXPORT_JSON_FILES', 'false').lower() == 'true'
+        self.incident_store = None
+        if os.getenv('ENABLE_INCIDENT_STORE', 'true').lower() == 'true':
+            db_path = os.getenv('INCIDENT_STORE_PATH', 'data/incidents.db')
+            try:
+                self.incident_store = IncidentStore(db_path)
+                self.sse_server.incident_store = self.incident_store
+                logger.info(f"✅ Incident store opened at {db_path}")
+            except Exception as e:
+                logger.error(f"❌ Failed to open incident store at {db_path}: {e}")
+        
+        # Lifecycle table (first_seen/last_seen/resolved_at) built from each diff
+        self.lifecycle_tracker = IncidentLifecycleTracker(self.incident_store) if self.incident_store else None
+        
+        # Offline geocoding into a spatial index for /api/incidents/near and geo-filtered SSE
+        self.geocoder = None
+        self.spatial_index = None
+        if os.getenv('ENABLE_GEOCODING', 'true').lower() == 'true':
+            try:
+                self.geocoder = IncidentGeocoder()
+                self.spatial_index = GridSpatialIndex()
+                self.sse_server.spatial_index = self.spatial_index
+            except Exception as e:
+                logger.error(f"❌ Failed to load gazetteer: {e}")
+        
+        # Data managers are kept across cycles so diffs compare against the previous cycle
+        self.data_managers: Dict[str, DataManager] = {}
+        
+        # Last successful result per center, served (marked stale) while a center is failing. Reported only:
+        # evicting one would turn a failing center's stale snapshot into an empty error result
+        self.last_good_results: Dict[str, Dict[str, Any]] = {}
+        self.snapshot_memory = MEMORY.account('snapshots')
+        # Previous-cycle incidents the diffs need; accounted but never evicted
+        self.baseline_memory = MEMORY.account('diff_baselines')
+        # Shared string tables behind the baselines, compacted to the live values every cycle
+        self.string_table_memory = MEMORY.account('string_tables')
+        
+        # Nightly columnar archive of the previous day, triggered on date rollover
+        self.enable_archive = os.getenv('ENABLE_DAILY_ARCHIVE', 'true').lower() == 'true'
+        self.archive_dir = os.getenv('ARCHIVE_DIR', 'data/archive')
+        self.current_day = datetime.now().strftime("%Y-%m-%d")
+        self.archives_checked = False  # Past days without an archive are backfilled once at startup
+        self.archive_task = None
+        logger.info("🎉 ContinuousRailwayScraper initialization completed!")
+    
+    def get_data_manager(self, center_code: str) -> DataManager:
+        """Get the data manager of a center, wired to the incident store when enabled"""
+        if center_code in self.data_managers:
+            return self.data_managers[center_code]
+        
+        # Snapshots share the HTTP scraper's string tables and are kept as compact records
+        if self.incident_store is None:
+            data_manager = DataManager(center_code, normalizer=self.http_scraper.normalizer)
+        else:
+            data_manager = DataManager(
+                center_code,
+                file_manager=None if self.export_json else SQLiteFileManager(self.incident_store),
+                delta_processor=SQLiteDeltaProcessor(self.incident_store, center_code),
+                export_json=self.export_json,
+                normalizer=self.http_scraper.normalizer
+            )
+        
+        self.data_managers[center_code] = data_manager
+        return data_manager
+    
+    def track_lifecycle(self, center_code: str, incidents_data: List[Dict], changes: Dict[str, List]) -> None:
+        """Update incident lifecycles and derive is_new from them"""
+        if self.lifecycle_tracker is None:
+            return
+        
+        try:
+            new_ids = self.lifecycle_tracker.observe(center_code, incidents_data, changes)
+        except Exception as e:
+            logger.error(f"❌ Failed to update lifecycles for {center_code}: {e}")
+            return
+        
+        for incident in incidents_data:
+            incident['is_new'] = incident['id'] in new_ids
+    
+    def index_locations(self, center_code: str, incidents_data: List[Dict]) -> None:
+        """Geocode a center's incidents and sync them into the spatial index"""
+        if self.geocoder is None:
+            return
+        
+        for incident in incidents_data:
+            geo = self.geocoder.geocode_incident(incident)
+            if geo is not None:
+                incident['geo'] = geo
+        self.spatial_index.update_center(center_code, incidents_data)
+    
+    def compact_baselines(self) -> None:
+        """Rebuild the shared string tables from the values the diff baselines still reference, and account both"""
+        normalizer = self.http_scraper.normalizer
+        managers = [data_manager for data_manager in self.data_managers.values()
+                    if data_manager.previous_records is not None]
+        for data_manager, records in zip(managers, normalizer.compact([manager.previous_records for manager in managers])):
+            data_manager.previous_records = records
+            self.baseline_memory.charge(data_manager.center_code, approximate_size(records))  # Encoded, never decoded here
+        for field, table in normalizer.tables.items():
+            self.string_table_memory.charge(field, approximate_size(table))
+    
+    def persistence_batch(self):
+        """Batch all store writes of a scrape cycle into one transaction"""
+        if self.incident_store is None:
+            return nullcontext()
+        return self.incident_store.transaction()
+    
+    def persist_changes(self, data_manager: DataManager, incidents_data: List[Dict], changes: Dict[str, List]) -> None:
+        """Persist deltas and incident history when the store or JSON export is enabled"""
+        if self.incident_store is None and not self.export_json:
+            return
+        
+        try:
+            data_manager.save_delta_updates(changes)
+            data_manager.append_daily_incidents(incidents_data, changes)
+        except Exception as e:
+            logger.error(f"❌ Failed to persist incidents for {data_manager.center_code}: {e}")
+    
+    def persist_cycle(self, jobs: List[tuple]) -> None:
+        """Lifecycle and history writes of a cycle, (data_manager, incidents, changes) per center, in one transaction"""
+        with self.persistence_batch():
+            for data_manager, incidents_data, changes in jobs:
+                self.track_lifecycle(data_manager.center_code, incidents_data, changes)
+                self.persist_changes(data_manager, incidents_data, changes)
     
     async def scrape_center(self, center_code: str) -> Dict[str, Any]:
         """Scrape a single communication center using HTTP requests"""
         try:
-            print(f"🔄 Scraping {center_code} ({self.center_info[center_code]['name']})...")
+            logger.info(f"🔄 Scraping {center_code} ({self.center_info[center_code]['name']})...")
             
             # Initialize data manager
-            data_manager = DataManager(center_code)
-            previous_incidents = data_manager.load_previous_incidents()
+            data_manager = self.get_data_manager(center_code)
+            previous_incidents = data_manager.previous_incidents or data_manager.load_previous_incidents()
             
             # Use HTTP scraper
             result = self.http_scraper.scrape_center_sync(center_code, previous_incidents)
@@ -471,15 +1108,17 @@ class ContinuousRailwayScraper:
                 incidents_data = result['incidents']
                 
                 # Compare with previous incidents
-                changes = data_manager.compare_incidents(incidents_data)
+                with DIFF_SECONDS.time(center=center_code):
+                    changes = data_manager.compare_incidents(incidents_data)
                 has_changes = (len(changes.get('new_incidents', [])) > 0 or 
                               len(changes.get('removed_incidents', [])) > 0)
                 
-                # Save data - DISABLED for SSE-only implementation
-                # file_updated = data_manager.save_active_incidents(incidents_data)
-                # data_manager.save_delta_updates(changes)
-                # data_manager.append_daily_incidents(incidents_data)
-                file_updated = True  # Always consider updated for SSE
+                self.index_locations(center_code, incidents_data)
+                
+                # Persist history (active_incidents JSON writes stay disabled for SSE)
+                with self.persistence_batch():
+                    self.track_lifecycle(center_code, incidents_data, changes)
+                    self.persist_changes(data_manager, incidents_data, changes)
                 
                 # Update previous incidents
                 data_manager.update_previous_incidents(incidents_data)
@@ -498,10 +1137,10 @@ class ContinuousRailwayScraper:
                     'status': 'success'
                 }
                 
-                print(f"✅ {center_code}: {len(incidents_data)} incidents, {len(changes.get('new_incidents', []))} new")
+                logger.info(f"✅ {center_code}: {len(incidents_data)} incidents, {len(changes.get('new_incidents', []))} new")
                 return result
             else:
-                print(f"⚠️ {center_code}: No incidents found")
+                logger.warning(f"⚠️ {center_code}: No incidents found")
                 return {
                     'center': center_code,
                     'centerName': self.center_info[center_code]['name'],
@@ -513,7 +1152,7 @@ class ContinuousRailwayScraper:
                 }
                 
         except Exception as e:
-            print(f"❌ Error scraping {center_code}: {e}")
+            logger.error(f"❌ Error scraping {center_code}: {e}")
             return {
                 'center': center_code,
                 'centerName': self.center_info[center_code]['name'],
@@ -524,90 +1163,149 @@ class ContinuousRailwayScraper:
     
     async def scrape_all_centers(self) -> List[Dict[str, Any]]:
         """Scrape all communication centers using async HTTP requests"""
-        print(f"🚀 [SCRAPE] Starting parallel HTTP scrape of {len(self.centers)} centers...")
-        print(f"🚀 [SCRAPE] Centers: {', '.join(self.centers[:5])}... (showing first 5)")
+        logger.info(f"🚀 [SCRAPE] Starting parallel HTTP scrape of {len(self.centers)} centers...")
+        logger.info(f"🚀 [SCRAPE] Centers: {', '.join(self.centers[:5])}... (showing first 5)")
         
         start_time = datetime.now()
         
         try:
             # Use HTTP scraper for async parallel processing
-            print(f"📡 [SCRAPE] Calling http_scraper.scrape_all_centers_async()")
-            results = await self.http_scraper.scrape_all_centers_async(self.centers)
-            print(f"✅ [SCRAPE] HTTP scraper returned {len(results)} results")
+            logger.info(f"📡 [SCRAPE] Calling http_scraper.scrape_all_centers_async()")
+            with TRACER.span('scrape', centers=len(self.centers)):
+                results = await self.http_scraper.scrape_all_centers_async(self.centers)
+            logger.info(f"✅ [SCRAPE] HTTP scraper returned {len(results)} results")
             
         except Exception as scrape_error:
-            print(f"❌ [SCRAPE] HTTP scraper failed: {scrape_error}")
-            print(f"❌ [SCRAPE] Error type: {type(scrape_error).__name__}")
-            import traceback
-            print(f"❌ [SCRAPE] Traceback: {traceback.format_exc()}")
+            logger.error(f"❌ [SCRAPE] HTTP scraper failed: {scrape_error}", exc_info=True)
             return []
         
         # Process results to match expected format
         processed_results = []
-        for result in results:
-            if result['status'] == 'success':
-                # Convert to the format expected by data_manager
-                center_code = result['center']
-                data_manager = DataManager(center_code)
-                previous_incidents = data_manager.load_previous_incidents()
+        persist_jobs = []
+        with TRACER.span('process', centers=len(results)):
+            for result in results:
+                if result['status'] == 'success':
+                    # Convert to the format expected by data_manager
+                    center_code = result['center']
+                    data_manager = self.get_data_manager(center_code)
                 
-                incidents_data = result['incidents']
+                    incidents_data = result['incidents']
                 
-                # Compare with previous incidents
-                changes = data_manager.compare_incidents(incidents_data)
-                has_changes = (len(changes.get('new_incidents', [])) > 0 or 
-                              len(changes.get('removed_incidents', [])) > 0)
+                    # Compare with previous incidents
+                    with TRACER.span('diff', center=center_code), DIFF_SECONDS.time(center=center_code):
+                        changes = data_manager.compare_incidents(incidents_data)
+                    has_changes = (len(changes.get('new_incidents', [])) > 0 or 
+                                  len(changes.get('removed_incidents', [])) > 0)
                 
-                # Save data - DISABLED for SSE-only implementation
-                # file_updated = data_manager.save_active_incidents(incidents_data)
-                # data_manager.save_delta_updates(changes)
-                # data_manager.append_daily_incidents(incidents_data)
-                file_updated = True  # Always consider updated for SSE
+                    with TRACER.span('geocode', center=center_code):
+                        self.index_locations(center_code, incidents_data)
                 
-                # Update previous incidents
-                data_manager.update_previous_incidents(incidents_data)
+                    # Persisted after the loop, with the rest of the cycle's batch
+                    persist_jobs.append((data_manager, incidents_data, changes))
                 
-                # Prepare SSE data
-                incidents_json = data_manager.incidents_to_json(incidents_data)
+                    # Update previous incidents
+                    data_manager.update_previous_incidents(incidents_data)
                 
-                processed_result = {
-                    'center': center_code,
-                    'centerName': self.center_info[center_code]['name'],
-                    'incidents': incidents_json['incidents'],
-                    'incidentCount': incidents_json['incident_count'],
-                    'timestamp': datetime.now().isoformat(),
-                    'hasChanges': has_changes,
-                    'changes': changes,
-                    'status': 'success'
-                }
+                    # Prepare SSE data
+                    incidents_json = data_manager.incidents_to_json(incidents_data)
                 
-                print(f"✅ {center_code}: {len(incidents_data)} incidents, {len(changes.get('new_incidents', []))} new")
-            else:
-                processed_result = {
-                    'center': result['center'],
-                    'centerName': self.center_info[result['center']]['name'],
-                    'incidents': [],
-                    'incidentCount': 0,
-                    'timestamp': datetime.now().isoformat(),
-                    'hasChanges': False,
-                    'status': 'error',
-                    'error': result.get('error', 'Unknown error')
-                }
-                print(f"❌ {result['center']}: {result.get('error', 'Unknown error')}")
+                    processed_result = {
+                        'center': center_code,
+                        'centerName': self.center_info[center_code]['name'],
+                        'incidents': incidents_json['incidents'],
+                        'incidentCount': incidents_json['incident_count'],
+                        'timestamp': datetime.now().isoformat(),
+                        'hasChanges': has_changes,
+                        'changes': changes,
+                        'status': 'success'
+                    }
+                    self.last_good_results[center_code] = processed_result
+                    self.snapshot_memory.charge(center_code, approximate_size(processed_result))
+                
+                    logger.info(f"✅ {center_code}: {len(incidents_data)} incidents, {len(changes.get('new_incidents', []))} new")
+                elif result['center'] in self.last_good_results:
+                    # Keep serving the last good snapshot, marked stale
+                    last_good = self.last_good_results[result['center']]
+                    processed_result = {
+                        **{key: value for key, value in last_good.items() if key != 'changes'},
+                        'timestamp': datetime.now().isoformat(),
+                        'hasChanges': False,
+                        'status': 'stale',
+                        'stale': True,
+                        'lastSuccess': last_good['timestamp'],
+                        'upstreamStatus': result['status'],
+                        'error': result.get('error', 'Unknown error')
+                    }
+                    logger.warning(f"⚠️ {result['center']}: serving stale snapshot from {last_good['timestamp']} ({result.get('error', 'Unknown error')})")
+                else:
+                    processed_result = {
+                        'center': result['center'],
+                        'centerName': self.center_info[result['center']]['name'],
+                        'incidents': [],
+                        'incidentCount': 0,
+                        'timestamp': datetime.now().isoformat(),
+                        'hasChanges': False,
+                        'status': result['status'] if result['status'] == 'circuit_open' else 'error',
+                        'error': result.get('error', 'Unknown error')
+                    }
+                    logger.error(f"❌ {result['center']}: {result.get('error', 'Unknown error')}")
             
-            processed_results.append(processed_result)
+                processed_results.append(processed_result)
+            
+            self.compact_baselines()
+        
+        # One transaction for the whole cycle, committed in the executor so SQLite never blocks the loop.
+        # is_new is set on the result incidents there, before they are broadcast.
+        if self.stepped_down():
+            logger.warning("⚠️ Lost the scraper lock mid-cycle, dropping this cycle's results")
+            return []
+        
+        if persist_jobs and (self.incident_store is not None or self.export_json):
+            with TRACER.span('persist', centers=len(persist_jobs)):
+                await asyncio.get_running_loop().run_in_executor(None, self.persist_cycle, persist_jobs)
         
         return processed_results
     
+    def stepped_down(self) -> bool:
+        """Whether this replica lost the scraper lock (always False without a pub/sub backend)"""
+        return self.election is not None and not self.election.is_leader
+    
+    def schedule_daily_archive(self):
+        """Archive past days that have no archive yet in the background: at startup and when the date rolls over"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        if today == self.current_day and self.archives_checked:
+            return
+        if self.archive_task is not None and not self.archive_task.done():
+            return  # Still archiving; checked again on the next iteration
+        
+        self.current_day = today
+        self.archives_checked = True
+        if not self.enable_archive:
+            return
+        
+        async def run_archive():
+            loop = asyncio.get_running_loop()
+            try:
+                paths = await loop.run_in_executor(
+                    None, backfill_archives, today, self.incident_store, 'data', self.archive_dir
+                )
+                for path in paths:
+                    logger.info(f"📦 Archived {path}")
+            except Exception as e:
+                logger.error(f"❌ Failed to archive days before {today}: {e}")
+        
+        self.archive_task = asyncio.create_task(run_archive())
+    
     async def broadcast_results(self, results: List[Dict[str, Any]]):
         """Broadcast scraping results to SSE clients"""
         for result in results:
             if result['status'] == 'success' and result.get('hasChanges', False):
                 # Broadcast individual center updates
-                await self.sse_server.broadcast_update({
-                    'type': 'incident_update',
-                    'data': result
-                })
+                with TRACER.span('broadcast', type='incident_update', center=result['center']):
+                    await self.sse_server.broadcast_update({
+                        'type': 'incident_update',
+                        'data': result
+                    })
         
         # Broadcast summary
         summary = {
@@ -619,106 +1317,229 @@ class ContinuousRailwayScraper:
                 'results': results
             }
         }
-        await self.sse_server.broadcast_update(summary)
+        with TRACER.span('broadcast', type='scrape_summary', clients=len(self.sse_server.clients)):
+            await self.sse_server.broadcast_update(summary)
+    
+    async def receive_broadcast(self, message_type: str, frame: bytes):
+        """Serve a frame from the shared stream; followers also keep diff baselines and history for a takeover"""
+        await self.sse_server.receive_frame(message_type, frame)
+        if message_type != 'scrape_summary' or self.election.is_leader:
+            return
+        
+        # Diffed against this replica's own baselines, so its store and lifecycles match what it served
+        persist = not self.shared_store and (self.incident_store is not None or self.export_json)
+        persist_jobs = []
+        for center, result in self.sse_server.latest_results.items():
+            if result['status'] == 'success':
+                data_manager = self.get_data_manager(center)
+                if persist:
+                    persist_jobs.append((data_manager, result['incidents'], data_manager.compare_incidents(result['incidents'])))
+                data_manager.update_previous_incidents(result['incidents'])
+        self.compact_baselines()
+        
+        if persist_jobs:
+            await asyncio.get_running_loop().run_in_executor(None, self.persist_cycle, persist_jobs)
+    
+    def start_sse_worker(self, worker_id: int):
+        """Spawn one SSE worker process"""
+        process = multiprocessing.get_context('spawn').Process(
+            target=sse_worker_process, args=(worker_id, self.port, self.fanout_socket),
+            name=f'sse-worker-{worker_id}', daemon=True
+        )
+        process.start()
+        self.worker_processes[worker_id] = process
+        logger.info(f"✅ SSE worker {worker_id} started (pid {process.pid})")
+    
+    async def supervise_sse_workers(self):
+        """Restart SSE workers that exit"""
+        while self.is_running:
+            await asyncio.sleep(5)
+            for worker_id, process in list(self.worker_processes.items()):
+                if not process.is_alive():
+                    logger.error(f"❌ SSE worker {worker_id} exited with code {process.exitcode}, restarting")
+                    self.start_sse_worker(worker_id)
+    
+    def stop_sse_workers(self):
+        """Terminate the SSE worker processes"""
+        for process in self.worker_processes.values():
+            process.terminate()
+        for process in self.worker_processes.values():
+            process.join(timeout=5)
+        self.worker_processes.clear()
     
     async def run_forever(self):
         """Main continuous scraping loop"""
-        print("🚀 Starting Continuous Railway Scraper")
-        print(f"📡 Scraping {len(self.centers)} centers every {self.scrape_interval} seconds")
-        print(f"🌐 SSE server will run on port {self.sse_server.port}")
-        print(f"🎯 Centers: {', '.join(self.centers)}")
-        print(f"🔧 SSE server object: {self.sse_server}")
-        print(f"🔧 SSE server type: {type(self.sse_server)}")
+        logger.info("🚀 Starting Continuous Railway Scraper")
+        logger.info(f"📡 Scraping {len(self.centers)} centers every {self.scrape_interval} seconds")
+        logger.info(f"🌐 SSE server will run on port {self.sse_server.port}")
+        logger.info(f"🎯 Centers: {', '.join(self.centers)}")
+        logger.debug(f"🔧 SSE server object: {self.sse_server}")
+        logger.debug(f"🔧 SSE server type: {type(self.sse_server)}")
 
         # Start SSE server
         try:
-            print("🔧 Starting SSE server...")
-            print(f"🔧 About to call start_server() on {self.sse_server}")
+            logger.debug("🔧 Starting SSE server...")
+            logger.debug(f"🔧 About to call start_server() on {self.sse_server}")
             await self.sse_server.start_server()
-            print("✅ SSE server started successfully")
+            logger.info("✅ SSE server started successfully")
         except Exception as e:
-            print(f"❌ Failed to start SSE server: {e}")
-            print(f"❌ Error type: {type(e).__name__}")
-            import traceback
-            print(f"❌ Traceback: {traceback.format_exc()}")
-            print("❌ Continuing without SSE server...")
+            logger.error(f"❌ Failed to start SSE server: {e}", exc_info=True)
+            logger.warning("⚠️ Continuing without SSE server...")
             # Don't raise - continue with scraping only
         
         self.is_running = True
+        if self.sse_server.frame_channel is not None:
+            await self.sse_server.frame_channel.start()
+            for worker_id in range(self.sse_workers):
+                self.start_sse_worker(worker_id)
+            self.worker_supervisor = asyncio.create_task(self.supervise_sse_workers())
+            logger.info(f"🌐 {self.sse_workers} SSE workers serving port {self.port}")
+        if self.pubsub is not None:
+            self.pubsub_tasks = [asyncio.create_task(self.pubsub.subscribe(self.receive_broadcast)),
+                                 asyncio.create_task(self.election.run())]
         iteration = 0
+        consecutive_errors = 0
         
         while self.is_running:
             try:
+                if self.stepped_down():
+                    logger.info("⏸️ Following the scraper leader, serving SSE from the shared stream")
+                    await self.election.wait_until_leader()
+                    logger.info("👑 Elected scraper leader, starting to scrape")
+                    if self.shared_store and self.lifecycle_tracker is not None:
+                        # The previous leader kept the shared lifecycle table up to date
+                        self.lifecycle_tracker = IncidentLifecycleTracker(self.incident_store)
+                
                 iteration += 1
-                print(f"\n🔄 [MAIN-{iteration}] Starting iteration at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                print(f"🔄 [MAIN-{iteration}] SSE clients connected: {len(self.sse_server.clients)}")
+                logger.info(f"🔄 [MAIN-{iteration}] Starting iteration at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                logger.info(f"🔄 [MAIN-{iteration}] SSE clients connected: {len(self.sse_server.clients)}")
                 
-                # Scrape all centers
-                print(f"🔄 [MAIN-{iteration}] Starting scrape_all_centers()")
-                scrape_start = datetime.now()
-                results = await self.scrape_all_centers()
-                scrape_duration = (datetime.now() - scrape_start).total_seconds()
-                print(f"✅ [MAIN-{iteration}] Scraping completed in {scrape_duration:.2f}s")
+                with TRACER.trace('cycle', iteration=iteration, clients=len(self.sse_server.clients)):
+                    # Never start a cycle while the previous cycle's requests are still pending
+                    with TRACER.span('governor.wait_idle'):
+                        idle = await self.http_scraper.governor.wait_idle()
+                    if not idle:
+                        logger.warning(f"⚠️ [MAIN-{iteration}] Upstream requests still pending after 60s, starting anyway")
                 
-                # Broadcast results
-                if results:
-                    print(f"📡 [MAIN-{iteration}] Broadcasting {len(results)} results to {len(self.sse_server.clients)} clients")
-                    broadcast_start = datetime.now()
-                    await self.broadcast_results(results)
-                    broadcast_duration = (datetime.now() - broadcast_start).total_seconds()
-                    print(f"✅ [MAIN-{iteration}] Broadcasting completed in {broadcast_duration:.2f}s")
-                else:
-                    print(f"⚠️ [MAIN-{iteration}] No results to broadcast")
+                    # Scrape all centers
+                    logger.info(f"🔄 [MAIN-{iteration}] Starting scrape_all_centers()")
+                    scrape_start = datetime.now()
+                    results = await self.scrape_all_centers()
+                    scrape_duration = (datetime.now() - scrape_start).total_seconds()
+                    CYCLE_SECONDS.observe(scrape_duration, phase='scrape')
+                    logger.info(f"✅ [MAIN-{iteration}] Scraping completed in {scrape_duration:.2f}s")
+                
+                    # Broadcast results; a replica that stepped down while persisting leaves them to the new leader
+                    if results and self.stepped_down():
+                        logger.warning(f"⚠️ [MAIN-{iteration}] Lost the scraper lock mid-cycle, not broadcasting")
+                    elif results:
+                        logger.info(f"📡 [MAIN-{iteration}] Broadcasting {len(results)} results to {len(self.sse_server.clients)} clients")
+                        broadcast_start = datetime.now()
+                        await self.broadcast_results(results)
+                        broadcast_duration = (datetime.now() - broadcast_start).total_seconds()
+                        CYCLE_SECONDS.observe(broadcast_duration, phase='broadcast')
+                        logger.info(f"✅ [MAIN-{iteration}] Broadcasting completed in {broadcast_duration:.2f}s")
+                    else:
+                        logger.warning(f"⚠️ [MAIN-{iteration}] No results to broadcast")
+                
+                # Archives of past days: backfilled after the first cycle, then after each midnight (in the background)
+                self.schedule_daily_archive()
                 
                 # Wait for next iteration
-                print(f"⏳ [MAIN-{iteration}] Waiting {self.scrape_interval}s until next iteration")
+                consecutive_errors = 0
+                logger.info(f"⏳ [MAIN-{iteration}] Waiting {self.scrape_interval}s until next iteration")
                 await asyncio.sleep(self.scrape_interval)
                 
             except KeyboardInterrupt:
-                print(f"\n🛑 [MAIN-{iteration}] Received interrupt signal, shutting down...")
+                logger.info(f"🛑 [MAIN-{iteration}] Received interrupt signal, shutting down...")
                 self.is_running = False
                 break
             except Exception as e:
-                print(f"❌ [MAIN-{iteration}] Error in main loop: {e}")
-                print(f"❌ [MAIN-{iteration}] Error type: {type(e).__name__}")
-                import traceback
-                print(f"❌ [MAIN-{iteration}] Traceback: {traceback.format_exc()}")
-                print(f"⏳ [MAIN-{iteration}] Waiting 30s before retry...")
-                await asyncio.sleep(30)
+                logger.error(f"❌ [MAIN-{iteration}] Error in main loop: {e}", exc_info=True)
+                CYCLE_ERRORS.inc()
+                retry_delay = jittered_backoff(consecutive_errors, self.scrape_interval, 120.0)
+                consecutive_errors += 1
+                logger.info(f"⏳ [MAIN-{iteration}] Waiting {retry_delay:.1f}s before retry...")
+                await asyncio.sleep(retry_delay)
         
         # Cleanup
+        if self.lifecycle_tracker is not None:
+            try:
+                self.lifecycle_tracker.flush()
+            except Exception as e:
+                logger.error(f"❌ Failed to write lifecycle counters: {e}")
+        for task in self.pubsub_tasks:
+            task.cancel()
+        if self.pubsub_tasks:
+            await asyncio.gather(*self.pubsub_tasks, return_exceptions=True)
+            await self.pubsub.close()
+        if self.worker_supervisor is not None:
+            self.worker_supervisor.cancel()
+        if self.sse_server.frame_channel is not None:
+            self.stop_sse_workers()
+            await self.sse_server.frame_channel.stop()
+        self.sse_server.loop_monitor.stop()
         if self.sse_server.server:
             self.sse_server.server.close()
             await self.sse_server.server.wait_closed()
         
-        print("✅ Continuous scraper stopped")
+        logger.info("✅ Continuous scraper stopped")
+
+async def run_sse_worker(worker_id: int, port: int, socket_path: str):
+    """SSE worker: serves clients on the shared port with frames received from the scraper leader"""
+    configure_memory_caps()
+    server = SSEServer(port=port, reuse_port=True, worker_id=worker_id)
+    if os.getenv('ENABLE_INCIDENT_STORE', 'true').lower() == 'true':
+        db_path = os.getenv('INCIDENT_STORE_PATH', 'data/incidents.db')
+        try:
+            server.incident_store = IncidentStore(db_path, read_only=True)  # History and export queries only
+        except Exception as e:
+            logger.error(f"❌ Failed to open incident store at {db_path}: {e}")
+    if os.getenv('ENABLE_GEOCODING', 'true').lower() == 'true':
+        server.spatial_index = GridSpatialIndex()  # Filled from the leader's geocoded scrape summaries
+    await server.start_server()
+    
+    channel = asyncio.create_task(FrameChannelClient(socket_path, server.receive_frame).run())
+    leader_pid = os.getppid()
+    try:
+        # Exit with the leader, even if it was killed without terminating its workers
+        while os.getppid() == leader_pid and not channel.done():
+            await asyncio.sleep(1)
+    finally:
+        channel.cancel()
+        server.loop_monitor.stop()
+        await server.server.cleanup()
+    sse_logger.info(f"🛑 SSE worker {worker_id} stopped")
+
+def sse_worker_process(worker_id: int, port: int, socket_path: str):
+    """Entry point of an SSE worker process"""
+    configure_logging()
+    try:
+        asyncio.run(run_sse_worker(worker_id, port, socket_path))
+    except KeyboardInterrupt:
+        pass
 
 async def main():
     """Main entry point"""
-    print("🚀 Starting main() function")
-    print("🔧 Creating ContinuousRailwayScraper...")
+    logger.info("🚀 Starting main() function")
+    logger.debug("🔧 Creating ContinuousRailwayScraper...")
     try:
         scraper = ContinuousRailwayScraper()
-        print("✅ ContinuousRailwayScraper created")
-        print("🔧 Starting run_forever()...")
+        logger.info("✅ ContinuousRailwayScraper created")
+        logger.debug("🔧 Starting run_forever()...")
         await scraper.run_forever()
     except Exception as e:
-        print(f"❌ CRITICAL ERROR in main(): {e}")
-        print(f"❌ Error type: {type(e).__name__}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error(f"❌ CRITICAL ERROR in main(): {e}", exc_info=True)
         raise
 
 if __name__ == "__main__":
-    print("🚀 Script started - __name__ == '__main__'")
-    print("🔧 Running asyncio.run(main())...")
+    configure_logging()
+    logger.info("🚀 Script started - __name__ == '__main__'")
+    logger.debug("🔧 Running asyncio.run(main())...")
     try:
         asyncio.run(main())
-        print("✅ asyncio.run(main()) completed successfully")
+        logger.info("✅ asyncio.run(main()) completed successfully")
     except Exception as e:
-        print(f"❌ CRITICAL ERROR in asyncio.run(main()): {e}")
-        print(f"❌ Error type: {type(e).__name__}")
-        import traceback
-        print(f"❌ Traceback: {traceback.format_exc()}")
+        logger.error(f"❌ CRITICAL ERROR in asyncio.run(main()): {e}", exc_info=True)
         exit(1)
-    print("🎯 Script execution finished")
+    logger.info("🎯 Script execution finished")
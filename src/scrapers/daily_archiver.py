@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Daily Incident Archiver
+Converts one day of incidents for all centers into a single columnar archive file
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.columnar_archive import write_archive
+from core.incident_store import IncidentStore
+
+DAY_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+def archive_path(day: str, archive_dir: str = "data/archive") -> str:
+    """Path of the archive file for a day (YYYY-MM-DD)"""
+    return os.path.join(archive_dir, f"{day}_incidents.chpcol")
+
+def iter_json_rows(day: str, data_dir: str = "data", store: IncidentStore = None) -> Iterator[Dict[str, Any]]:
+    """Yield archive rows from the legacy per-center daily JSON files
+
+    first_seen/last_seen come from the lifecycle table when the store has the incident,
+    else the start of the day (the files only hold incidents first seen that day).
+    """
+    start = datetime.strptime(day, "%Y-%m-%d")
+    day_start = start.timestamp()
+    lifecycles = store.lifecycle_times(day_start, (start + timedelta(days=1)).timestamp()) if store else {}
+    for path in sorted(glob.glob(os.path.join(data_dir, f"{day}_incidents_*.json"))):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.warning(f"Skipping unreadable daily file {path}: {e}")
+            continue
+
+        for incident in data.get('incidents', []):
+            center_code = incident.get('center_code') or data.get('center_code')
+            first_seen, last_seen = lifecycles.get((center_code, incident.get('id'), incident.get('time')),
+                                                   (day_start, day_start))
+            yield {
+                'center_code': center_code,
+                'incident_id': incident.get('id'),
+                'incident_time': incident.get('time'),
+                'type': incident.get('type'),
+                'location': incident.get('location'),
+                'area': incident.get('area'),
+                'details': incident.get('details'),
+                'lane_status': (incident.get('lane_blockage') or {}).get('status'),
+                'first_seen': first_seen,
+                'last_seen': last_seen
+            }
+
+def archive_day(day: str, store: IncidentStore = None, data_dir: str = "data",
+                archive_dir: str = "data/archive") -> Optional[str]:
+    """Archive all incidents first seen on a day, returns the archive path (None if nothing to archive)"""
+    start = datetime.strptime(day, "%Y-%m-%d")
+    end = start + timedelta(days=1)
+
+    if store is not None:
+        rows = list(store.iter_rows(start.timestamp(), end.timestamp()))
+        source = 'incident_store'
+    else:
+        rows = []
+    if not rows:
+        rows = list(iter_json_rows(day, data_dir, store))
+        source = 'daily_json'
+    if not rows:
+        logging.info(f"No incidents to archive for {day}")
+        return None
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(day, archive_dir)
+    tmp_path = path + ".tmp"
+    row_count = write_archive(tmp_path, rows, metadata={
+        'date': day,
+        'source': source,
+        'created_at': datetime.now().isoformat()
+    })
+    os.replace(tmp_path, path)
+
+    logging.info(f"Archived {row_count} incidents for {day} to {path} ({os.path.getsize(path)} bytes)")
+    return path
+
+def unarchived_days(before_day: str, store: IncidentStore = None, data_dir: str = "data",
+                    archive_dir: str = "data/archive") -> List[str]:
+    """Days before before_day with incidents (in the store or daily JSON files) but no archive file"""
+    days = set()
+    if store is not None:
+        days.update(store.first_seen_days(datetime.strptime(before_day, "%Y-%m-%d").timestamp()))
+    for path in glob.glob(os.path.join(data_dir, "*_incidents_*.json")):
+        day = os.path.basename(path).split('_', 1)[0]
+        if DAY_PATTERN.match(day) and day < before_day:
+            days.add(day)
+    return sorted(day for day in days if not os.path.exists(archive_path(day, archive_dir)))
+
+def backfill_archives(before_day: str, store: IncidentStore = None, data_dir: str = "data",
+                      archive_dir: str = "data/archive") -> List[str]:
+    """Archive every past day that has no archive yet (missed by a restart or crash), returns the paths written"""
+    paths = []
+    for day in unarchived_days(before_day, store, data_dir, archive_dir):
+        path = archive_day(day, store, data_dir, archive_dir)
+        if path:
+            paths.append(path)
+    return paths
+
+def main():
+    """Archive a day of incidents (defaults to yesterday)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser(description='Archive daily CHP incidents to a columnar file')
+    parser.add_argument('--date', default=(datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"),
+                        help='Day to archive (YYYY-MM-DD), defaults to yesterday')
+    parser.add_argument('--data-dir', default='data', help='Directory with legacy daily JSON files')
+    parser.add_argument('--archive-dir', default=os.getenv('ARCHIVE_DIR', 'data/archive'),
+                        help='Output directory for archive files')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Archive every day before today that has no archive yet (ignores --date)')
+    args = parser.parse_args()
+
+    db_path = os.getenv('INCIDENT_STORE_PATH', 'data/incidents.db')
+    store = IncidentStore(db_path) if os.path.exists(db_path) else None
+
+    if args.backfill:
+        paths = backfill_archives(datetime.now().strftime("%Y-%m-%d"), store, args.data_dir, args.archive_dir)
+        print(f"✅ Archives written: {len(paths)}")
+        for path in paths:
+            print(f"   {path}")
+        return
+
+    path = archive_day(args.date, store, args.data_dir, args.archive_dir)
+    print(f"✅ Archive written: {path}" if path else f"ℹ️ No incidents found for {args.date}")
+
+if __name__ == "__main__":
+    main()
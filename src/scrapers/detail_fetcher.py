@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+CHP Incident Detail Fetcher
+Fetches the per-incident detail pages (unit updates, lane info) behind each row's
+Details link, only for new or changed incidents, with bounded concurrency and a TTL cache
+"""
+
+import asyncio
+import os
+import re
+import sys
+import time
+import logging
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.circuit_breaker import jittered_backoff
+from core.rate_governor import RateGovernor
+from core.upstream_change_detector import UpstreamChangeDetector
+from utils.metrics import REGISTRY
+from utils.memory_accounting import MEMORY, approximate_size
+
+UPSTREAM_REQUESTS = REGISTRY.counter('chp_upstream_requests_total', 'Upstream HTTP responses by request kind and status', ('kind', 'status'))
+UPSTREAM_BYTES = REGISTRY.counter('chp_upstream_bytes_received_total', 'Response body bytes received from upstream', ('kind',))
+
+# Details links are ASP.NET postbacks: javascript:__doPostBack('gvIncidents','Select$3')
+POSTBACK_PATTERN = re.compile(r"__doPostBack\('([^']*)','([^']*)'\)")
+
+class DetailFetcher:
+    """Optional detail-fetch stage for incidents of a center page"""
+
+    def __init__(self, base_url: str, max_concurrency: int = 4, ttl: float = 300,
+                 max_fetches_per_cycle: int = 10, governor: RateGovernor = None, failure_backoff: float = 30):
+        self.base_url = base_url
+        self.governor = governor or RateGovernor()
+        self.max_concurrency = max_concurrency
+        self.ttl = ttl
+        self.max_fetches_per_cycle = max_fetches_per_cycle
+        self.semaphore: Optional[asyncio.Semaphore] = None  # Created on first use inside the loop
+        # (center_code, incident_id) -> {'signature', 'fetched_at', 'lines'}
+        self.cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.memory = MEMORY.account('detail_cache', default_cap=16 * 2 ** 20, policy='lru',
+                                     on_evict=self.evict)
+        # Body hashes per detail page: a TTL refresh that returns the same page is not re-parsed
+        self.change_detector = UpstreamChangeDetector()
+        # center_code -> IDs with a Details link on the center's last parsed page
+        self.target_ids: Dict[str, Set[str]] = {}
+        # (center_code, incident_id) -> (retry_at, consecutive failures); failed pages wait out a backoff
+        self.failures: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self.failure_backoff = failure_backoff
+        self.stats = {'fetched': 0, 'cache_hits': 0, 'errors': 0, 'skipped': 0, 'unchanged': 0}
+        self.logger = logging.getLogger('upstream.detail')
+
+    def detector_key(self, center_code: str, incident_id: str) -> str:
+        """Change detector key of one incident's detail page"""
+        return f"{center_code}#{incident_id}"
+
+    def evict(self, key: Tuple[str, str]) -> None:
+        """Drop a cached detail page (memory cap or the incident left the feed)"""
+        self.cache.pop(key, None)
+        self.failures.pop(key, None)
+        self.change_detector.forget(self.detector_key(*key))
+
+    def incident_signature(self, incident: Dict[str, Any]) -> tuple:
+        """Summary fields whose change means the detail page should be refreshed"""
+        return (incident.get('time'), incident.get('type'), incident.get('location'), incident.get('details'))
+
+    def extract_detail_targets(self, soup: BeautifulSoup) -> Dict[str, Tuple[str, str]]:
+        """Map incident ID -> (__EVENTTARGET, __EVENTARGUMENT) of its Details link"""
+        targets = {}
+        table = soup.find('table')
+        if not table:
+            return targets
+
+        for row in table.find_all('tr')[1:]:
+            cells = row.find_all('td')
+            if len(cells) < 2:
+                continue
+            link = cells[0].find('a')
+            if link is None:
+                continue
+            match = POSTBACK_PATTERN.search(link.get('href', '') or link.get('onclick', ''))
+            if match:
+                targets[cells[1].get_text(strip=True)] = (match.group(1), match.group(2))
+        return targets
+
+    def parse_detail_page(self, html: str) -> List[str]:
+        """Extract the narrative lines of the detail panel"""
+        soup = BeautifulSoup(html, 'html.parser')
+        panel = soup.find(id=re.compile('detail', re.IGNORECASE))
+        if panel is None:
+            return []
+
+        lines = []
+        for row in panel.find_all('tr'):
+            text = ' '.join(cell.get_text(' ', strip=True) for cell in row.find_all('td'))
+            if text:
+                lines.append(text)
+        return lines
+
+    def needs_fetch(self, center_code: str, incident: Dict[str, Any], now: float) -> bool:
+        """True for new or changed incidents, or when the cached detail outlived its TTL (not while backing off)"""
+        failure = self.failures.get((center_code, incident['id']))
+        if failure is not None and now < failure[0]:
+            return False
+        cached = self.cache.get((center_code, incident['id']))
+        if cached is None:
+            return True
+        if cached['signature'] != self.incident_signature(incident):
+            return True
+        return now - cached['fetched_at'] > self.ttl
+
+    def has_pending(self, center_code: str, incidents: List[Dict[str, Any]]) -> bool:
+        """True if any incident with a Details link on the last parsed page is due for a fetch"""
+        now = time.time()
+        targets = self.target_ids.get(center_code, ())
+        return any(incident['id'] in targets and self.needs_fetch(center_code, incident, now) for incident in incidents)
+
+    async def fetch_one(self, session: aiohttp.ClientSession, center_code: str, form_data: Dict[str, str],
+                        incident: Dict[str, Any], target: Tuple[str, str]) -> None:
+        """Fetch and cache the detail page of one incident"""
+        data = dict(form_data)
+        data['__EVENTTARGET'], data['__EVENTARGUMENT'] = target
+
+        async with self.semaphore:
+            try:
+                async with self.governor.request() as ticket:
+                    async with session.post(self.base_url, data=data) as response:
+                        ticket.observe_response(response.status, response.headers)
+                        UPSTREAM_REQUESTS.inc(kind='detail', status=response.status)
+                        if response.status != 200:
+                            raise Exception(f"HTTP {response.status}: Failed to load details")
+                        hasher = self.change_detector.new_hasher()
+                        chunks = []
+                        async for chunk in response.content.iter_chunked(65536):
+                            hasher.update(chunk)
+                            chunks.append(chunk)
+                        UPSTREAM_BYTES.inc(response.content.total_bytes, kind='detail')
+                        headers, charset = response.headers, response.charset
+            except Exception as e:
+                self.stats['errors'] += 1
+                key = (center_code, incident['id'])
+                attempts = self.failures.get(key, (0.0, 0))[1]
+                delay = jittered_backoff(attempts, self.failure_backoff, max(self.failure_backoff, self.ttl))
+                self.failures[key] = (time.time() + delay, attempts + 1)
+                self.logger.warning(f"⚠️ Detail fetch failed for {center_code} #{incident['id']}, retrying in {delay:.0f}s: {e}")
+                return
+
+        key = (center_code, incident['id'])
+        self.failures.pop(key, None)
+        body = b''.join(chunks)
+        cached = self.cache.get(key)
+        if self.change_detector.observe(self.detector_key(*key), headers, hasher.digest(), body) and cached is not None:
+            lines = cached['lines']
+            self.stats['unchanged'] += 1
+        else:
+            lines = self.parse_detail_page(body.decode(charset or 'utf-8', errors='replace'))
+
+        entry = {
+            'signature': self.incident_signature(incident),
+            'fetched_at': time.time(),
+            'lines': lines
+        }
+        self.cache[key] = entry
+        self.memory.charge(key, approximate_size(entry))
+        self.stats['fetched'] += 1
+
+    async def enrich(self, session: aiohttp.ClientSession, center_code: str, soup: BeautifulSoup,
+                     form_data: Dict[str, str], incidents: List[Dict[str, Any]]) -> None:
+        """Fetch details for new/changed incidents and attach cached detail lines to all incidents"""
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        now = time.time()
+        targets = self.extract_detail_targets(soup)
+        self.target_ids[center_code] = set(targets)
+        pending = [incident for incident in incidents
+                   if incident['id'] in targets and self.needs_fetch(center_code, incident, now)]
+
+        # Cap per-cycle upstream load; the rest is picked up in later cycles
+        self.stats['skipped'] += max(0, len(pending) - self.max_fetches_per_cycle)
+        pending = pending[:self.max_fetches_per_cycle]
+        self.stats['cache_hits'] += len(incidents) - len(pending)
+
+        if pending:
+            await asyncio.gather(*[
+                self.fetch_one(session, center_code, form_data, incident, targets[incident['id']])
+                for incident in pending
+            ])
+
+        # Stale cached details are still attached when a refresh failed or was deferred
+        for incident in incidents:
+            cached = self.cache.get((center_code, incident['id']))
+            if cached is not None:
+                incident['detail_lines'] = list(cached['lines'])
+                self.memory.touch((center_code, incident['id']))
+
+        # Forget incidents that dropped off the feed
+        active_ids = {incident['id'] for incident in incidents}
+        for key in [key for key in self.cache if key[0] == center_code and key[1] not in active_ids]:
+            self.evict(key)
+            self.memory.release(key)
+        for key in [key for key in self.failures if key[0] == center_code and key[1] not in active_ids]:
+            del self.failures[key]
@@ -21,15 +21,78 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from core.center_mapper import CenterMapper
 from core.incident_parser import IncidentParser
+from core.lane_blockage_classifier import LaneBlockageClassifier
+from core.lane_detail_extractor import LaneDetailExtractor
+from core.incremental_detail_parser import IncrementalDetailParser
+from core.incident_normalizer import IncidentNormalizer
+from core.upstream_change_detector import UpstreamChangeDetector
+from core.rate_governor import RateGovernor
+from core.circuit_breaker import CircuitBreakerRegistry, jittered_backoff
+from core.hedge_policy import HedgePolicy
+from scrapers.detail_fetcher import DetailFetcher
+from utils.metrics import REGISTRY
+from utils.structured_logging import configure_logging
+from utils.tracing import TRACER
+from utils.memory_accounting import MEMORY, approximate_size
+
+UPSTREAM_REQUESTS = REGISTRY.counter('chp_upstream_requests_total', 'Upstream HTTP responses by request kind and status', ('kind', 'status'))
+UPSTREAM_BYTES = REGISTRY.counter('chp_upstream_bytes_received_total', 'Response body bytes received from upstream', ('kind',))
+SCRAPE_ERRORS = REGISTRY.counter('chp_scrape_errors_total', 'Failed center scrape attempts', ('center',))
+FETCH_SECONDS = REGISTRY.histogram('chp_fetch_seconds', 'Upstream round trips per center scrape (page GET + form POST)', ('center',))
+PARSE_SECONDS = REGISTRY.histogram('chp_parse_seconds', 'Incident parsing and lane processing per center scrape', ('center',))
 
 class HTTPScraper:
     """High-performance HTTP-based CHP scraper"""
     
     def __init__(self, mode="railway"):
         self.mode = mode
-        self.base_url = "https://cad.chp.ca.gov/Traffic.aspx"
+        self.base_url = os.getenv('CHP_BASE_URL', "https://cad.chp.ca.gov/Traffic.aspx")
         self.center_mapper = CenterMapper()
         self.incident_parser = IncidentParser()
+        self.lane_classifier = LaneBlockageClassifier()
+        self.lane_extractor = LaneDetailExtractor()
+        self.detail_parser = IncrementalDetailParser(self.lane_classifier, self.lane_extractor)
+        
+        # One governor paces every upstream request (sync, async and detail pages)
+        self.governor = RateGovernor(
+            rate=float(os.getenv('UPSTREAM_RATE', '15')),
+            burst=int(os.getenv('UPSTREAM_BURST', '25')),
+            max_concurrency=int(os.getenv('UPSTREAM_MAX_CONCURRENCY', '10')),
+            max_in_flight=int(os.getenv('UPSTREAM_MAX_IN_FLIGHT', '25')),
+            target_latency=float(os.getenv('UPSTREAM_TARGET_LATENCY', '3'))
+        )
+        self.normalizer = IncidentNormalizer()  # Shared string tables for type/location/area values
+        
+        # Conditional requests and body hashes; unchanged pages reuse the last parsed incidents
+        self.change_detector = UpstreamChangeDetector()
+        self.last_incidents: Dict[str, List[Dict[str, Any]]] = {}
+        self.parse_cache_memory = MEMORY.account('parse_cache', default_cap=32 * 2 ** 20, policy='lru',
+                                                 on_evict=self.evict_parsed)
+        
+        # Per-center circuit breakers and bounded retries (per center and per cycle)
+        self.breakers = CircuitBreakerRegistry(
+            failure_threshold=int(os.getenv('BREAKER_FAILURE_THRESHOLD', '3')),
+            base_backoff=float(os.getenv('BREAKER_BASE_BACKOFF', '10')),
+            max_backoff=float(os.getenv('BREAKER_MAX_BACKOFF', '600'))
+        )
+        self.max_retries = int(os.getenv('SCRAPE_MAX_RETRIES', '2'))
+        
+        # Hedged POSTs for centers slower than their rolling p95, within a strict budget
+        self.enable_hedging = os.getenv('ENABLE_HEDGING', 'true').lower() == 'true'
+        self.hedge_policy = HedgePolicy(budget_ratio=float(os.getenv('HEDGE_BUDGET_RATIO', '0.05')))
+        self.retry_budget_per_cycle = int(os.getenv('SCRAPE_RETRY_BUDGET', '10'))
+        self.retry_budget = self.retry_budget_per_cycle
+        
+        # Optional per-incident detail pages (async scraping only)
+        self.detail_fetcher = None
+        if os.getenv('ENABLE_DETAIL_FETCH', 'false').lower() == 'true':
+            self.detail_fetcher = DetailFetcher(
+                self.base_url,
+                governor=self.governor,
+                max_concurrency=int(os.getenv('DETAIL_FETCH_CONCURRENCY', '4')),
+                ttl=float(os.getenv('DETAIL_CACHE_TTL', '300')),
+                failure_backoff=float(os.getenv('DETAIL_FAILURE_BACKOFF', '30'))
+            )
         
         # All 25 CHP communication centers
         self.all_centers = self.center_mapper.get_available_centers()
@@ -39,12 +102,9 @@ class HTTPScraper:
         self.setup_logging()
         
     def setup_logging(self):
-        """Setup comprehensive logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-        self.logger = logging.getLogger(__name__)
+        """Setup structured, queue-backed logging"""
+        configure_logging()
+        self.logger = logging.getLogger('upstream')
     
     def create_session(self) -> requests.Session:
         """Create HTTP session with proper headers"""
@@ -67,12 +127,18 @@ class HTTPScraper:
         previous_ids = {inc.get('id', '') for inc in previous_incidents}
         
         try:
-            self.logger.info(f"🔄 Scraping {center_code} ({center_name}) with HTTP...")
+            self.logger.debug(f"🔄 Scraping {center_code} ({center_name}) with HTTP...")
             
             session = self.create_session()
             
             # Step 1: GET the initial page
-            response = session.get(self.base_url, timeout=30)
+            fetch_started = time.perf_counter()
+            with self.governor.request_sync() as ticket:
+                response = session.get(self.base_url, timeout=30)
+                ticket.observe_response(response.status_code, response.headers)
+            UPSTREAM_REQUESTS.inc(kind='page', status=response.status_code)
+            UPSTREAM_BYTES.inc(len(response.content), kind='page')
+            fetch_seconds = time.perf_counter() - fetch_started
             if response.status_code != 200:
                 raise Exception(f"HTTP {response.status_code}: Failed to load page")
             
@@ -81,19 +147,28 @@ class HTTPScraper:
             form_data = self.extract_form_data(soup, center_code)
             
             # Step 3: POST the form
-            response = session.post(self.base_url, data=form_data, timeout=30)
+            fetch_started = time.perf_counter()
+            with self.governor.request_sync() as ticket:
+                response = session.post(self.base_url, data=form_data, timeout=30)
+                ticket.observe_response(response.status_code, response.headers)
+            UPSTREAM_REQUESTS.inc(kind='form', status=response.status_code)
+            UPSTREAM_BYTES.inc(len(response.content), kind='form')
+            FETCH_SECONDS.observe(fetch_seconds + time.perf_counter() - fetch_started, center=center_code)
             if response.status_code != 200:
                 raise Exception(f"HTTP {response.status_code}: Failed to submit form")
             
-            # Step 4: Parse incidents
-            incidents = self.parse_incidents(response.text, center_code)
-            
-            # Step 5: Apply smart processing
-            enhanced_incidents = self.apply_smart_processing(incidents, previous_ids)
+            with PARSE_SECONDS.time(center=center_code):
+                # Step 4: Parse incidents
+                incidents = self.parse_incidents(response.text, center_code)
+                
+                # Step 5: Apply smart processing
+                enhanced_incidents = self.apply_smart_processing(incidents, previous_ids, center_code)
             
             response_time = time.time() - start_time
             
-            self.logger.info(f"✅ {center_code}: {len(enhanced_incidents)} incidents in {response_time:.2f}s")
+            self.logger.info(f"✅ {center_code}: {len(enhanced_incidents)} incidents in {response_time:.2f}s",
+                             extra={'center': center_code, 'incidents': len(enhanced_incidents),
+                                    'seconds': round(response_time, 3)})
             
             return {
                 'center': center_code,
@@ -109,6 +184,8 @@ class HTTPScraper:
         except Exception as e:
             response_time = time.time() - start_time
             self.logger.error(f"❌ Error scraping {center_code}: {e}")
+            SCRAPE_ERRORS.inc(center=center_code)
+            self.detail_parser.retain(center_code, [])
             
             return {
                 'center': center_code,
@@ -130,33 +207,83 @@ class HTTPScraper:
         previous_ids = {inc.get('id', '') for inc in previous_incidents}
         
         try:
-            self.logger.info(f"🔄 Scraping {center_code} ({center_name}) with async HTTP...")
+            self.logger.debug(f"🔄 Scraping {center_code} ({center_name}) with async HTTP...")
             
             # Step 1: GET the initial page
-            async with session.get(self.base_url) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}: Failed to load page")
-                html = await response.text()
+            fetch_started = time.perf_counter()
+            with TRACER.span('fetch.page') as span:
+                async with self.governor.request() as ticket:
+                    async with session.get(self.base_url) as response:
+                        ticket.observe_response(response.status, response.headers)
+                        UPSTREAM_REQUESTS.inc(kind='page', status=response.status)
+                        if span is not None:
+                            span.set_attribute('http.status_code', response.status)
+                        if response.status != 200:
+                            raise Exception(f"HTTP {response.status}: Failed to load page")
+                        html = await response.text()
+                        UPSTREAM_BYTES.inc(response.content.total_bytes, kind='page')
+            fetch_seconds = time.perf_counter() - fetch_started
             
             # Step 2: Parse form data
-            soup = BeautifulSoup(html, 'html.parser')
-            form_data = self.extract_form_data(soup, center_code)
+            with TRACER.span('parse.form'):
+                soup = BeautifulSoup(html, 'html.parser')
+                form_data = self.extract_form_data(soup, center_code)
             
-            # Step 3: POST the form
-            async with session.post(self.base_url, data=form_data) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}: Failed to submit form")
-                html = await response.text()
+            # Step 3: POST the form, hashing the body as it streams in. The postback is not made
+            # conditional: a server may answer validators on a POST with 412, so unchanged pages
+            # are recognised by the body hash and the view-state-blanked content hash alone
+            cached_incidents = self.last_incidents.get(center_code)
+            fetch_started = time.perf_counter()
+            with TRACER.span('fetch.form') as span:
+                response = await self.post_form_hedged(session, center_code, form_data)
+                if span is not None:
+                    span.set_attribute('http.status_code', response['status'])
+                    span.set_attribute('http.response_bytes', len(response['body']))
+            FETCH_SECONDS.observe(fetch_seconds + time.perf_counter() - fetch_started, center=center_code)
+            unchanged = (self.change_detector.observe(center_code, response['headers'], response['body_hash'], response['body'])
+                         and cached_incidents is not None)
+            if not unchanged:
+                html = response['body'].decode(response['charset'] or 'utf-8', errors='replace')
             
-            # Step 4: Parse incidents
-            incidents = self.parse_incidents(html, center_code)
+            if unchanged:
+                # Step 4: Unchanged page, skip decoding and parsing
+                incidents = [dict(incident) for incident in cached_incidents]
+                self.parse_cache_memory.touch(center_code)
+                parse_seconds = 0.0
+                
+                # Step 4b: Detail pages past their TTL (or deferred last cycle) are refreshed all the same
+                if self.detail_fetcher and incidents and self.detail_fetcher.has_pending(center_code, incidents):
+                    html = response['body'].decode(response['charset'] or 'utf-8', errors='replace')
+                    await self.enrich_details(session, center_code, html, incidents)
+                    self.last_incidents[center_code] = incidents
+                    self.parse_cache_memory.charge(center_code, approximate_size(incidents))
+            else:
+                # Step 4: Parse incidents
+                parse_started = time.perf_counter()
+                with TRACER.span('parse.incidents') as span:
+                    incidents = self.parse_incidents(html, center_code)
+                    if span is not None:
+                        span.set_attribute('incidents', len(incidents))
+                parse_seconds = time.perf_counter() - parse_started
+                
+                # Step 4b: Fetch detail pages of new/changed incidents (postbacks reuse this page's view state)
+                if self.detail_fetcher and incidents:
+                    await self.enrich_details(session, center_code, html, incidents)
+                
+                self.last_incidents[center_code] = incidents
+                self.parse_cache_memory.charge(center_code, approximate_size(incidents))
             
             # Step 5: Apply smart processing
-            enhanced_incidents = self.apply_smart_processing(incidents, previous_ids)
+            parse_started = time.perf_counter()
+            with TRACER.span('parse.smart_processing'):
+                enhanced_incidents = self.apply_smart_processing(incidents, previous_ids, center_code)
+            PARSE_SECONDS.observe(parse_seconds + time.perf_counter() - parse_started, center=center_code)
             
             response_time = time.time() - start_time
             
-            self.logger.info(f"✅ {center_code}: {len(enhanced_incidents)} incidents in {response_time:.2f}s")
+            self.logger.info(f"✅ {center_code}: {len(enhanced_incidents)} incidents in {response_time:.2f}s",
+                             extra={'center': center_code, 'incidents': len(enhanced_incidents),
+                                    'seconds': round(response_time, 3)})
             
             return {
                 'center': center_code,
@@ -166,12 +293,18 @@ class HTTPScraper:
                 'timestamp': datetime.now().isoformat(),
                 'hasChanges': len(enhanced_incidents) != len(previous_incidents),
                 'status': 'success',
-                'responseTime': response_time
+                'responseTime': response_time,
+                'upstreamUnchanged': unchanged
             }
             
         except Exception as e:
             response_time = time.time() - start_time
             self.logger.error(f"❌ Error scraping {center_code}: {e}")
+            SCRAPE_ERRORS.inc(center=center_code)
+            self.detail_parser.retain(center_code, [])
+            self.change_detector.forget(center_code)
+            self.last_incidents.pop(center_code, None)
+            self.parse_cache_memory.release(center_code)
             
             return {
                 'center': center_code,
@@ -185,6 +318,86 @@ class HTTPScraper:
                 'responseTime': response_time
             }
     
+    async def enrich_details(self, session: aiohttp.ClientSession, center_code: str, html: str,
+                             incidents: List[Dict[str, Any]]) -> None:
+        """Fetch detail pages due for a center page (postbacks reuse this page's view state)"""
+        with TRACER.span('fetch.details'):
+            soup = BeautifulSoup(html, 'html.parser')
+            detail_form = self.extract_form_data(soup, center_code)
+            detail_form.pop('btnCCGo', None)
+            await self.detail_fetcher.enrich(session, center_code, soup, detail_form, incidents)
+    
+    def evict_parsed(self, center_code: str) -> None:
+        """Drop a center's parsed incidents (memory cap); its next page is parsed in full"""
+        self.last_incidents.pop(center_code, None)
+        self.change_detector.forget(center_code)
+    
+    async def post_form(self, session: aiohttp.ClientSession, form_data: Dict[str, str]) -> Dict[str, Any]:
+        """POST the center form through the governor, hashing the body as it streams in"""
+        async with self.governor.request() as ticket:
+            async with session.post(self.base_url, data=form_data) as response:
+                ticket.observe_response(response.status, response.headers)
+                UPSTREAM_REQUESTS.inc(kind='form', status=response.status)
+                if response.status != 200:
+                    raise Exception(f"HTTP {response.status}: Failed to submit form")
+                
+                hasher = self.change_detector.new_hasher()
+                chunks = []
+                async for chunk in response.content.iter_chunked(65536):
+                    hasher.update(chunk)
+                    chunks.append(chunk)
+                UPSTREAM_BYTES.inc(response.content.total_bytes, kind='form')
+                return {
+                    'status': response.status,
+                    'headers': response.headers,
+                    'charset': response.charset,
+                    'body': b''.join(chunks),
+                    'body_hash': hasher.digest()
+                }
+    
+    async def post_form_hedged(self, session: aiohttp.ClientSession, center_code: str,
+                               form_data: Dict[str, str]) -> Dict[str, Any]:
+        """POST the form; past the center's rolling p95, race one duplicate (budget permitting)"""
+        started = time.monotonic()
+        delay = self.hedge_policy.hedge_delay(center_code) if self.enable_hedging else None
+        self.hedge_policy.start_request()
+        primary = asyncio.ensure_future(self.post_form(session, form_data))
+        
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and self.hedge_policy.try_spend():
+                    # The primary holds its pooled connection, so the hedge goes out on another one
+                    hedge = asyncio.ensure_future(self.post_form(session, form_data))
+                    done, _ = await asyncio.wait({primary, hedge}, return_when=asyncio.FIRST_COMPLETED)
+                    if hedge in done and hedge.exception() is None:
+                        # The slow primary is cancelled; its elapsed time is a lower bound on its latency,
+                        # recorded so the p95 window and the unhedged p99 keep their slow tail
+                        primary.cancel()
+                        primary.add_done_callback(lambda task: task.cancelled() or task.exception())
+                        elapsed = time.monotonic() - started
+                        self.hedge_policy.record_primary(center_code, elapsed)
+                        self.hedge_policy.record_effective(elapsed, hedge_won=True)
+                        return hedge.result()
+                    hedge.add_done_callback(lambda task: task.cancelled() or task.exception())
+                    if primary.done() and primary.exception() is not None and not hedge.done():
+                        result = await hedge  # The primary failed first, the hedge is the retry
+                        # Unhedged, the caller would have had no answer before the retry did
+                        elapsed = time.monotonic() - started
+                        self.hedge_policy.record_primary(center_code, elapsed)
+                        self.hedge_policy.record_effective(elapsed, hedge_won=True)
+                        return result
+                    hedge.cancel()
+            
+            result = await primary
+        except Exception:
+            primary.cancel()
+            raise
+        elapsed = time.monotonic() - started
+        self.hedge_policy.record_primary(center_code, elapsed)
+        self.hedge_policy.record_effective(elapsed)
+        return result
+    
     def extract_form_data(self, soup: BeautifulSoup, center_code: str) -> Dict[str, str]:
         """Extract form data including hidden fields"""
         form_data = {
@@ -225,11 +438,12 @@ class HTTPScraper:
                     'details': cells[6].get_text(strip=True),
                     'center_code': center_code
                 }
-                incidents.append(incident)
+                incidents.append(self.normalizer.intern(incident))
         
         return incidents
     
-    def apply_smart_processing(self, incidents: List[Dict[str, Any]], previous_ids: set) -> List[Dict[str, Any]]:
+    def apply_smart_processing(self, incidents: List[Dict[str, Any]], previous_ids: set,
+                               center_code: str = None) -> List[Dict[str, Any]]:
         """Apply smart processing to incidents (new detection, lane blockage parsing)"""
         processed_incidents = []
         
@@ -240,46 +454,87 @@ class HTTPScraper:
             # Mark all incidents as relevant - filtering is now handled by frontend
             incident['is_relevant'] = True
             
-            # Add lane blockage parsing (simplified for HTTP)
-            incident['lane_blockage'] = self.parse_lane_blockage(incident['details'])
+            # Lane blockage status and structured lane data; known incidents
+            # only parse the detail lines appended since the last cycle.
+            # Fetched detail pages carry the full narrative, so prefer them
+            details_text = incident['details']
+            if incident.get('detail_lines'):
+                details_text = ' | '.join(incident['detail_lines'])
+            incident['lane_blockage'], incident['lane_info'] = self.detail_parser.parse(
+                incident.get('center_code', ''), incident['id'], details_text
+            )
             
             processed_incidents.append(incident)
         
+        # Forget parse state of incidents that dropped off the feed (all of it when the center went quiet)
+        centers = {incident.get('center_code', '') for incident in processed_incidents}
+        if center_code is not None:
+            centers.add(center_code)
+        for center in centers:
+            self.detail_parser.retain(center, [incident['id'] for incident in processed_incidents
+                                               if incident.get('center_code', '') == center])
+        
         return processed_incidents
     
     
     def parse_lane_blockage(self, details_text: str) -> Dict[str, Any]:
         """Parse lane blockage information from details"""
-        if not details_text:
-            return {'status': 'unknown', 'details': []}
-        
-        lines = details_text.split(' | ')
-        blockage_info = []
-        
-        # Resolved status keywords
-        resolved_keywords = ['NEG BLOCKING', 'NEG BLK', 'CLEARED', 'RESOLVED']
-        
-        # Lane blockage keywords
-        blockage_keywords = [
-            'BLKG', 'BLOCKING', '#1 LN', 'SLOW LN', 'MIDDLE LN', 
-            'RHS', 'RS', 'CD', 'LANE', 'LN', 'VEH IN', 'DEBRIS'
-        ]
+        return self.lane_classifier.parse(details_text)
+    
+    def circuit_open_result(self, center_code: str) -> Dict[str, Any]:
+        """Result for a center skipped because its breaker is open"""
+        breaker = self.breakers.get(center_code)
+        return {
+            'center': center_code,
+            'centerName': self.center_mapper.get_center_name(center_code),
+            'incidents': [],
+            'incidentCount': 0,
+            'timestamp': datetime.now().isoformat(),
+            'hasChanges': False,
+            'status': 'circuit_open',
+            'error': breaker.last_error or 'Circuit breaker open',
+            'retryIn': round(breaker.retry_in(), 1),
+            'responseTime': 0
+        }
+    
+    async def scrape_center_resilient(self, session: aiohttp.ClientSession, center_code: str, previous_incidents: List[Dict] = None) -> Dict[str, Any]:
+        """Scrape a center behind its circuit breaker, retrying with jittered backoff"""
+        breaker = self.breakers.get(center_code)
+        if not breaker.allow_request():
+            return self.circuit_open_result(center_code)
         
-        for line in lines:
-            line_upper = line.upper()
-            
-            # Check for resolved status
-            if any(resolved in line_upper for resolved in resolved_keywords):
-                return {'status': 'resolved', 'details': [line]}
+        attempt = 0
+        while True:
+            with TRACER.span('scrape.attempt', attempt=attempt) as span:
+                result = await self.scrape_center_async(session, center_code, previous_incidents)
+                if span is not None:
+                    span.set_attribute('status', result['status'])
+                    span.set_attribute('upstream_unchanged', bool(result.get('upstreamUnchanged')))
+                    if result['status'] != 'success':
+                        span.set_error(result.get('error', 'Unknown error'))
+            if result['status'] == 'success':
+                breaker.record_success()
+                return result
             
-            # Check for lane blockage keywords
-            if any(keyword in line_upper for keyword in blockage_keywords):
-                blockage_info.append(line)
+            # Half-open probes get a single attempt; retries also draw from the cycle budget
+            if attempt >= self.max_retries or self.retry_budget <= 0 or breaker.state == breaker.HALF_OPEN:
+                break
+            self.retry_budget -= 1
+            await asyncio.sleep(jittered_backoff(attempt, 0.5, 5.0))
+            attempt += 1
         
-        if blockage_info:
-            return {'status': 'blocking', 'details': blockage_info}
-        else:
-            return {'status': 'no_blockage', 'details': []}
+        breaker.record_failure(result.get('error'))
+        result['attempts'] = attempt + 1
+        return result
+    
+    async def scrape_center_traced(self, session: aiohttp.ClientSession, center_code: str, previous_incidents: List[Dict] = None) -> Dict[str, Any]:
+        """scrape_center_resilient inside a per-center span"""
+        with TRACER.span('scrape.center', center=center_code) as span:
+            result = await self.scrape_center_resilient(session, center_code, previous_incidents)
+            if span is not None:
+                span.set_attribute('status', result['status'])
+                span.set_attribute('incidents', result.get('incidentCount', 0))
+            return result
     
     def scrape_all_centers_sync(self, centers: List[str] = None, previous_incidents_map: Dict[str, List[Dict]] = None) -> List[Dict[str, Any]]:
         """Scrape all specified centers using synchronous requests"""
@@ -290,12 +545,18 @@ class HTTPScraper:
         
         results = []
         for center in centers:
+            breaker = self.breakers.get(center)
+            if not breaker.allow_request():
+                results.append(self.circuit_open_result(center))
+                continue
+            
             previous_incidents = previous_incidents_map.get(center, [])
             result = self.scrape_center_sync(center, previous_incidents)
+            if result['status'] == 'success':
+                breaker.record_success()
+            else:
+                breaker.record_failure(result.get('error'))
             results.append(result)
-            
-            # Small delay to be respectful to CHP servers
-            time.sleep(0.1)
         
         return results
     
@@ -305,6 +566,7 @@ class HTTPScraper:
         previous_incidents_map = previous_incidents_map or {}
         
         self.logger.info(f"🚀 Starting asynchronous HTTP scraping of {len(centers)} centers...")
+        self.retry_budget = self.retry_budget_per_cycle
         
         connector = aiohttp.TCPConnector(limit=25, limit_per_host=10)
         timeout = aiohttp.ClientTimeout(total=30)
@@ -321,9 +583,9 @@ class HTTPScraper:
             }
         ) as session:
             
-            # Create tasks for all centers
+            # Create tasks for all centers (open breakers return immediately)
             tasks = [
-                self.scrape_center_async(session, center, previous_incidents_map.get(center, []))
+                self.scrape_center_traced(session, center, previous_incidents_map.get(center, []))
                 for center in centers
             ]
             
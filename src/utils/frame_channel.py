@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Frame Channel Implementation
+Single Responsibility: Carries pre-encoded SSE frames from the scraper leader to SSE worker processes over a Unix socket
+"""
+
+import asyncio
+import logging
+import os
+import struct
+from typing import Awaitable, Callable, Optional, Set, Tuple
+
+from core.circuit_breaker import jittered_backoff
+from utils.metrics import REGISTRY
+
+logger = logging.getLogger('sse.fanout')
+
+# Record: frame length, message type length, message type, frame (the exact bytes written to SSE clients)
+HEADER = struct.Struct('!IH')
+
+FRAMES_PUBLISHED = REGISTRY.counter('sse_fanout_frames_published_total', 'Frames the leader wrote to SSE workers')
+FRAMES_RECEIVED = REGISTRY.counter('sse_fanout_frames_received_total', 'Frames an SSE worker received from the leader')
+WORKER_DROPS = REGISTRY.counter('sse_fanout_worker_drops_total', 'Worker connections dropped for falling too far behind')
+RECONNECTS = REGISTRY.counter('sse_fanout_reconnects_total', 'Times an SSE worker (re)connected to the leader')
+
+def encode_record(message_type: str, frame: bytes) -> bytes:
+    """One length-prefixed channel record"""
+    name = message_type.encode()
+    return HEADER.pack(len(frame), len(name)) + name + frame
+
+def decode_record(record: bytes) -> Tuple[str, bytes]:
+    """(message type, frame) of one channel record"""
+    frame_length, name_length = HEADER.unpack_from(record)
+    name_end = HEADER.size + name_length
+    return record[HEADER.size:name_end].decode(), record[name_end:name_end + frame_length]
+
+class FrameChannelServer:
+    """Leader side: accepts worker connections and writes every published frame to each of them"""
+
+    def __init__(self, path: str, max_buffer: int = 64 * 2 ** 20, track_workers: bool = True):
+        self.path = path
+        self.max_buffer = max_buffer  # A worker this far behind is disconnected (it reconnects and catches up)
+        self.writers: Set[asyncio.StreamWriter] = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        if track_workers:
+            REGISTRY.gauge('sse_fanout_workers', 'SSE workers connected to the leader', function=lambda: len(self.writers))
+
+    async def start(self) -> None:
+        """Listen on the socket path, replacing a stale socket file from an earlier run"""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self.handle_worker, path=self.path)
+        logger.info(f"✅ Frame channel listening on {self.path}")
+
+    async def handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Track a worker connection until it closes"""
+        self.writers.add(writer)
+        logger.info(f"📡 SSE worker connected. Workers: {len(self.writers)}")
+        try:
+            await reader.read()  # Workers never send; EOF means they went away
+        except ConnectionError:
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+            logger.info(f"📡 SSE worker disconnected. Workers: {len(self.writers)}")
+
+    def publish(self, message_type: str, frame: bytes) -> None:
+        """Queue a frame to every worker without waiting on any of them"""
+        if not self.writers:
+            return
+        record = encode_record(message_type, frame)
+        for writer in list(self.writers):
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                logger.warning(f"⚠️ Dropping an SSE worker more than {self.max_buffer} bytes behind")
+                WORKER_DROPS.inc()
+                self.writers.discard(writer)
+                writer.transport.abort()
+                continue
+            writer.write(record)
+        FRAMES_PUBLISHED.inc()
+
+    async def stop(self) -> None:
+        """Close the listener and all worker connections"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for writer in list(self.writers):
+            writer.close()
+        self.writers.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+class FrameChannelClient:
+    """Worker side: reads frames from the leader and hands each to a callback, reconnecting with backoff"""
+
+    def __init__(self, path: str, on_frame: Callable[[str, bytes], Awaitable[None]]):
+        self.path = path
+        self.on_frame = on_frame
+        self.connected = False
+
+    async def run(self) -> None:
+        """Receive frames until cancelled"""
+        attempt = 0
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except (ConnectionError, FileNotFoundError) as e:
+                delay = jittered_backoff(attempt, 0.1, 5.0)
+                attempt += 1
+                logger.debug(f"🔌 Leader not reachable on {self.path} ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            attempt = 0
+            self.connected = True
+            RECONNECTS.inc()
+            logger.info(f"✅ Connected to leader frame channel {self.path}")
+            try:
+                while True:
+                    frame_length, name_length = HEADER.unpack(await reader.readexactly(HEADER.size))
+                    message_type = (await reader.readexactly(name_length)).decode()
+                    frame = await reader.readexactly(frame_length)
+                    FRAMES_RECEIVED.inc()
+                    await self.on_frame(message_type, frame)
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                logger.warning(f"⚠️ Lost leader frame channel: {type(e).__name__}, reconnecting")
+            finally:
+                self.connected = False
+                writer.close()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Event Loop Monitor Implementation
+Single Responsibility: Samples event loop lag and captures the loop thread's stack while a callback blocks it
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.metrics import REGISTRY
+
+# Lag rarely matters below a millisecond; anything past a few seconds is a stall
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LOOP_LAG = REGISTRY.histogram('event_loop_lag_seconds', 'How late the loop lag probe woke up', buckets=LAG_BUCKETS)
+SLOW_CALLBACKS = REGISTRY.counter('event_loop_slow_callbacks_total', 'Times a callback blocked the loop past the threshold')
+BLOCKED_SECONDS = REGISTRY.counter('event_loop_blocked_seconds_total', 'Loop time spent blocked in slow callbacks')
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a sorted list, None when empty"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+class LoopMonitor:
+    """Lag probe task on the loop plus a watchdog thread that catches the loop blocked"""
+
+    def __init__(self, interval: float = 0.1, slow_threshold: float = 0.25, max_reports: int = 20,
+                 watchdog: bool = True):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.watchdog_enabled = watchdog
+        self.reports: Deque[Dict[str, Any]] = deque(maxlen=max_reports)
+        self.recent_lags: Deque[float] = deque(maxlen=600)  # About a minute of probes
+
+        self.loop_thread_id: Optional[int] = None
+        self.last_beat = time.monotonic()
+        self.max_lag = 0.0
+        self.probe_task: Optional[asyncio.Task] = None
+        self.watchdog_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._current_stall: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        """Start the probe on the running loop and the watchdog thread"""
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.probe_task = asyncio.get_running_loop().create_task(self.probe())
+        if self.watchdog_enabled:
+            self._stop.clear()
+            self.watchdog_thread = threading.Thread(target=self.watch, name='loop-watchdog', daemon=True)
+            self.watchdog_thread.start()
+
+    def stop(self) -> None:
+        """Stop the probe and the watchdog"""
+        self._stop.set()
+        if self.probe_task is not None:
+            self.probe_task.cancel()
+
+    async def probe(self) -> None:
+        """Sleep for the interval and record how late the wakeup was"""
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+            self.last_beat = time.monotonic()
+            self.recent_lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+
+    def watch(self) -> None:
+        """Watchdog thread: when the probe misses its beat, grab the loop thread's stack once per stall"""
+        poll = min(self.interval, self.slow_threshold / 2)
+        while not self._stop.wait(poll):
+            beat = self.last_beat
+            stall = self._current_stall
+            if stall is not None and stall['beat'] != beat:
+                # The loop came back; account the final duration
+                BLOCKED_SECONDS.inc(stall['blocked_for'])
+                self._current_stall = stall = None
+
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for > self.slow_threshold:
+                if stall is None:
+                    self.capture(beat, blocked_for)
+                else:
+                    stall['blocked_for'] = round(blocked_for, 3)
+
+    def capture(self, beat: float, blocked_for: float) -> None:
+        """Record a report with the stack the loop thread is stuck in"""
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        report = {
+            'beat': beat,
+            'detected_at': time.time(),
+            'blocked_for': round(blocked_for, 3),
+            'stack': [line for entry in stack for line in entry.rstrip().split('\n')]
+        }
+        self._current_stall = report
+        self.reports.append(report)
+        SLOW_CALLBACKS.inc()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag percentiles over the last minute and the most recent slow callback reports"""
+        lags = sorted(self.recent_lags)
+
+        def rounded(value):
+            return round(value, 4) if value is not None else None
+
+        return {
+            'interval': self.interval,
+            'slow_threshold': self.slow_threshold,
+            'watchdog': self.watchdog_thread is not None and self.watchdog_thread.is_alive(),
+            'samples': len(lags),
+            'lag_p50': rounded(percentile(lags, 0.50)),
+            'lag_p99': rounded(percentile(lags, 0.99)),
+            'lag_max_recent': rounded(lags[-1] if lags else None),
+            'lag_max': rounded(self.max_lag),
+            'slow_callbacks': int(SLOW_CALLBACKS.get()),
+            'reports': [
+                {key: value for key, value in report.items() if key != 'beat'}
+                for report in reversed(self.reports)
+            ]
+        }
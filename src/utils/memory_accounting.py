@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Memory Accounting Implementation
+Single Responsibility: Approximate byte accounting of long-lived in-memory state, with per-account and
+total caps enforced by evicting entries (LRU, oldest-first or largest-first)
+"""
+
+import os
+import re
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from utils.metrics import REGISTRY
+from utils.structured_logging import parse_mapping
+
+EVICTIONS = REGISTRY.counter('memory_evictions_total', 'Entries evicted to stay under a memory cap', ('account',))
+
+SIZE_PATTERN = re.compile(r'^\s*([\d.]+)\s*([KMG]?)B?\s*$', re.IGNORECASE)
+SIZE_UNITS = {'': 1, 'K': 2 ** 10, 'M': 2 ** 20, 'G': 2 ** 30}
+
+def parse_size(value: str) -> int:
+    """'64MB', '512K', '1.5G' or plain bytes -> bytes"""
+    match = SIZE_PATTERN.match(value or '')
+    if not match:
+        raise ValueError(f"Invalid size: {value!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+def approximate_size(obj: Any, max_objects: int = 100000) -> int:
+    """Deep sys.getsizeof over containers, slotted and plain objects, counting shared objects once"""
+    seen = set()
+    pending = [obj]
+    total = 0
+    while pending and len(seen) < max_objects:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            if hasattr(item, '__dict__'):
+                pending.append(vars(item))
+            for slot in getattr(type(item), '__slots__', ()):
+                if hasattr(item, slot):
+                    pending.append(getattr(item, slot))
+    return total
+
+class MemoryAccount:
+    """Byte sizes of one structure's entries, evicting through a callback while over the cap"""
+
+    POLICIES = ('lru', 'oldest', 'largest')
+
+    def __init__(self, name: str, cap: int = 0, policy: str = 'lru',
+                 on_evict: Optional[Callable[[Hashable], None]] = None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}")
+        self.name = name
+        self.cap = cap  # 0 means unlimited
+        self.policy = policy
+        self.on_evict = on_evict  # None: report-only, nothing can be dropped
+        self.entries: "OrderedDict[Hashable, int]" = OrderedDict()  # Oldest (or least recently used) first
+        self.bytes = 0
+        self.evictions = 0
+        self.accountant: Optional['MemoryAccountant'] = None
+
+    def charge(self, key: Hashable, size: int) -> None:
+        """Record the current size of an entry (new or replaced), then enforce the caps"""
+        self.bytes += size - self.entries.pop(key, 0)
+        self.entries[key] = size  # Replaced entries count as newest under every policy
+        self.enforce()
+        if self.accountant is not None:
+            self.accountant.enforce_total()
+
+    def touch(self, key: Hashable) -> None:
+        """Mark an entry as used (only changes eviction order under LRU)"""
+        if self.policy == 'lru' and key in self.entries:
+            self.entries.move_to_end(key)
+
+    def release(self, key: Hashable) -> None:
+        """Forget an entry its owner dropped"""
+        self.bytes -= self.entries.pop(key, 0)
+
+    def victim(self) -> Optional[Hashable]:
+        """Next entry to evict under the policy"""
+        if not self.entries:
+            return None
+        if self.policy == 'largest':
+            return max(self.entries, key=self.entries.get)
+        return next(iter(self.entries))
+
+    @property
+    def evictable(self) -> bool:
+        """Whether eviction can free anything (an owner callback and more than the newest entry)"""
+        return self.on_evict is not None and len(self.entries) > 1
+
+    def evict_one(self) -> bool:
+        """Evict one entry; False when there is nothing left to evict"""
+        key = self.victim()
+        if key is None or self.on_evict is None:
+            return False
+        self.release(key)
+        self.evictions += 1
+        EVICTIONS.inc(account=self.name)
+        self.on_evict(key)
+        return True
+
+    def enforce(self) -> None:
+        """Evict until under the account's cap (the newest entry is kept even if it alone exceeds it)"""
+        while self.cap and self.bytes > self.cap and self.evictable and self.evict_one():
+            pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Bytes, entries, cap and evictions"""
+        return {'bytes': self.bytes, 'entries': len(self.entries), 'cap': self.cap,
+                'policy': self.policy, 'evictions': self.evictions}
+
+class MemoryAccountant:
+    """All memory accounts of the process, plus an optional cap on their total"""
+
+    def __init__(self, total_cap: int = 0, caps: Optional[Dict[str, int]] = None):
+        self.total_cap = total_cap
+        self.caps = caps or {}
+        self.accounts: Dict[str, MemoryAccount] = {}
+        self.register_metrics()
+
+    def configure(self, total_cap: int, caps: Dict[str, int]) -> None:
+        """Apply caps; accounts created earlier pick up theirs immediately"""
+        self.total_cap = total_cap
+        self.caps = caps
+        for name, account in self.accounts.items():
+            if name in caps:
+                account.cap = caps[name]
+                account.enforce()
+        self.enforce_total()
+
+    def account(self, name: str, default_cap: int = 0, policy: str = 'lru',
+                on_evict: Optional[Callable[[Hashable], None]] = None) -> MemoryAccount:
+        """Create (or rebind, for a re-created owner) the named account"""
+        account = self.accounts.get(name)
+        if account is None:
+            account = MemoryAccount(name, self.caps.get(name, default_cap), policy, on_evict)
+            account.accountant = self
+            self.accounts[name] = account
+        else:
+            account.entries.clear()
+            account.bytes = 0
+            account.policy = policy
+            account.on_evict = on_evict
+        return account
+
+    @property
+    def total(self) -> int:
+        """Accounted bytes across all accounts"""
+        return sum(account.bytes for account in self.accounts.values())
+
+    def enforce_total(self) -> None:
+        """Evict from the largest accounts until the total is under the total cap"""
+        while self.total_cap and self.total > self.total_cap:
+            candidates = [account for account in self.accounts.values() if account.evictable]
+            if not candidates or not max(candidates, key=lambda account: account.bytes).evict_one():
+                break
+
+    def register_metrics(self) -> None:
+        """Gauges read when /metrics is scraped"""
+        REGISTRY.gauge('memory_accounted_bytes', 'Approximate bytes held per memory account', ('account',),
+                       function=lambda: {(name,): account.bytes for name, account in self.accounts.items()})
+        REGISTRY.gauge('memory_entries', 'Entries held per memory account', ('account',),
+                       function=lambda: {(name,): len(account.entries) for name, account in self.accounts.items()})
+        REGISTRY.gauge('memory_cap_bytes', 'Memory cap per account (0 = unlimited)', ('account',),
+                       function=lambda: {(name,): account.cap for name, account in self.accounts.items()})
+        REGISTRY.gauge('memory_total_cap_bytes', 'Cap on all accounts together (0 = unlimited)',
+                       function=lambda: self.total_cap)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-account accounting and the total"""
+        return {
+            'total_bytes': self.total,
+            'total_cap': self.total_cap,
+            'accounts': {name: account.snapshot() for name, account in self.accounts.items()}
+        }
+
+MEMORY = MemoryAccountant()
+
+def configure_memory_caps() -> None:
+    """Configure the global accountant from the environment
+
+    MEMORY_CAPS sets per-account caps ('parse_cache=32MB,sse_client_buffers=64MB'),
+    MEMORY_CAP_TOTAL caps all accounts together (default: unlimited).
+    """
+    MEMORY.configure(
+        total_cap=parse_size(os.getenv('MEMORY_CAP_TOTAL', '0')),
+        caps={name: parse_size(size) for name, size in parse_mapping(os.getenv('MEMORY_CAPS', '')).items()}
+    )
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Metrics Registry Implementation
+Single Responsibility: In-process counters, gauges and histograms rendered in the Prometheus text format
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers sub-millisecond diffs up to slow upstream fetches
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def format_value(value: float) -> str:
+    """Prometheus sample value"""
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """{name="value",...} with the exposition format escaping, empty without labels"""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+class Metric:
+    """Named metric with optional labels; one value (or bucket set) per label combination"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()  # The sync scrape path updates metrics from worker threads
+
+    def label_key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        """Label values in declaration order"""
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        """(suffix, extra label names, label values, value) for every sample"""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """HELP, TYPE and sample lines"""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, extra_names, values, value in self.samples():
+            labels = format_labels(self.labelnames + extra_names, values)
+            lines.append(f'{self.name}{suffix}{labels} {format_value(value)}')
+        return lines
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Add to the count"""
+        key = self.label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """Current count"""
+        return self.values.get(self.label_key(labels), 0)
+
+    def samples(self):
+        """One sample per label combination"""
+        with self._lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            yield '', (), key, value
+
+class Gauge(Metric):
+    """Value that goes up and down, or is read from a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Callable[[], Any] = None):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        # Returns a number, or {label values tuple: number} for a labelled gauge
+        self.function = function
+
+    def set(self, value: float, **labels) -> None:
+        """Set the value"""
+        key = self.label_key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Add to the value"""
+        key = self.label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        """Subtract from the value"""
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        """Current value"""
+        return self.values.get(self.label_key(labels), 0)
+
+    def samples(self):
+        """Callback values when set, else the stored ones"""
+        if self.function is None:
+            with self._lock:
+                values = dict(self.values)
+        else:
+            result = self.function()
+            if result is None:
+                return
+            values = result if isinstance(result, dict) else {(): result}
+        for key, value in sorted(values.items()):
+            if value is not None:
+                yield '', (), tuple(str(part) for part in key), value
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation"""
+        key = self.label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        """Number of observations"""
+        entry = self.values.get(self.label_key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self):
+        """_bucket (cumulative, le label), _sum and _count samples"""
+        with self._lock:
+            items = [(key, (list(counts), total, count)) for key, (counts, total, count) in sorted(self.values.items())]
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield '_bucket', ('le',), key + (format_value(bound),), cumulative
+            yield '_sum', (), key, total
+            yield '_count', (), key, count
+
+class MetricsRegistry:
+    """Holds metrics by name and renders them all"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric; registering the same name twice returns the existing one"""
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} already registered with a different type or labels")
+            if isinstance(metric, Gauge) and metric.function is not None:
+                existing.function = metric.function  # Rebind callbacks to the newest owner
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register a counter"""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Callable[[], Any] = None) -> Gauge:
+        """Register a gauge"""
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Register a histogram"""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Metric by name"""
+        return self.metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for name in sorted(self.metrics):
+            lines.extend(self.metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+# Process-wide registry the scraper and SSE server instrument into
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+On-demand Profiler Implementation
+Single Responsibility: Profiles the running process for a bounded window (cProfile on the loop thread,
+stack sampling across all threads, optional tracemalloc) and renders pstats and collapsed stacks
+"""
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+class StackSampler:
+    """Background thread that samples every thread's stack at a fixed interval"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def run(self) -> None:
+        """Sampling loop"""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.stacks[self.collapse(names.get(thread_id, f'thread-{thread_id}'), frame)] += 1
+            self.samples += 1
+
+    def collapse(self, thread_name: str, frame) -> str:
+        """'thread;outer;...;inner' with one 'function (file:line)' entry per frame"""
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        frames.append(thread_name)
+        return ';'.join(reversed(frames))
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed stack format: 'frame;frame;frame count' per line, for flamegraph.pl or speedscope"""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+class ProcessProfiler:
+    """Runs one profiling window at a time and returns its results"""
+
+    def __init__(self, max_seconds: float = 60.0, sample_interval: float = 0.005):
+        self.max_seconds = max_seconds
+        self.sample_interval = sample_interval
+        self.running = False  # One window at a time; only touched from the loop thread
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+
+    def start_tracemalloc(self, frames: int = 10) -> None:
+        """Trace allocations from now on and keep a baseline snapshot to compare later profiles against"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.baseline = self.take_snapshot()
+
+    def take_snapshot(self) -> tracemalloc.Snapshot:
+        """Allocation snapshot without tracemalloc's and the import system's own allocations"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>')
+        ))
+
+    async def profile(self, seconds: float, cprofile: bool = True, memory: bool = False,
+                      sort: str = 'cumulative', limit: int = 50, dump: bool = False) -> Dict[str, Any]:
+        """Profile for seconds; cProfile sees the event loop thread, the sampler sees every thread"""
+        if self.running:
+            raise RuntimeError("A profile is already running")
+        seconds = min(max(seconds, 0.1), self.max_seconds)
+        self.running = True
+        started_tracing = memory and not tracemalloc.is_tracing()
+        try:
+            if started_tracing:
+                tracemalloc.start(10)
+            before = self.take_snapshot() if memory else None
+
+            profiler = cProfile.Profile() if cprofile else None
+            if profiler is not None:
+                profiler.enable()  # Profiles this thread: every callback the loop runs until disabled
+            sampler = StackSampler(self.sample_interval)
+            sampler.start()
+            started = time.perf_counter()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                sampler.stop()
+            elapsed = time.perf_counter() - started
+
+            result = {
+                'seconds': round(elapsed, 3),
+                'samples': sampler.samples,
+                'sample_interval': self.sample_interval,
+                'collapsed': sampler.collapsed()
+            }
+            if profiler is not None:
+                result['pstats'] = self.render_pstats(profiler, sort, limit)
+                if dump:
+                    result['pstats_dump'] = self.dump_pstats(profiler)
+            if memory:
+                result['tracemalloc'] = self.memory_report(before, self.take_snapshot(), limit)
+            return result
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self.running = False
+
+    def render_pstats(self, profiler: cProfile.Profile, sort: str, limit: int) -> str:
+        """pstats report as text"""
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def dump_pstats(self, profiler: cProfile.Profile) -> bytes:
+        """Binary pstats dump for snakeviz, gprof2dot or pstats.Stats()"""
+        with tempfile.NamedTemporaryFile(suffix='.prof') as f:
+            profiler.dump_stats(f.name)
+            return f.read()
+
+    def memory_report(self, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> Dict[str, Any]:
+        """Largest allocation sites, growth during the window and (if tracing since startup) since the baseline"""
+        current, peak = tracemalloc.get_traced_memory()
+        report = {
+            'traced_bytes': current,
+            'peak_bytes': peak,
+            'top': self.format_stats(after.statistics('lineno')[:limit]),
+            'growth': self.format_stats(after.compare_to(before, 'lineno')[:limit])
+        }
+        if self.baseline is not None:
+            report['growth_since_start'] = self.format_stats(after.compare_to(self.baseline, 'lineno')[:limit])
+        return report
+
+    def format_stats(self, stats: List[Any]) -> List[Dict[str, Any]]:
+        """tracemalloc Statistic / StatisticDiff entries as dicts"""
+        entries = []
+        for stat in stats:
+            frame = stat.traceback[0]
+            entry = {'site': f"{frame.filename}:{frame.lineno}", 'size_bytes': stat.size, 'count': stat.count}
+            if hasattr(stat, 'size_diff'):
+                entry['size_diff_bytes'] = stat.size_diff
+                entry['count_diff'] = stat.count_diff
+            entries.append(entry)
+        return entries
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Pub/Sub Implementation
+Single Responsibility: Shares the broadcast stream between scraper replicas (in-process bus, Redis, or a
+single-host Unix socket stand-in) and elects the one replica that scrapes
+"""
+
+import asyncio
+import fcntl
+import logging
+import os
+import socket
+import time
+from abc import ABC, abstractmethod
+from typing import IO, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.circuit_breaker import jittered_backoff
+from utils.frame_channel import FrameChannelClient, FrameChannelServer, decode_record, encode_record
+from utils.metrics import REGISTRY
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Optional: only PUBSUB_BACKEND=redis needs it
+    aioredis = None
+    RedisError = OSError
+
+logger = logging.getLogger('pubsub')
+
+FrameHandler = Callable[[str, bytes], Awaitable[None]]
+
+FRAMES_PUBLISHED = REGISTRY.counter('pubsub_frames_published_total', 'Frames this replica published to the shared stream')
+FRAMES_RECEIVED = REGISTRY.counter('pubsub_frames_received_total', 'Frames this replica received from the shared stream')
+LEADERSHIP_CHANGES = REGISTRY.counter('scraper_leadership_changes_total', 'Times this replica gained or lost the scraper lock', ('event',))
+
+class IPubSubBackend(ABC):
+    """Interface for the stream replicas share and the lock that elects the scraping replica"""
+
+    @abstractmethod
+    async def publish(self, message_type: str, frame: bytes) -> None:
+        """Send a frame to every subscribed replica, this one included"""
+        pass
+
+    @abstractmethod
+    async def subscribe(self, on_frame: FrameHandler) -> None:
+        """Hand every frame to on_frame until cancelled, reconnecting as needed"""
+        pass
+
+    @abstractmethod
+    async def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a lock for ttl seconds; False while another owner holds it"""
+        pass
+
+    @abstractmethod
+    async def release_lock(self, name: str, owner: str) -> None:
+        """Give a lock up if owner holds it"""
+        pass
+
+    async def close(self) -> None:
+        """Release connections and locks"""
+        pass
+
+class InProcessBus(IPubSubBackend):
+    """Subscribers and locks live in this process: a single replica, or several scrapers in one test process"""
+
+    def __init__(self):
+        self.queues: List[asyncio.Queue] = []
+        self.locks: Dict[str, Tuple[str, float]] = {}  # name -> (owner, monotonic expiry)
+
+    async def publish(self, message_type: str, frame: bytes) -> None:
+        """Queue the frame for every subscriber"""
+        for queue in self.queues:
+            queue.put_nowait((message_type, frame))
+        FRAMES_PUBLISHED.inc()
+
+    async def subscribe(self, on_frame: FrameHandler) -> None:
+        """Deliver queued frames in order"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self.queues.append(queue)
+        try:
+            while True:
+                message_type, frame = await queue.get()
+                FRAMES_RECEIVED.inc()
+                await on_frame(message_type, frame)
+        finally:
+            self.queues.remove(queue)
+
+    async def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """Take the lock if free, expired or already ours"""
+        holder, expires = self.locks.get(name, (owner, 0.0))
+        now = time.monotonic()
+        if holder != owner and expires > now:
+            return False
+        self.locks[name] = (owner, now + ttl)
+        return True
+
+    async def release_lock(self, name: str, owner: str) -> None:
+        """Drop the lock if owner holds it"""
+        if name in self.locks and self.locks[name][0] == owner:
+            del self.locks[name]
+
+class RedisBus(IPubSubBackend):
+    """Redis pub/sub channel plus a SET NX PX lock; works with any server speaking the protocol (Valkey, KeyDB, ...)"""
+
+    # Renew the lock if we hold it, else take it if it is free
+    ACQUIRE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 1
+end
+return 0
+"""
+    RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+    def __init__(self, url: str, channel: str = 'chp:frames'):
+        if aioredis is None:
+            raise RuntimeError("PUBSUB_BACKEND=redis needs the redis package (pip install 'redis>=4.2')")
+        self.url = url
+        self.channel = channel
+        self.client = aioredis.from_url(url)
+
+    async def publish(self, message_type: str, frame: bytes) -> None:
+        """PUBLISH one channel record"""
+        await self.client.publish(self.channel, encode_record(message_type, frame))
+        FRAMES_PUBLISHED.inc()
+
+    async def subscribe(self, on_frame: FrameHandler) -> None:
+        """SUBSCRIBE to the channel, resubscribing with backoff when the connection drops"""
+        attempt = 0
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                attempt = 0
+                logger.info(f"✅ Subscribed to {self.channel} on {self.url}")
+                async for message in pubsub.listen():
+                    if message['type'] != 'message':
+                        continue
+                    FRAMES_RECEIVED.inc()
+                    await on_frame(*decode_record(message['data']))
+            except (RedisError, OSError) as e:
+                delay = jittered_backoff(attempt, 0.5, 10.0)
+                attempt += 1
+                logger.warning(f"⚠️ Lost {self.channel} subscription ({e}), resubscribing in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            finally:
+                await pubsub.reset()
+
+    async def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew the lock key atomically"""
+        return bool(await self.client.eval(self.ACQUIRE_SCRIPT, 1, name, owner, int(ttl * 1000)))
+
+    async def release_lock(self, name: str, owner: str) -> None:
+        """Delete the lock key if owner holds it"""
+        await self.client.eval(self.RELEASE_SCRIPT, 1, name, owner)
+
+    async def close(self) -> None:
+        """Close the connection pool"""
+        await self.client.close()
+
+class SocketBus(IPubSubBackend):
+    """Single-host stand-in for tests and local replicas: locks are flock()ed files and the holder of a lock
+    hosts the stream on a Unix socket, so only the elected replica may publish
+
+    flock() locks last until released or the holder exits, so the ttl is not used.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_files: Dict[str, IO[Any]] = {}  # name -> open lock file holding the flock
+        self.server: Optional[FrameChannelServer] = None
+
+    async def publish(self, message_type: str, frame: bytes) -> None:
+        """Write the frame to every connected replica (including our own subscription)"""
+        if self.server is None:
+            raise RuntimeError("Only the lock holder publishes on the socket bus")
+        self.server.publish(message_type, frame)
+        FRAMES_PUBLISHED.inc()
+
+    async def subscribe(self, on_frame: FrameHandler) -> None:
+        """Read frames from whichever replica hosts the socket, following it across leader changes"""
+        async def receive(message_type: str, frame: bytes) -> None:
+            FRAMES_RECEIVED.inc()
+            await on_frame(message_type, frame)
+        await FrameChannelClient(self.path, receive).run()
+
+    async def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """flock the lock file without blocking; the first lock taken starts hosting the socket"""
+        if name in self.lock_files:
+            return True
+        lock_file = open(f"{self.path}.{name}.lock", 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self.lock_files[name] = lock_file
+        if self.server is None:
+            self.server = FrameChannelServer(self.path, track_workers=False)
+            await self.server.start()
+        return True
+
+    async def release_lock(self, name: str, owner: str) -> None:
+        """Unlock; the last lock released stops hosting the socket"""
+        lock_file = self.lock_files.pop(name, None)
+        if lock_file is None:
+            return
+        if self.server is not None and not self.lock_files:
+            await self.server.stop()
+            self.server = None
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
+
+    async def close(self) -> None:
+        """Release every lock held"""
+        for name in list(self.lock_files):
+            await self.release_lock(name, '')
+
+class LeaderElection:
+    """Campaigns for a lock and keeps renewing it; the holder is the one replica that scrapes"""
+
+    def __init__(self, backend: IPubSubBackend, name: str = 'chp-scraper-leader', ttl: float = 15.0,
+                 identity: Optional[str] = None):
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self.identity = identity or f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self.leader_since: Optional[float] = None
+        REGISTRY.gauge('scraper_leader', '1 while this replica holds the scraper lock', function=lambda: int(self.is_leader))
+
+    async def run(self) -> None:
+        """Try the lock every ttl/3 until cancelled; any failure to renew steps down at once"""
+        try:
+            while True:
+                try:
+                    held = await self.backend.acquire_lock(self.name, self.identity, self.ttl)
+                except Exception as e:
+                    logger.warning(f"⚠️ Leader lock {self.name} unavailable: {e}")
+                    held = False
+                self.set_leader(held)
+                await asyncio.sleep(self.ttl / 3)
+        finally:
+            if self.is_leader:
+                self.set_leader(False)
+                try:
+                    await self.backend.release_lock(self.name, self.identity)
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to release leader lock {self.name}: {e}")
+
+    def set_leader(self, held: bool) -> None:
+        """Record a leadership change"""
+        if held == self.is_leader:
+            return
+        self.is_leader = held
+        self.leader_since = time.time() if held else None
+        LEADERSHIP_CHANGES.inc(event='acquired' if held else 'lost')
+        if held:
+            logger.info(f"👑 {self.identity} is now the scraper leader")
+        else:
+            logger.warning(f"⚠️ {self.identity} is no longer the scraper leader")
+
+    async def wait_until_leader(self) -> None:
+        """Return once this replica holds the lock"""
+        while not self.is_leader:
+            await asyncio.sleep(1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Identity, leadership and lock settings"""
+        return {'identity': self.identity, 'is_leader': self.is_leader, 'leader_since': self.leader_since,
+                'lock': self.name, 'ttl': self.ttl}
+
+def create_pubsub_backend() -> Optional[IPubSubBackend]:
+    """Backend selected by the environment; None when replicas run independently
+
+    PUBSUB_BACKEND is none (default), memory, redis (PUBSUB_URL, PUBSUB_CHANNEL) or
+    socket (PUBSUB_SOCKET, shared by the replicas on one host).
+    """
+    kind = os.getenv('PUBSUB_BACKEND', 'none').lower()
+    if kind in ('', 'none'):
+        return None
+    if kind == 'memory':
+        return InProcessBus()
+    if kind == 'redis':
+        return RedisBus(os.getenv('PUBSUB_URL', 'redis://localhost:6379/0'), os.getenv('PUBSUB_CHANNEL', 'chp:frames'))
+    if kind == 'socket':
+        return SocketBus(os.getenv('PUBSUB_SOCKET', '/tmp/chp-pubsub.sock'))
+    raise ValueError(f"Unknown PUBSUB_BACKEND {kind!r} (none, memory, redis or socket)")
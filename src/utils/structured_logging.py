@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Structured Logging Implementation
+Single Responsibility: JSON log records written by a background listener, with per-subsystem levels and sampling
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed through extra= and is emitted as a field
+RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def parse_mapping(value: str) -> Dict[str, str]:
+    """Parse 'a=x,b=y' into {'a': 'x', 'b': 'y'}"""
+    mapping = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            key, _, setting = item.partition('=')
+            mapping[key.strip()] = setting.strip()
+    return mapping
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, subsystem, msg, extra fields and exception text"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Serialize a record"""
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'subsystem': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of records below WARNING from the configured subsystems"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def rate_for(self, name: str) -> float:
+        """Sampling rate of the closest configured ancestor logger, 1.0 if none"""
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Drop a share of low-level records; warnings and errors always pass"""
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records with the message merged but fields kept, so formatting happens off the loop"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make the record safe to hand to another thread"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def configure_logging() -> None:
+    """Route the root logger through a queue to a stdout listener thread (idempotent)
+
+    LOG_LEVEL sets the default level, LOG_LEVELS per-subsystem levels ('sse.client=DEBUG,upstream=WARNING'),
+    LOG_SAMPLING per-subsystem sampling rates for records below WARNING ('sse.client=0.1'),
+    LOG_FORMAT is 'json' (default) or 'text'.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    for name, level in parse_mapping(os.getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    output = logging.StreamHandler(sys.stdout)
+    if os.getenv('LOG_FORMAT', 'json').lower() == 'text':
+        output.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    # Unbounded queue: put() never blocks the event loop; the listener thread does all I/O
+    log_queue = queue.SimpleQueue()
+    handler = StructuredQueueHandler(log_queue)
+    rates = {name: float(rate) for name, rate in parse_mapping(os.getenv('LOG_SAMPLING', 'sse.client=0.1')).items()}
+    handler.addFilter(SamplingFilter(rates))
+
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # Flushes queued records on exit
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Tracing Implementation
+Single Responsibility: Lightweight per-cycle spans kept in memory and exported as OpenTelemetry (OTLP/JSON) traces
+"""
+
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from utils.memory_accounting import MEMORY, approximate_size
+
+logger = logging.getLogger('tracing')
+
+SERVICE_NAME = 'chp-traffic-scraper'
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+# The span new spans attach to; asyncio tasks copy it, so gather()ed work nests under its caller
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+def otlp_value(value: Any) -> Dict[str, Any]:
+    """Attribute value in OTLP/JSON AnyValue form"""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}  # int64 is a string in OTLP/JSON
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+class Span:
+    """One timed operation; spans of a trace share its span list"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'attributes',
+                 'status', 'status_message', 'spans')
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], spans: List['Span'],
+                 attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = STATUS_UNSET
+        self.status_message = ''
+        self.spans = spans
+        spans.append(self)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a key/value to the span"""
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        """Mark the span failed"""
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def end(self) -> None:
+        """Record the end time (once)"""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    @property
+    def duration(self) -> float:
+        """Seconds between start and end (so far, if still open)"""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON span"""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns or time.time_ns()),
+            'attributes': [{'key': key, 'value': otlp_value(value)} for key, value in self.attributes.items()],
+            'status': {'code': self.status}
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.status_message:
+            span['status']['message'] = self.status_message
+        return span
+
+class Tracer:
+    """Creates spans, keeps the last finished traces and hands them to an exporter thread"""
+
+    def __init__(self, enabled: bool = True, history: int = 20, export_file: str = '', export_url: str = ''):
+        self.enabled = enabled
+        self.recent: Deque[Span] = deque(maxlen=history)  # Root spans of finished traces
+        self.export_file = export_file
+        self.export_url = export_url
+        self.export_queue: Optional[queue.SimpleQueue] = None
+        self.export_thread: Optional[threading.Thread] = None
+        self.memory = MEMORY.account('trace_ring', default_cap=16 * 2 ** 20, policy='oldest', on_evict=self.drop_trace)
+
+    def configure(self, enabled: bool, history: int, export_file: str = '', export_url: str = '') -> None:
+        """Apply settings; starts the exporter thread when a destination is set"""
+        self.enabled = enabled
+        while len(self.recent) > history:
+            self.memory.release(self.recent.popleft().span_id)
+        self.recent = deque(self.recent, maxlen=history)
+        self.export_file = export_file
+        self.export_url = export_url
+        if (export_file or export_url) and self.export_thread is None:
+            self.export_queue = queue.SimpleQueue()
+            self.export_thread = threading.Thread(target=self.export_worker, name='trace-exporter', daemon=True)
+            self.export_thread.start()
+
+    @contextmanager
+    def trace(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Root span of a new trace; the trace is kept and exported when it ends"""
+        if not self.enabled:
+            yield None
+            return
+        root = Span(name, secrets.token_hex(16), None, [], attributes)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            root.end()
+            self.finish(root)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Child of the current span; a no-op outside a trace"""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(name, parent.trace_id, parent.span_id, parent.spans, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def current_span(self) -> Optional[Span]:
+        """The span active in this context, if any"""
+        return _current_span.get()
+
+    def finish(self, root: Span) -> None:
+        """Keep a finished trace and queue it for export"""
+        if len(self.recent) == self.recent.maxlen:
+            self.memory.release(self.recent[0].span_id)
+        self.recent.append(root)
+        self.memory.charge(root.span_id, approximate_size(root.spans))
+        if self.export_queue is not None:
+            self.export_queue.put(root)
+
+    def drop_trace(self, span_id: str) -> None:
+        """Evict a trace from the ring (memory cap)"""
+        self.recent = deque((root for root in self.recent if root.span_id != span_id), maxlen=self.recent.maxlen)
+
+    def to_otlp(self, root: Span) -> Dict[str, Any]:
+        """OTLP/JSON ExportTraceServiceRequest for one trace"""
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': otlp_value(SERVICE_NAME)}]},
+                'scopeSpans': [{
+                    'scope': {'name': 'kalitraf'},
+                    'spans': [span.to_otlp() for span in root.spans]
+                }]
+            }]
+        }
+
+    def export_worker(self) -> None:
+        """Exporter thread: serializes traces and writes them out, off the event loop"""
+        while True:
+            root = self.export_queue.get()
+            body = json.dumps(self.to_otlp(root))
+            try:
+                if self.export_file:
+                    # OTLP file exporter layout: one ExportTraceServiceRequest per line
+                    with open(self.export_file, 'a') as f:
+                        f.write(body + '\n')
+                if self.export_url:
+                    request = urllib.request.Request(self.export_url, data=body.encode(),
+                                                     headers={'Content-Type': 'application/json'})
+                    with urllib.request.urlopen(request, timeout=5):
+                        pass
+            except Exception as e:
+                logger.warning(f"⚠️ Trace export failed: {e}")
+
+    def waterfall(self, root: Span) -> Dict[str, Any]:
+        """A trace as a list of spans with offsets from the start, each parent followed by its children"""
+        children: Dict[Optional[str], List[Span]] = {}
+        for span in sorted(root.spans, key=lambda item: item.start_ns):
+            children.setdefault(span.parent_id, []).append(span)
+        rows = []
+        pending = [(root, 0)]
+        while pending:
+            span, depth = pending.pop()
+            pending.extend((child, depth + 1) for child in reversed(children.get(span.span_id, [])))
+            rows.append({
+                'name': span.name,
+                'depth': depth,
+                'offset_ms': round((span.start_ns - root.start_ns) / 1e6, 2),
+                'duration_ms': round(span.duration * 1000, 2),
+                'status': 'error' if span.status == STATUS_ERROR else 'ok',
+                **({'error': span.status_message} if span.status_message else {}),
+                **({'attributes': span.attributes} if span.attributes else {})
+            })
+        return {
+            'trace_id': root.trace_id,
+            'name': root.name,
+            'started_at': root.start_ns / 1e9,
+            'duration_ms': round(root.duration * 1000, 2),
+            'spans': rows
+        }
+
+    def recent_waterfalls(self, limit: int) -> List[Dict[str, Any]]:
+        """Waterfalls of the last finished traces, newest first"""
+        return [self.waterfall(root) for root in list(reversed(self.recent))[:limit]]
+
+TRACER = Tracer()
+
+def configure_tracing() -> None:
+    """Configure the global tracer from the environment
+
+    ENABLE_TRACING (default true), TRACE_HISTORY traces kept for /debug/cycles (default 20),
+    TRACE_EXPORT_FILE appends OTLP/JSON lines to a file, TRACE_EXPORT_URL POSTs them to an
+    OTLP/HTTP collector (e.g. http://localhost:4318/v1/traces).
+    """
+    TRACER.configure(
+        enabled=os.getenv('ENABLE_TRACING', 'true').lower() == 'true',
+        history=int(os.getenv('TRACE_HISTORY', '20')),
+        export_file=os.getenv('TRACE_EXPORT_FILE', ''),
+        export_url=os.getenv('TRACE_EXPORT_URL', '')
+    )